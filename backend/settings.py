@@ -49,6 +49,37 @@ else:
         )
     }
 
+# Replică de citire (opțională): DATABASE_REPLICA_URL, ex. postgres://… sau, local, sqlite:////cale/replica.sqlite3.
+# Doar view-urile marcate (core.db_router.use_replica) și încărcarea catalogului citesc de pe ea.
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default='')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = {
+        **dj_database_url.parse(DATABASE_REPLICA_URL, conn_max_age=600, conn_health_checks=True),
+        'TEST': {'MIRROR': 'default'},  # în teste replica e aceeași bază cu principala
+    }
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# Cache – trebuie partajat între procese: versiunile catalogului (core.catalog) invalidează
+# catalogul din memoria fiecărui worker. REDIS_URL → Redis (pachetul `redis`); altfel, în
+# production, tabela `nutriplan_cache` din baza de date (`python manage.py createcachetable`).
+# În development fără REDIS_URL rămâne cache-ul local (un singur proces runserver).
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif not DEBUG:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'nutriplan_cache',
+            'OPTIONS': {'MAX_ENTRIES': 20000},
+        }
+    }
+
 # Email
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
@@ -79,6 +110,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ServerTimingMiddleware',  # inactiv cât timp SERVER_TIMING_SAMPLE_RATE = 0
+    'core.db_router.ReplicaRoutingMiddleware',  # fără efect fără DATABASE_REPLICA_URL
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -102,6 +135,14 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'backend.wsgi.application'
 
+# Django REST Framework – JSON prin orjson (core.api.renderers; fără orjson, encoder-ul DRF)
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
@@ -149,6 +190,36 @@ LOGIN_URL = '/login/'
 # CSRF
 CSRF_TRUSTED_ORIGINS = config('CSRF_TRUSTED_ORIGINS', default='http://127.0.0.1:8000', cast=Csv())
 
+# NutriPlan – generare planuri
+# Cât timp (secunde) e folosit un catalog din memoria procesului înainte de reîncărcare, chiar dacă
+# versiunea din cache nu s-a schimbat (plasă de siguranță pentru chei evacuate din cache; 0 = fără limită)
+CATALOG_LOCAL_TTL = config('CATALOG_LOCAL_TTL', default=300, cast=int)
+# Cât timp (secunde) rămâne în cache rezultatul unei generări (0 = dezactivat)
+PLAN_RESULT_CACHE_TIMEOUT = config('PLAN_RESULT_CACHE_TIMEOUT', default=600, cast=int)
+# Cât timp (secunde) rămâne în cache rezolvarea slug → restaurant și lista restaurantelor
+RESTAURANT_CACHE_TIMEOUT = config('RESTAURANT_CACHE_TIMEOUT', default=300, cast=int)
+# Cât timp (secunde) rămâne în cache corpul randat al unui plan salvat (0 = dezactivat)
+PLAN_DETAIL_CACHE_TIMEOUT = config('PLAN_DETAIL_CACHE_TIMEOUT', default=3600, cast=int)
+# Rezerva de planuri pre-generate (core.plan_pool): planuri per bucket (0 = dezactivat),
+# numărul maxim de bucket-uri ținute în memorie și thread-urile care o reumplu
+PLAN_POOL_SIZE = config('PLAN_POOL_SIZE', default=0, cast=int)
+PLAN_POOL_MAX_BUCKETS = config('PLAN_POOL_MAX_BUCKETS', default=256, cast=int)
+PLAN_POOL_WORKERS = config('PLAN_POOL_WORKERS', default=2, cast=int)
+# Câte zile nu se repetă un fel la aceeași masă (core.rotation), dacă restaurantul are destule feluri
+PLAN_ROTATION_COOLDOWN_DAYS = config('PLAN_ROTATION_COOLDOWN_DAYS', default=3, cast=int)
+# După o scriere, câte secunde citesc de pe principală cererile aceluiași browser (și încărcarea catalogului)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+# Salvarea MealPlan-urilor prin coada de sarcini (core.jobs, worker: `manage.py run_jobs`)
+DEFER_PLAN_PERSISTENCE = config('DEFER_PLAN_PERSISTENCE', default=False, cast=bool)
+# Câte zile rămân în tabela Job sarcinile terminate (done / failed) înainte să fie șterse de `run_jobs`
+JOB_RETENTION_DAYS = config('JOB_RETENTION_DAYS', default=7, cast=int)
+# `archive_mealplans`: planurile mai vechi de atâtea zile trec în arhiva comprimată (MealPlanArchive)
+MEALPLAN_ARCHIVE_AFTER_DAYS = config('MEALPLAN_ARCHIVE_AFTER_DAYS', default=365, cast=int)
+# Fracțiunea de cereri măsurate de ServerTimingMiddleware (0 = dezactivat, 1 = toate); log în 'core.timing'
+SERVER_TIMING_SAMPLE_RATE = config('SERVER_TIMING_SAMPLE_RATE', default=0.0, cast=float)
+# Câte dintre cele mai lente interogări apar în linia de log
+SERVER_TIMING_SLOW_QUERIES = config('SERVER_TIMING_SLOW_QUERIES', default=3, cast=int)
+
 # Securitate extra pentru production
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
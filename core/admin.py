@@ -1,6 +1,15 @@
 # core/admin.py
-from django.contrib import admin
-from .models import Restaurant, UserProfile, Dish, MacroRatio, MealPlan, Allergen, ClientMembership
+import io
+
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
+
+from .forms import DishImportForm
+from .importers import detect_format, import_dishes
+from .models import (
+    Restaurant, UserProfile, Dish, MacroRatio, MealPlan, MealPlanArchive, Allergen, ClientMembership, Job,
+)
 
 
 # TITLURI FRUMOASE PENTRU ADMIN
@@ -15,7 +24,39 @@ class RestaurantAdmin(admin.ModelAdmin):
     list_filter = ['is_active', 'created_at']
     search_fields = ['name', 'slug', 'owner__username']
     readonly_fields = ['slug', 'created_at']
-    
+    filter_horizontal = ['excluded_default_dishes']
+    actions = ['import_dishes_action']
+
+    @admin.action(description='Importă feluri din CSV / JSONL', permissions=['change'])
+    def import_dishes_action(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(request, 'Selectează un singur restaurant pentru import.', messages.WARNING)
+            return None
+        restaurant = queryset.get()
+
+        form = DishImportForm(request.POST, request.FILES) if 'apply' in request.POST else DishImportForm()
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            fh = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+            report = import_dishes(
+                fh, restaurant,
+                fmt=form.cleaned_data['format'] or detect_format(upload.name),
+                replace_allergens=not form.cleaned_data['keep_allergens'],
+            )
+            self.message_user(request, f'{restaurant.name}: {report}', messages.SUCCESS)
+            for line, message in report.errors[:20]:
+                self.message_user(request, f'Linia {line}: {message}', messages.WARNING)
+            return None
+
+        return TemplateResponse(request, 'admin/core/restaurant/import_dishes.html', {
+            **self.admin_site.each_context(request),
+            'title': 'Import feluri',
+            'form': form,
+            'restaurant': restaurant,
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+            'opts': self.model._meta,
+        })
+
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'created_at']
@@ -56,6 +97,23 @@ class MealPlanAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
     list_per_page = 20
 
+
+@admin.register(MealPlanArchive)
+class MealPlanArchiveAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'daily_calories', 'created_at', 'archived_at']
+    search_fields = ['user__username']
+    readonly_fields = ['id', 'user', 'daily_calories', 'snapshot_restaurant_id', 'created_at', 'archived_at']
+    list_per_page = 20
+
 @admin.register(Allergen)
 class AllergenAdmin(admin.ModelAdmin):
-    list_display = ['name']
\ No newline at end of file
+    list_display = ['name']
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['idempotency_key', 'last_error']
+    readonly_fields = ['created_at', 'finished_at', 'locked_at']
+    list_per_page = 50
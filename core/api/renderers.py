@@ -0,0 +1,77 @@
+# core/api/renderers.py
+"""
+Renderer-e JSON pentru planuri.
+
+`FastJSONRenderer` face același JSON ca `JSONRenderer` din DRF, dar cu orjson
+(dacă e instalat; altfel cade pe implementarea DRF). `CompactPlanJSONRenderer`
+(`?format=compact` sau `Accept: application/vnd.nutriplan.compact+json`) trimite
+fiecare fel ca listă de valori, în ordinea din `dish_fields`, în loc de un obiect
+cu aceleași 8 chei repetate – aproximativ jumătate din bytes pentru un plan.
+"""
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson e opțional (requirements.txt)
+    orjson = None
+
+DISH_FIELDS = ["id", "name", "grams", "calories", "proteins", "carbs", "fats", "is_past"]
+
+_default = JSONEncoder().default  # Decimal, datetime, lazy strings … ca în DRF
+
+
+def dumps(data):
+    """JSON (bytes, UTF-8) pentru `data`; orjson dacă e disponibil."""
+    if orjson is None:
+        return JSONRenderer().render(data)
+    return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Indentarea cerută explicit (browsable API, `; indent=4`) rămâne pe calea DRF
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = dumps(data)
+        # Ca DRF: U+2028 / U+2029 escapate, ca JSON-ul să fie valid și ca JavaScript
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+# ==================== FORMAT COMPACT ====================
+def compact_plan_result(result):
+    """Rezultatul unui plan cu felurile ca liste (`dish_fields` dă ordinea valorilor)."""
+    meals = result.get("meals")
+    if not isinstance(meals, dict):
+        return result
+    compact = dict(result)
+    compact["dish_fields"] = DISH_FIELDS
+    compact["meals"] = {
+        day: {
+            meal: [[dish.get(field) for field in DISH_FIELDS] for dish in dishes]
+            for meal, dishes in day_meals.items()
+        }
+        for day, day_meals in meals.items()
+    }
+    return compact
+
+
+class CompactPlanJSONRenderer(FastJSONRenderer):
+    media_type = 'application/vnd.nutriplan.compact+json'
+    format = 'compact'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            if isinstance(data.get("results"), list):  # generarea în lot
+                data = dict(data, results=[compact_plan_result(result) for result in data["results"]])
+            else:
+                data = compact_plan_result(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+# Renderer-ele view-urilor care întorc planuri: JSON rapid implicit, compact la cerere
+PLAN_RENDERER_CLASSES = [FastJSONRenderer, CompactPlanJSONRenderer, BrowsableAPIRenderer]
@@ -1,6 +1,28 @@
 # core/api/serializers.py
 from rest_framework import serializers
-from core.models import MacroRatio, Allergen
+from rest_framework.fields import empty
+from core.models import MacroRatio, Allergen, MEAL_TYPES
+from core.services import MAX_PLAN_WEEKS
+
+
+class LookupPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Ca `PrimaryKeyRelatedField`, dar caută întâi în `context['lookups'][Model]`
+    (un dict pk → obiect încărcat o singură dată, ex: pentru un lot de profiluri).
+    """
+
+    def to_internal_value(self, data):
+        lookup = self.context.get('lookups', {}).get(self.get_queryset().model)
+        if lookup is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return lookup[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
 
 
 class GenerateMealPlanSerializer(serializers.Serializer):
@@ -15,7 +37,7 @@ class GenerateMealPlanSerializer(serializers.Serializer):
         ('active', 'Activitate intensă'),
         ('very_active', 'Foarte intensă'),
     ])
-    macro_ratio = serializers.PrimaryKeyRelatedField(
+    macro_ratio = LookupPrimaryKeyRelatedField(
         queryset=MacroRatio.objects.all()
     )
 
@@ -25,12 +47,17 @@ class GenerateMealPlanSerializer(serializers.Serializer):
     is_raw_vegan = serializers.BooleanField(default=False, required=False)
     is_gluten_free = serializers.BooleanField(default=False, required=False)
     is_lactose_free = serializers.BooleanField(default=False, required=False)
-    allergens = serializers.PrimaryKeyRelatedField(
+    allergens = LookupPrimaryKeyRelatedField(
         many=True,
         queryset=Allergen.objects.all(),
         required=False
     )
 
+    # Opțional: același seed → același plan (reproductibil)
+    seed = serializers.IntegerField(required=False, allow_null=True, min_value=0)
+    # Lungimea planului (abonamentul lunar = 4 săptămâni)
+    weeks = serializers.IntegerField(required=False, default=1, min_value=1, max_value=MAX_PLAN_WEEKS)
+
 
 class MealPlanResultSerializer(serializers.Serializer):
     success = serializers.BooleanField(default=True)
@@ -42,4 +69,69 @@ class MealPlanResultSerializer(serializers.Serializer):
     fats = serializers.IntegerField()
     fiber = serializers.IntegerField()
     saved_plan_id = serializers.IntegerField(allow_null=True, required=False)
-    meals = serializers.JSONField() 
\ No newline at end of file
+    saved_plan_pending = serializers.BooleanField(default=False, required=False)  # salvare pusă în coadă
+    meals = serializers.JSONField()
+
+
+# Câmpurile rezultatului, cu valoarea folosită când lipsesc din dict (ca la serializer)
+RESULT_FIELD_DEFAULTS = {
+    name: field.default if field.default is not empty else None
+    for name, field in MealPlanResultSerializer().fields.items()
+}
+
+
+def trusted_plan_result(plan_data):
+    """
+    Ce ar da `MealPlanResultSerializer(plan_data).data` pentru ieșirea serviciului
+    (`core.services.plan_result`), fără trecerea câmp cu câmp prin serializer –
+    tipurile sunt deja cele corecte, iar `meals` e un JSONField (trecut neschimbat).
+    """
+    return {name: plan_data.get(name, default) for name, default in RESULT_FIELD_DEFAULTS.items()}
+
+
+class DishCatalogQuerySerializer(serializers.Serializer):
+    """Parametrii de filtrare pentru catalogul de feluri (query string)."""
+    meal_type = serializers.ChoiceField(choices=MEAL_TYPES, required=False)
+    vegan = serializers.BooleanField(default=False, required=False)
+    vegetarian = serializers.BooleanField(default=False, required=False)
+    raw_vegan = serializers.BooleanField(default=False, required=False)
+    gluten_free = serializers.BooleanField(default=False, required=False)
+    lactose_free = serializers.BooleanField(default=False, required=False)
+    allergens = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list)
+
+
+class CatalogDishSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    meal_type = serializers.CharField()
+    calories = serializers.IntegerField()
+    proteins = serializers.FloatField()
+    carbs = serializers.FloatField()
+    fats = serializers.FloatField()
+    fiber = serializers.FloatField()
+    allergens = serializers.ListField(source='allergen_ids', child=serializers.IntegerField())
+
+
+# ==================== COMENZI ====================
+class OrderFromPlanSerializer(serializers.Serializer):
+    # Indicii zilelor din plan (0 = prima zi); lipsă → toată săptămâna
+    days = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6), required=False, allow_empty=False
+    )
+
+
+class OrderItemSerializer(serializers.Serializer):
+    dish = serializers.IntegerField(source='dish_id')
+    name = serializers.CharField(source='dish.name')
+    quantity = serializers.IntegerField()
+    price = serializers.DecimalField(max_digits=8, decimal_places=2)
+
+
+class OrderSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.CharField()
+    restaurant = serializers.IntegerField(source='restaurant_id')
+    meal_plan = serializers.IntegerField(source='meal_plan_id')
+    total_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    items = OrderItemSerializer(many=True)
+    skipped = serializers.IntegerField()
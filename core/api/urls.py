@@ -1,7 +1,13 @@
 # core\api\urls.py
 from django.urls import path
-from .views import GenerateMealPlanAPI
+from .views import (
+    GenerateMealPlanAPI, GenerateMealPlanBatchAPI, DishCatalogAPI, OrderFromPlanAPI, generate_meal_plan_async,
+)
 
 urlpatterns = [
-    path('generate/', GenerateMealPlanAPI.as_view(), name='generate-plan'),
+    path('<slug:restaurant_slug>/generate/', GenerateMealPlanAPI.as_view(), name='api-generate-plan'),
+    path('<slug:restaurant_slug>/generate-async/', generate_meal_plan_async, name='api-generate-async'),
+    path('<slug:restaurant_slug>/generate-batch/', GenerateMealPlanBatchAPI.as_view(), name='api-generate-batch'),
+    path('<slug:restaurant_slug>/dishes/', DishCatalogAPI.as_view(), name='api-dish-catalog'),
+    path('<slug:restaurant_slug>/plans/<int:plan_id>/order/', OrderFromPlanAPI.as_view(), name='api-order-from-plan'),
 ]
\ No newline at end of file
@@ -1,14 +1,34 @@
 # core/api/views.py
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from rest_framework.authentication import CSRFCheck
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .serializers import GenerateMealPlanSerializer, MealPlanResultSerializer 
-from core.services import generate_meal_plan
+from .renderers import PLAN_RENDERER_CLASSES, CompactPlanJSONRenderer, FastJSONRenderer
+from .serializers import (
+    GenerateMealPlanSerializer, DishCatalogQuerySerializer, CatalogDishSerializer,
+    OrderFromPlanSerializer, OrderSerializer, trusted_plan_result,
+)
+from core.catalog import get_catalog
+from core.db_router import use_replica
+from core.models import MEAL_TYPES, MacroRatio, Allergen, MealPlan
+from core.orders import create_order_from_plan
+from core.restaurants import aresolve_restaurant
+from core.services import generate_meal_plan, agenerate_meal_plan, generate_meal_plans_batch, MAX_BATCH_SIZE
 from core.views import RestaurantRequiredMixin  # ← IMPORT IMPORTANT
 
 
 class GenerateMealPlanAPI(RestaurantRequiredMixin, APIView):  # ← ADAUGĂ MIXIN-UL
-    def post(self, request):
+    renderer_classes = PLAN_RENDERER_CLASSES
+
+    def post(self, request, restaurant_slug=None):
         serializer = GenerateMealPlanSerializer(data=request.data)
         
         if not serializer.is_valid():
@@ -20,5 +40,168 @@ class GenerateMealPlanAPI(RestaurantRequiredMixin, APIView):  # ← ADAUGĂ MIXI
             restaurant=request.current_restaurant  # ← acum există garantat
         )
 
-        result_serializer = MealPlanResultSerializer(plan_data)
-        return Response(result_serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        # Ieșirea serviciului are deja forma din MealPlanResultSerializer → fără serializare câmp cu câmp
+        return Response(trusted_plan_result(plan_data), status=status.HTTP_200_OK)
+
+
+# ==================== GENERARE ASYNC (ASGI) ====================
+def _csrf_failure(request):
+    # Aceeași regulă ca SessionAuthentication din DRF: CSRF doar pentru sesiuni autentificate
+    check = CSRFCheck(lambda req: None)
+    check.process_request(request)
+    return check.process_view(request, None, (), {})
+
+
+def _plan_json_response(request, data):
+    # Aceleași renderer-e ca GenerateMealPlanAPI: JSON rapid, compact cu ?format=compact / Accept
+    compact = (request.GET.get('format') == CompactPlanJSONRenderer.format
+               or CompactPlanJSONRenderer.media_type in request.headers.get('Accept', ''))
+    renderer = CompactPlanJSONRenderer() if compact else FastJSONRenderer()
+    return HttpResponse(renderer.render(data), content_type=renderer.media_type, status=status.HTTP_200_OK)
+
+
+@csrf_exempt
+async def generate_meal_plan_async(request, restaurant_slug=None):
+    """
+    Varianta async a `GenerateMealPlanAPI` (DRF nu are view-uri async):
+    aceeași validare și același format de răspuns, servită fără să blocheze worker-ul.
+    """
+    if request.method != "POST":
+        return JsonResponse(
+            {"detail": f'Method "{request.method}" not allowed.'},
+            status=status.HTTP_405_METHOD_NOT_ALLOWED
+        )
+
+    restaurant = await aresolve_restaurant(restaurant_slug)
+    if restaurant is None:
+        return JsonResponse(
+            {"detail": "Restaurantul nu există sau nu este activ."},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    user = await request.auser()
+    if user.is_authenticated and _csrf_failure(request):
+        return JsonResponse({"detail": "CSRF Failed."}, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({"detail": "JSON invalid."}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = GenerateMealPlanSerializer(data=payload)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    plan_data = await agenerate_meal_plan(
+        serializer.validated_data,
+        user=user if user.is_authenticated else None,
+        restaurant=restaurant
+    )
+    return _plan_json_response(request, trusted_plan_result(plan_data))
+
+
+class GenerateMealPlanBatchAPI(RestaurantRequiredMixin, APIView):
+    """
+    Generare în lot: primește o listă de profiluri (sau `{"items": [...]}`) și
+    întoarce câte un rezultat pentru fiecare, cu erorile raportate individual.
+    """
+    renderer_classes = PLAN_RENDERER_CLASSES
+
+    def post(self, request, restaurant_slug=None):
+        items = request.data.get('items') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Trimite o listă nevidă de profiluri."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > MAX_BATCH_SIZE:
+            return Response(
+                {"detail": f"Maxim {MAX_BATCH_SIZE} profiluri per cerere."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Tabele mici, încărcate o dată pentru tot lotul (nu o interogare per profil)
+        context = {'lookups': {
+            MacroRatio: MacroRatio.objects.in_bulk(),
+            Allergen: Allergen.objects.in_bulk(),
+        }}
+
+        results = [None] * len(items)
+        valid_positions, valid_data = [], []
+        for position, item in enumerate(items):
+            serializer = GenerateMealPlanSerializer(data=item, context=context)
+            if serializer.is_valid():
+                valid_positions.append(position)
+                valid_data.append(serializer.validated_data)
+            else:
+                results[position] = {"success": False, "errors": serializer.errors}
+
+        generated = generate_meal_plans_batch(
+            valid_data,
+            user=request.user if request.user.is_authenticated else None,
+            restaurant=request.current_restaurant
+        )
+        for position, plan_data in zip(valid_positions, generated):
+            if plan_data.get("success"):
+                plan_data = trusted_plan_result(plan_data)
+            results[position] = plan_data
+
+        for position, result in enumerate(results):
+            result["index"] = position
+
+        succeeded = sum(1 for result in results if result.get("success"))
+        return Response({
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results,
+        }, status=status.HTTP_200_OK)
+
+
+class DishCatalogAPI(RestaurantRequiredMixin, APIView):
+    """Felurile eligibile din catalogul restaurantului, filtrate prin indexul pe biți."""
+
+    @method_decorator(use_replica)
+    def get(self, request, restaurant_slug=None):
+        params = request.query_params.copy()
+        if 'allergens' in params:
+            # Acceptă atât ?allergens=1&allergens=3 cât și ?allergens=1,3
+            params.setlist('allergens', [
+                value for raw in params.getlist('allergens') for value in raw.split(',') if value
+            ])
+        query = DishCatalogQuerySerializer(data=params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        constraints = dict(query.validated_data)
+        meal_type = constraints.pop('meal_type', None)
+        meal_types = [meal_type] if meal_type else [value for value, _ in MEAL_TYPES]
+
+        catalog = get_catalog(request.current_restaurant)
+        data = {
+            value: CatalogDishSerializer(catalog.available(value, constraints), many=True).data
+            for value in meal_types
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class OrderFromPlanAPI(RestaurantRequiredMixin, APIView):
+    """Transformă un plan salvat al userului (sau doar câteva zile din el) într-o comandă."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, restaurant_slug=None, plan_id=None):
+        serializer = OrderFromPlanSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        plan = get_object_or_404(MealPlan, pk=plan_id, user=request.user)
+        days = serializer.validated_data.get('days')
+        try:
+            order, items, skipped = create_order_from_plan(
+                plan, request.current_restaurant, days=set(days) if days else None
+            )
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        order.items = items
+        order.skipped = skipped
+        return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,86 @@
+# core/archive.py
+"""
+Arhivarea planurilor vechi, folosită de comanda `archive_mealplans`.
+
+Planurile create înainte de o dată trec din `MealPlan` în `MealPlanArchive`,
+pe bucăți (`chunk_size`) parcurse după ID: fiecare bucată e citită cu `values()`
+și blocată (`select_for_update(skip_locked=True)` – un alt proces care arhivează în
+paralel sare peste ea), scrisă cu un `bulk_create` și ștearsă din tabela principală
+în aceeași tranzacție. Se șterg doar planurile scrise efectiv în arhivă: un ID deja
+prezent acolo rămâne în `MealPlan` și e raportat. Tabela `MealPlan` rămâne mică (planurile recente), iar planurile
+arhivate se deschid în continuare din `plan_detail_view`.
+
+Planurile legate de o comandă rămân în `MealPlan` (Order.meal_plan ar deveni NULL).
+"""
+from django.db import transaction
+
+from core.models import MealPlan, MealPlanArchive
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Câmpurile care intră comprimate în `MealPlanArchive.data`
+ARCHIVED_FIELDS = [
+    field.attname for field in MealPlan._meta.concrete_fields
+    if field.name not in ('id', 'user', 'created_at')
+]
+
+
+class ArchiveReport:
+    def __init__(self):
+        self.archived = 0
+        self.chunks = 0
+        self.conflicts = []  # ID-uri deja prezente în arhivă, lăsate în MealPlan
+
+    def __str__(self):
+        text = f'{self.archived} planuri arhivate în {self.chunks} bucăți'
+        if self.conflicts:
+            text += f', {len(self.conflicts)} lăsate în MealPlan (ID deja arhivat)'
+        return text
+
+
+def archive_entry(row):
+    """`MealPlanArchive` nesalvat dintr-un rând `MealPlan.objects.values(...)`."""
+    data = {field: row[field] for field in ARCHIVED_FIELDS}
+    snapshot = data.get('user_snapshot')
+    return MealPlanArchive(
+        id=row['id'],
+        user_id=row['user_id'],
+        macro_ratio_id=row['macro_ratio_id'],
+        created_at=row['created_at'],
+        daily_calories=row['daily_calories'],
+        snapshot_restaurant_id=snapshot.get('restaurant_id') if isinstance(snapshot, dict) else None,
+        data=data,
+    )
+
+
+def archive_meal_plans(cutoff, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, on_chunk=None):
+    """
+    Mută în arhivă planurile create înainte de `cutoff` (fără comenzi legate).
+    `on_chunk(report)` e apelat după fiecare bucată (progres / pauză între bucăți).
+    """
+    report = ArchiveReport()
+    candidates = MealPlan.objects.filter(created_at__lt=cutoff, order__isnull=True).order_by('id')
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                candidates.filter(id__gt=last_id)
+                .select_for_update(skip_locked=True, of=('self',))
+                .values('id', 'user_id', 'created_at', *ARCHIVED_FIELDS)[:chunk_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+
+            ids = [row['id'] for row in rows]
+            conflicts = set(MealPlanArchive.objects.filter(id__in=ids).values_list('id', flat=True))
+            rows = [row for row in rows if row['id'] not in conflicts]
+            if not dry_run and rows:
+                MealPlanArchive.objects.bulk_create([archive_entry(row) for row in rows])
+                MealPlan.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        report.conflicts.extend(sorted(conflicts))
+        report.archived += len(rows)
+        report.chunks += 1
+        if on_chunk is not None:
+            on_chunk(report)
+    return report
@@ -0,0 +1,364 @@
+# core/catalog.py
+"""
+Catalogul de feluri al unui restaurant, ținut în memoria procesului.
+
+Felurile active ale restaurantului (cu alergenii lor) se încarcă o singură
+dată, se grupează pe `meal_type`, iar filtrarea dietetică și eșantionarea
+se fac în Python. Un plan săptămânal costă astfel cel mult o încărcare de
+catalog (zero interogări când catalogul este deja în memorie).
+
+Felurile marcate `is_default` formează un catalog implicit, încărcat o singură
+dată per proces și combinat la căutare cu felurile proprii ale fiecărui
+restaurant (`MergedCatalog`): un fel propriu cu același nume îl înlocuiește pe
+cel implicit, iar `Restaurant.excluded_default_dishes` le ascunde explicit.
+
+Invalidarea se face prin versiune: fiecare restaurant (și catalogul implicit) are
+un contor în cache-ul Django, incrementat de semnalele din `core.signals` când se
+modifică un `Dish` sau alergenii lui. Un catalog cu versiune veche este reîncărcat
+la următorul acces. Contorul ajunge la celelalte procese doar printr-un cache
+partajat (Redis / baza de date, vezi CACHES); în plus, un catalog mai vechi de
+CATALOG_LOCAL_TTL secunde e reîncărcat oricum – dacă o cheie de versiune a fost
+evacuată din cache, procesul nu rămâne la nesfârșit pe felurile vechi.
+
+Încărcarea citește de pe replică (`core.db_router`), cu excepția primelor
+REPLICA_PIN_SECONDS după o invalidare: o replică în urmă ar rămâne altfel în
+memorie sub versiunea nouă până la următoarea modificare.
+"""
+import asyncio
+import time
+from collections import ChainMap
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.db_router import replica_configured, replica_pin_seconds, replica_reads
+from core.dish_index import (
+    CompiledConstraints, DishIndex, decode_allergens, encode_allergens, encode_diet_flags,
+)
+from core.models import Dish, Restaurant, MEAL_TYPES
+from core.sampling import get_sampler
+
+
+CATALOG_VERSION_KEY = 'catalog:version:{restaurant_id}'
+# Pus la invalidare, expiră după REPLICA_PIN_SECONDS: până atunci catalogul se încarcă de pe principală
+CATALOG_FRESH_KEY = 'catalog:fresh:{restaurant_id}'
+
+# restaurant_id / DEFAULT_CATALOG -> RestaurantCatalog (local procesului)
+_catalogs = {}
+# restaurant_id -> MergedCatalog (felurile proprii + catalogul implicit)
+_merged = {}
+
+
+# ==================== ÎNREGISTRARE FEL ====================
+class CatalogDish:
+    """Copie ușoară, read-only, a unui `Dish` (fără ORM, fără Decimal, flag-uri pe biți)."""
+
+    __slots__ = (
+        'id', 'name', 'meal_type', 'calories', 'proteins', 'carbs', 'fats', 'fiber',
+        'diet_flags', 'allergen_bits',
+    )
+
+    def __init__(self, dish, allergen_ids):
+        self.id = dish.id
+        self.name = dish.name
+        self.meal_type = dish.meal_type
+        self.calories = dish.calories
+        self.proteins = float(dish.proteins)
+        self.carbs = float(dish.carbs)
+        self.fats = float(dish.fats)
+        self.fiber = float(dish.fiber)
+        self.diet_flags = encode_diet_flags(dish)
+        self.allergen_bits = encode_allergens(allergen_ids)
+
+    @property
+    def allergen_ids(self):
+        return decode_allergens(self.allergen_bits)
+
+    def __repr__(self):
+        return f"<CatalogDish {self.id}: {self.name}>"
+
+
+def dish_matches(dish, constraints):
+    """Echivalentul în Python al filtrelor din `services.get_available_dishes`."""
+    compiled = CompiledConstraints.from_constraints(constraints)
+    return compiled.allows(dish.diet_flags, dish.allergen_bits)
+
+
+# ==================== CATALOG RESTAURANT ====================
+class RestaurantCatalog:
+    """Un set de feluri încărcat o dată: felurile proprii ale unui restaurant sau catalogul implicit."""
+
+    def __init__(self, restaurant_id, version, dishes, excluded_default_ids=()):
+        self.restaurant_id = restaurant_id
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.by_id = {dish.id: dish for dish in dishes}
+        self.by_name = {dish.name: dish for dish in self.by_id.values()}
+        self.excluded_default_ids = frozenset(excluded_default_ids)
+        self.index = DishIndex(self.by_id.values(), meal_types=[meal_type for meal_type, _ in MEAL_TYPES])
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def available(self, meal_type, constraints=None):
+        """Felurile compatibile cu constrângerile, pentru un tip de masă."""
+        return self.index.eligible(meal_type, constraints)
+
+    def sample(self, meal_type, constraints=None, k=12, sampler=None):
+        """Maxim `k` feluri compatibile, în ordine aleatoare."""
+        candidates = self.available(meal_type, constraints)
+        return get_sampler(sampler).sample(candidates, k)
+
+
+class MergedCatalog:
+    """
+    Felurile proprii ale restaurantului + catalogul implicit partajat, combinate la căutare.
+
+    Felurile implicite nu se copiază per restaurant: se țin o singură dată în
+    procesul curent, iar aici păstrăm doar ID-urile ascunse pentru acest restaurant
+    (excluse explicit sau înlocuite de un fel propriu cu același nume).
+    """
+
+    def __init__(self, own, default):
+        self.own = own
+        self.default = default
+        self.restaurant_id = own.restaurant_id
+        self.version = f"{own.version}.{default.version}"
+
+        hidden = set(own.excluded_default_ids) | (own.by_id.keys() & default.by_id.keys())
+        for name in own.by_name.keys() & default.by_name.keys():
+            hidden.add(default.by_name[name].id)
+        self.hidden_default_ids = frozenset(hidden)
+
+        # Și felurile ascunse rămân găsibile după ID (planurile vechi le pot referi)
+        self.by_id = ChainMap(own.by_id, default.by_id)
+
+    def __len__(self):
+        return len(self.own) + len(self.default.by_id.keys() - self.hidden_default_ids - self.own.by_id.keys())
+
+    def available(self, meal_type, constraints=None):
+        compiled = CompiledConstraints.from_constraints(constraints)
+        own = self.own.available(meal_type, compiled)
+        if not self.default.by_id:
+            return own
+        hidden = self.hidden_default_ids
+        return own + [dish for dish in self.default.available(meal_type, compiled) if dish.id not in hidden]
+
+    def sample(self, meal_type, constraints=None, k=12, sampler=None):
+        candidates = self.available(meal_type, constraints)
+        return get_sampler(sampler).sample(candidates, k)
+
+
+# ==================== ÎNCĂRCARE + INVALIDARE ====================
+# Cheia catalogului implicit (felurile cu is_default=True, ale oricărui restaurant)
+DEFAULT_CATALOG = 'default'
+
+CATALOG_DISH_FIELDS = (
+    'id', 'name', 'meal_type', 'calories', 'proteins', 'carbs', 'fats', 'fiber',
+    'is_vegan', 'is_vegetarian', 'is_raw_vegan', 'is_gluten_free', 'is_lactose_free',
+)
+
+
+def _restaurant_id(restaurant):
+    return getattr(restaurant, 'pk', restaurant)
+
+
+def _version_key(catalog_id):
+    return CATALOG_VERSION_KEY.format(restaurant_id=catalog_id)
+
+
+def get_catalog_version(restaurant):
+    return cache.get(_version_key(_restaurant_id(restaurant)), 0)
+
+
+def bump_catalog_version(restaurant):
+    """
+    Marchează catalogul restaurantului ca expirat (în toate procesele care partajează cache-ul).
+    `bump_catalog_version(DEFAULT_CATALOG)` expiră catalogul implicit, deci toate restaurantele.
+    """
+    catalog_id = _restaurant_id(restaurant)
+    key = _version_key(catalog_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+    if replica_configured():
+        cache.set(CATALOG_FRESH_KEY.format(restaurant_id=catalog_id), True, replica_pin_seconds())
+    _catalogs.pop(catalog_id, None)
+    if catalog_id != DEFAULT_CATALOG:
+        _merged.pop(catalog_id, None)
+
+
+def _load_reads(recently_changed):
+    return nullcontext() if recently_changed or not replica_configured() else replica_reads()
+
+
+def _dish_filters(catalog_id):
+    if catalog_id == DEFAULT_CATALOG:
+        return {'is_default': True, 'is_active': True}
+    return {'restaurant_id': catalog_id, 'is_active': True}
+
+
+def load_catalog(restaurant, version=None):
+    """
+    Încarcă din baza de date felurile active ale restaurantului (alergenii prefetch-uiți)
+    și lista felurilor implicite excluse. Cu `DEFAULT_CATALOG` încarcă catalogul implicit.
+    """
+    catalog_id = _restaurant_id(restaurant)
+    if version is None:
+        version = get_catalog_version(catalog_id)
+
+    queryset = (
+        Dish.objects
+        .filter(**_dish_filters(catalog_id))
+        .only(*CATALOG_DISH_FIELDS)
+        .prefetch_related('allergens')
+        .order_by('id')  # ordine stabilă → eșantionare reproductibilă cu seed
+    )
+    fresh_key = CATALOG_FRESH_KEY.format(restaurant_id=catalog_id)
+    with _load_reads(replica_configured() and cache.get(fresh_key)):
+        dishes = [
+            CatalogDish(dish, [allergen.id for allergen in dish.allergens.all()])
+            for dish in queryset
+        ]
+
+        excluded = ()
+        if catalog_id != DEFAULT_CATALOG:
+            excluded = list(Restaurant.excluded_default_dishes.through.objects.filter(
+                restaurant_id=catalog_id
+            ).values_list('dish_id', flat=True))
+    return RestaurantCatalog(catalog_id, version, dishes, excluded_default_ids=excluded)
+
+
+def _current_versions(restaurant_id):
+    versions = cache.get_many([_version_key(restaurant_id), _version_key(DEFAULT_CATALOG)])
+    return versions.get(_version_key(restaurant_id), 0), versions.get(_version_key(DEFAULT_CATALOG), 0)
+
+
+def get_merged_catalog_version(restaurant):
+    """Versiunea catalogului combinat (`MergedCatalog.version`), fără să-l încarce."""
+    return "{}.{}".format(*_current_versions(_restaurant_id(restaurant)))
+
+
+def catalog_local_ttl():
+    return getattr(settings, 'CATALOG_LOCAL_TTL', 300)
+
+
+def _cached(catalog_id, version):
+    catalog = _catalogs.get(catalog_id)
+    if catalog is None or catalog.version != version:
+        return None
+    ttl = catalog_local_ttl()
+    if ttl and time.monotonic() - catalog.loaded_at > ttl:
+        return None
+    return catalog
+
+
+def _merge(restaurant_id, own, default):
+    merged = _merged.get(restaurant_id)
+    if merged is None or merged.own is not own or merged.default is not default:
+        merged = MergedCatalog(own, default)
+        _merged[restaurant_id] = merged
+    return merged
+
+
+def get_catalog(restaurant):
+    """
+    Catalogul curent al restaurantului (felurile proprii + cele implicite);
+    fiecare parte se reîncarcă doar dacă versiunea ei s-a schimbat.
+    """
+    restaurant_id = _restaurant_id(restaurant)
+    own_version, default_version = _current_versions(restaurant_id)
+
+    own = _cached(restaurant_id, own_version)
+    if own is None:
+        own = _catalogs[restaurant_id] = load_catalog(restaurant_id, own_version)
+    default = _cached(DEFAULT_CATALOG, default_version)
+    if default is None:
+        default = _catalogs[DEFAULT_CATALOG] = load_catalog(DEFAULT_CATALOG, default_version)
+    return _merge(restaurant_id, own, default)
+
+
+# ==================== VARIANTA ASYNC ====================
+async def _aload_meal_type(catalog_id, meal_type):
+    queryset = (
+        Dish.objects
+        .filter(meal_type=meal_type, **_dish_filters(catalog_id))
+        .only(*CATALOG_DISH_FIELDS)
+        .order_by('id')
+    )
+    return [dish async for dish in queryset]
+
+
+async def _aload_allergen_pairs(catalog_id):
+    filters = {f'dish__{field}': value for field, value in _dish_filters(catalog_id).items()}
+    queryset = Dish.allergens.through.objects.filter(**filters).values_list('dish_id', 'allergen_id')
+    return [pair async for pair in queryset]
+
+
+async def _aload_excluded(catalog_id):
+    if catalog_id == DEFAULT_CATALOG:
+        return []
+    queryset = Restaurant.excluded_default_dishes.through.objects.filter(
+        restaurant_id=catalog_id
+    ).values_list('dish_id', flat=True)
+    return [dish_id async for dish_id in queryset]
+
+
+async def aload_catalog(restaurant, version=None):
+    """
+    Ca `load_catalog`, dar cu ORM-ul async, fără să blocheze event loop-ul.
+    Interogările nu rulează în paralel: ORM-ul async le trimite pe rând, prin
+    același thread sincron (`sync_to_async(thread_sensitive=True)`) și aceeași conexiune.
+    """
+    catalog_id = _restaurant_id(restaurant)
+    if version is None:
+        version = await cache.aget(_version_key(catalog_id), 0)
+
+    fresh_key = CATALOG_FRESH_KEY.format(restaurant_id=catalog_id)
+    with _load_reads(replica_configured() and await cache.aget(fresh_key)):
+        *groups, allergen_pairs, excluded = await asyncio.gather(
+            *(_aload_meal_type(catalog_id, meal_type) for meal_type, _ in MEAL_TYPES),
+            _aload_allergen_pairs(catalog_id),
+            _aload_excluded(catalog_id),
+        )
+    allergens_by_dish = {}
+    for dish_id, allergen_id in allergen_pairs:
+        allergens_by_dish.setdefault(dish_id, []).append(allergen_id)
+
+    # Aceeași ordine ca la `load_catalog` (după id), ca seed-ul să dea același rezultat
+    dishes = sorted((dish for group in groups for dish in group), key=lambda dish: dish.id)
+    return RestaurantCatalog(
+        catalog_id, version,
+        [CatalogDish(dish, allergens_by_dish.get(dish.id, ())) for dish in dishes],
+        excluded_default_ids=excluded,
+    )
+
+
+async def aget_catalog(restaurant):
+    restaurant_id = _restaurant_id(restaurant)
+    versions = await cache.aget_many([_version_key(restaurant_id), _version_key(DEFAULT_CATALOG)])
+    own_version = versions.get(_version_key(restaurant_id), 0)
+    default_version = versions.get(_version_key(DEFAULT_CATALOG), 0)
+
+    own = _cached(restaurant_id, own_version)
+    default = _cached(DEFAULT_CATALOG, default_version)
+    if own is None and default is None:
+        own, default = await asyncio.gather(
+            aload_catalog(restaurant_id, own_version),
+            aload_catalog(DEFAULT_CATALOG, default_version),
+        )
+    elif own is None:
+        own = await aload_catalog(restaurant_id, own_version)
+    elif default is None:
+        default = await aload_catalog(DEFAULT_CATALOG, default_version)
+    _catalogs[restaurant_id] = own
+    _catalogs[DEFAULT_CATALOG] = default
+    return _merge(restaurant_id, own, default)
+
+
+def clear_catalogs():
+    """Golește cache-ul local al procesului (util în teste / comenzi)."""
+    _catalogs.clear()
+    _merged.clear()
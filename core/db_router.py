@@ -0,0 +1,155 @@
+# core/db_router.py
+"""
+Citiri pe replică, scrieri pe baza principală.
+
+Implicit totul merge pe `default`. Doar codul marcat explicit (`replica_reads()`,
+`@use_replica` pe view-uri) citește din alias-ul `replica`, și doar dacă acesta e
+configurat (DATABASE_REPLICA_URL). Din momentul în care o cerere scrie ceva, restul
+ei citește de pe principală; `ReplicaRoutingMiddleware` pune apoi un cookie scurt
+(REPLICA_PIN_SECONDS), ca și cererile imediat următoare ale aceluiași browser
+(ex. pagina planului abia salvat) să nu vadă o replică rămasă în urmă.
+
+Starea stă într-un ContextVar cu un obiect mutabil, deci o scriere făcută prin
+`sync_to_async` e văzută și de middleware-ul async.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+PIN_COOKIE = 'nutriplan_primary'
+# Sesiunea e scrisă la fiecare login → citită mereu de pe principală
+PRIMARY_ONLY_APPS = {'sessions'}
+
+_state = ContextVar('nutriplan_db_routing', default=None)
+
+
+class RoutingState:
+    __slots__ = ('replica_reads', 'pinned', 'wrote')
+
+    def __init__(self, pinned=False):
+        self.replica_reads = False
+        self.pinned = pinned  # citirile rămân pe principală
+        self.wrote = False    # s-a scris în contextul curent
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def replica_pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+def start_routing(pinned=False):
+    state = RoutingState(pinned)
+    return state, _state.set(state)
+
+
+def stop_routing(token):
+    _state.reset(token)
+
+
+@contextmanager
+def replica_reads():
+    """Citirile din bloc merg pe replică (dacă există și contextul n-a scris încă)."""
+    state = _state.get()
+    token = None
+    if state is None:
+        state, token = start_routing()
+    previous = state.replica_reads
+    state.replica_reads = True
+    try:
+        yield
+    finally:
+        state.replica_reads = previous
+        if token is not None:
+            stop_routing(token)
+
+
+def use_replica(view):
+    """Decorator pentru view-uri (sync sau async) care doar citesc."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def _wrapped(*args, **kwargs):
+            with replica_reads():
+                return await view(*args, **kwargs)
+    else:
+        @wraps(view)
+        def _wrapped(*args, **kwargs):
+            with replica_reads():
+                return view(*args, **kwargs)
+    return _wrapped
+
+
+def pin_response_to_primary(response):
+    """Cookie-ul de „citește de pe principală”, pentru răspunsuri care scriu după ce au plecat (flux)."""
+    if replica_configured():
+        response.set_cookie(PIN_COOKIE, '1', max_age=replica_pin_seconds(), httponly=True, samesite='Lax')
+    return response
+
+
+# ==================== ROUTER ====================
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (state is None or not state.replica_reads or state.pinned or not replica_configured()
+                or model._meta.app_label in PRIMARY_ONLY_APPS or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica are aceleași date ca principala
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+# ==================== MIDDLEWARE ====================
+class ReplicaRoutingMiddleware:
+    """
+    Stare de rutare per cerere: pornește „fixată” pe principală dacă browserul a scris
+    recent (cookie `PIN_COOKIE`) și pune cookie-ul când cererea curentă a scris.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        state, token = start_routing(pinned=PIN_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_routing(token)
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        state, token = start_routing(pinned=PIN_COOKIE in request.COOKIES)
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_routing(token)
+        return self.finish(state, response)
+
+    def finish(self, state, response):
+        if state.wrote:
+            pin_response_to_primary(response)
+        return response
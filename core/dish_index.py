@@ -0,0 +1,170 @@
+# core/dish_index.py
+"""
+Index compact pentru verificarea eligibilității felurilor.
+
+Fiecare fel are:
+- `diet_flags`: flag-urile dietetice (vegan, vegetarian, ...) împachetate într-un int;
+- `allergen_bits`: un bitset peste ID-urile `Allergen` (bitul `i` = alergenul cu id `i`);
+- macro-urile ca float-uri (per 100g).
+
+Constrângerile utilizatorului se compilează o singură dată într-o pereche
+(flag-uri obligatorii, alergeni interziși), iar eligibilitatea devine două
+operații pe biți. Pentru un grup întreg de feluri (același `meal_type`)
+filtrarea se face vectorizat, cu NumPy.
+"""
+import numpy as np
+
+
+# ==================== FLAG-URI DIETETICE ====================
+DIET_VEGAN = 1 << 0
+DIET_VEGETARIAN = 1 << 1
+DIET_RAW_VEGAN = 1 << 2
+DIET_GLUTEN_FREE = 1 << 3
+DIET_LACTOSE_FREE = 1 << 4
+
+DIET_FLAG_FIELDS = [
+    ('is_vegan', DIET_VEGAN),
+    ('is_vegetarian', DIET_VEGETARIAN),
+    ('is_raw_vegan', DIET_RAW_VEGAN),
+    ('is_gluten_free', DIET_GLUTEN_FREE),
+    ('is_lactose_free', DIET_LACTOSE_FREE),
+]
+
+# Coloanele matricei de nutrienți (per 100g)
+NUTRIENT_COLUMNS = ('calories', 'proteins', 'carbs', 'fats', 'fiber')
+
+
+def encode_diet_flags(dish):
+    flags = 0
+    for field, bit in DIET_FLAG_FIELDS:
+        if getattr(dish, field):
+            flags |= bit
+    return flags
+
+
+def encode_allergens(allergens):
+    """Bitset (int Python) peste ID-uri de alergeni sau obiecte `Allergen`."""
+    bits = 0
+    for allergen in allergens or ():
+        bits |= 1 << int(getattr(allergen, 'pk', allergen))
+    return bits
+
+
+def decode_allergens(bits):
+    ids = []
+    allergen_id = 0
+    while bits:
+        if bits & 1:
+            ids.append(allergen_id)
+        bits >>= 1
+        allergen_id += 1
+    return ids
+
+
+# ==================== CONSTRÂNGERI COMPILATE ====================
+class CompiledConstraints:
+    """Constrângerile unui utilizator, reduse la (flag-uri obligatorii, alergeni interziși)."""
+
+    __slots__ = ('required_flags', 'forbidden_allergens')
+
+    def __init__(self, required_flags=0, forbidden_allergens=0):
+        self.required_flags = required_flags
+        self.forbidden_allergens = forbidden_allergens
+
+    @classmethod
+    def from_constraints(cls, constraints):
+        if isinstance(constraints, cls):
+            return constraints
+        constraints = constraints or {}
+
+        required = 0
+        # Aceeași logică ca în services.get_available_dishes: vegan acoperă vegetarian
+        if constraints.get('vegan'):
+            required |= DIET_VEGAN
+        elif constraints.get('vegetarian'):
+            required |= DIET_VEGETARIAN
+        if constraints.get('raw_vegan'):
+            required |= DIET_RAW_VEGAN
+        if constraints.get('gluten_free'):
+            required |= DIET_GLUTEN_FREE
+        if constraints.get('lactose_free'):
+            required |= DIET_LACTOSE_FREE
+
+        return cls(required, encode_allergens(constraints.get('allergens')))
+
+    def allows(self, diet_flags, allergen_bits):
+        return (
+            (diet_flags & self.required_flags) == self.required_flags
+            and not (allergen_bits & self.forbidden_allergens)
+        )
+
+
+def _to_words(bits, n_words):
+    """Împarte un bitset int în cuvinte de 64 de biți (pentru NumPy)."""
+    mask = (1 << 64) - 1
+    return [(bits >> (64 * i)) & mask for i in range(n_words)]
+
+
+# ==================== INDEX PE TIP DE MASĂ ====================
+class MealTypeIndex:
+    """Felurile unui `meal_type`, cu flag-uri, alergeni și nutrienți în array-uri NumPy."""
+
+    def __init__(self, dishes):
+        self.dishes = list(dishes)
+        n = len(self.dishes)
+        max_bits = max((dish.allergen_bits.bit_length() for dish in self.dishes), default=0)
+        self.n_words = max(1, (max_bits + 63) // 64)
+
+        self.diet_flags = np.fromiter((dish.diet_flags for dish in self.dishes), dtype=np.uint8, count=n)
+        self.allergen_words = np.array(
+            [_to_words(dish.allergen_bits, self.n_words) for dish in self.dishes],
+            dtype=np.uint64,
+        ).reshape(n, self.n_words)
+        self.nutrients = np.array(
+            [[getattr(dish, column) for column in NUTRIENT_COLUMNS] for dish in self.dishes],
+            dtype=np.float64,
+        ).reshape(n, len(NUTRIENT_COLUMNS))
+
+    def __len__(self):
+        return len(self.dishes)
+
+    def eligible_mask(self, compiled):
+        """Vector boolean: care feluri respectă constrângerile (o singură trecere vectorizată)."""
+        required = np.uint8(compiled.required_flags)
+        mask = (self.diet_flags & required) == required
+        if compiled.forbidden_allergens:
+            # Alergenii cu ID peste cel mai mare din grup nu pot apărea în niciun fel
+            forbidden = np.array(_to_words(compiled.forbidden_allergens, self.n_words), dtype=np.uint64)
+            mask &= ~np.any(self.allergen_words & forbidden, axis=1)
+        return mask
+
+    def eligible_positions(self, compiled):
+        return np.flatnonzero(self.eligible_mask(compiled))
+
+
+class DishIndex:
+    """Index pe `meal_type` peste un set de feluri (ex: catalogul unui restaurant)."""
+
+    def __init__(self, dishes, meal_types=()):
+        grouped = {meal_type: [] for meal_type in meal_types}
+        for dish in dishes:
+            grouped.setdefault(dish.meal_type, []).append(dish)
+        self.groups = {meal_type: MealTypeIndex(items) for meal_type, items in grouped.items()}
+
+    def group(self, meal_type):
+        return self.groups.get(meal_type) or _EMPTY_GROUP
+
+    def eligible(self, meal_type, constraints=None):
+        """Lista felurilor eligibile pentru un tip de masă."""
+        group = self.group(meal_type)
+        compiled = CompiledConstraints.from_constraints(constraints)
+        if not compiled.required_flags and not compiled.forbidden_allergens:
+            return list(group.dishes)
+        return [group.dishes[i] for i in group.eligible_positions(compiled)]
+
+    def count(self, meal_type, constraints=None):
+        compiled = CompiledConstraints.from_constraints(constraints)
+        return int(self.group(meal_type).eligible_mask(compiled).sum())
+
+
+_EMPTY_GROUP = MealTypeIndex([])
@@ -0,0 +1,50 @@
+# core/fields.py
+"""
+Câmpuri de model proprii.
+
+`CompressedJSONField` ține o valoare JSON comprimată zlib într-o coloană binară:
+codul vede dict-uri / liste, baza de date vede câteva sute de bytes în loc de
+câțiva KB. Nu se poate filtra după conținut (nu e JSON în SQL) → pentru ce se
+caută în interogări păstrați coloane separate.
+"""
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+COMPRESSION_LEVEL = 6
+
+
+class CompressedJSONField(models.BinaryField):
+    description = 'JSON comprimat zlib'
+
+    def __init__(self, *args, encoder=DjangoJSONEncoder, **kwargs):
+        self.encoder = encoder
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.encoder is not DjangoJSONEncoder:
+            kwargs['encoder'] = self.encoder
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return json.loads(zlib.decompress(bytes(value)))
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return json.loads(zlib.decompress(bytes(value)))
+        return value
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None:
+            return None
+        data = json.dumps(value, cls=self.encoder, separators=(',', ':')).encode('utf-8')
+        return connection.Database.Binary(zlib.compress(data, COMPRESSION_LEVEL))
+
+    def value_to_string(self, obj):
+        # Fixture-urile / dumpdata primesc JSON-ul, nu bytes în base64
+        return self.value_from_object(obj)
@@ -66,6 +66,24 @@ class MealPlanForm(forms.Form):
         required=False,
         widget=forms.SelectMultiple(attrs={'class': 'form-select form-select-lg'})
     )
+
+    # Opțional: același seed → același plan (reproductibil)
+    seed = forms.IntegerField(required=False, min_value=0, widget=forms.HiddenInput)
+    weeks = forms.TypedChoiceField(
+        choices=[(1, '1 săptămână'), (2, '2 săptămâni'), (4, '4 săptămâni')],
+        coerce=int, required=False, empty_value=1,
+    )
        
     
-   
\ No newline at end of file
+   
+
+# ==================== IMPORT FELURI (ADMIN) ====================
+class DishImportForm(forms.Form):
+    file = forms.FileField(label='Fișier CSV / JSONL')
+    format = forms.ChoiceField(
+        choices=[('', 'După extensie'), ('csv', 'CSV'), ('jsonl', 'JSONL')],
+        required=False
+    )
+    keep_allergens = forms.BooleanField(
+        required=False, label='Păstrează alergenii existenți (doar adaugă)'
+    )
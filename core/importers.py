@@ -0,0 +1,225 @@
+# core/importers.py
+"""
+Import în masă de feluri (CSV / JSONL), folosit de comanda `import_dishes`
+și de acțiunea din admin.
+
+Fișierul e citit rând cu rând și scris pe bucăți (`chunk_size`): fiecare
+bucată e validată, apoi un singur `bulk_create(update_conflicts=True)` face
+upsert pe (name, restaurant), iar alergenii se scriu direct în tabela de
+legătură `Dish.allergens.through`. Memoria depinde doar de mărimea bucății.
+
+La un fel existent se actualizează doar coloanele prezente în fișier: o coloană
+opțională lipsă (ex. price, is_active, is_default, allergens) nu suprascrie
+valoarea existentă cu cea implicită.
+
+Coloane: name, meal_type, calories, proteins, carbs, fats, fiber, price, is_vegan,
+is_vegetarian, is_raw_vegan, is_gluten_free, is_lactose_free, is_default,
+is_active, allergens (nume sau ID-uri; în CSV separate prin ";").
+"""
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from core.catalog import DEFAULT_CATALOG, bump_catalog_version
+from core.models import Allergen, Dish
+
+
+DISH_IMPORT_FIELDS = [
+    'meal_type', 'calories', 'proteins', 'carbs', 'fats', 'fiber', 'price',
+    'is_vegan', 'is_vegetarian', 'is_raw_vegan', 'is_gluten_free', 'is_lactose_free',
+    'is_default', 'is_active',
+]
+BOOLEAN_FIELDS = {'is_vegan', 'is_vegetarian', 'is_raw_vegan', 'is_gluten_free', 'is_lactose_free',
+                  'is_default', 'is_active'}
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+TRUE_VALUES = {'1', 'true', 'da', 'yes', 'y', 'x'}
+FALSE_VALUES = {'', '0', 'false', 'nu', 'no', 'n'}
+
+
+class DishImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []  # (linie, mesaj) – primele MAX_REPORTED_ERRORS
+
+    def add_error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def __str__(self):
+        return f'{self.rows} rânduri: {self.imported} importate, {self.failed} respinse'
+
+
+# ==================== CITIRE ====================
+def detect_format(filename):
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def iter_rows(fh, fmt='csv'):
+    """(număr linie, dict) pentru fiecare rând din fișierul text `fh`."""
+    if fmt == 'csv':
+        reader = csv.DictReader(fh)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_no, line in enumerate(fh, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_no, exc
+            continue
+        yield line_no, row if isinstance(row, dict) else ValueError('rândul JSON trebuie să fie un obiect')
+
+
+# ==================== VALIDARE ====================
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f'valoare booleană invalidă: {value!r}')
+
+
+def _parse_allergens(value, allergen_lookup):
+    if value in (None, ''):
+        return set()
+    items = value if isinstance(value, list) else str(value).split(';')
+    ids = set()
+    for item in items:
+        key = str(item).strip().lower()
+        if not key:
+            continue
+        if key not in allergen_lookup:
+            raise ValueError(f'alergen necunoscut: {item!r}')
+        ids.add(allergen_lookup[key])
+    return ids
+
+
+def build_dish(row, restaurant, allergen_lookup):
+    """
+    `(Dish nesalvat, ID-uri alergeni, coloane prezente)` sau ValueError cu motivul
+    respingerii. ID-urile alergenilor sunt None dacă rândul n-are coloana `allergens`.
+    """
+    name = str(row.get('name') or '').strip()
+    if not name:
+        raise ValueError('lipsește numele')
+
+    values = {}
+    for field in DISH_IMPORT_FIELDS:
+        if field not in row or row[field] in (None, ''):
+            continue
+        values[field] = parse_bool(row[field]) if field in BOOLEAN_FIELDS else row[field]
+
+    dish = Dish(name=name, restaurant=restaurant, **values)
+    try:
+        dish.clean_fields(exclude=['restaurant', 'image'])
+    except ValidationError as exc:
+        raise ValueError('; '.join(f'{field}: {" ".join(msgs)}' for field, msgs in exc.message_dict.items()))
+    columns = tuple(field for field in DISH_IMPORT_FIELDS if field in row)
+    allergen_ids = _parse_allergens(row['allergens'], allergen_lookup) if 'allergens' in row else None
+    return dish, allergen_ids, columns
+
+
+def allergen_lookup_table():
+    """nume (lowercase) și ID (text) → ID, pentru toți alergenii (tabelă mică)."""
+    lookup = {}
+    for pk, name in Allergen.objects.values_list('pk', 'name'):
+        lookup[name.strip().lower()] = pk
+        lookup[str(pk)] = pk
+    return lookup
+
+
+# ==================== SCRIERE ====================
+def _write_chunk(restaurant, chunk, replace_allergens):
+    """`(feluri scrise, atinge catalogul implicit)` pentru o bucată validată."""
+    # Același nume de două ori în bucată → rămâne ultimul (ON CONFLICT nu acceptă dubluri)
+    by_name = {item[0].name: item for item in chunk}
+    dishes = [dish for dish, _, _ in by_name.values()]
+    # Un upsert per set de coloane (în CSV unul singur; în JSONL rândurile pot diferi)
+    by_columns = defaultdict(list)
+    for dish, _, columns in by_name.values():
+        by_columns[columns].append(dish)
+
+    with transaction.atomic():
+        # Feluri implicite înainte de scriere (pot înceta să fie implicite acum)
+        was_default = Dish.objects.filter(restaurant=restaurant, name__in=by_name, is_default=True).exists()
+        for columns, group in by_columns.items():
+            Dish.objects.bulk_create(
+                group,
+                update_conflicts=True,
+                unique_fields=['name', 'restaurant'],
+                update_fields=list(columns),
+            )
+        if not all(dish.pk for dish in dishes):
+            # Backend-urile fără RETURNING la upsert → citim ID-urile într-o singură interogare
+            ids = dict(Dish.objects.filter(restaurant=restaurant, name__in=by_name).values_list('name', 'pk'))
+            for dish in dishes:
+                dish.pk = ids[dish.name]
+
+        # Alergenii se ating doar pentru rândurile care au coloana `allergens`
+        with_allergens = [(dish, allergen_ids) for dish, allergen_ids, _ in by_name.values()
+                          if allergen_ids is not None]
+        through = Dish.allergens.through
+        if replace_allergens and with_allergens:
+            through.objects.filter(dish_id__in=[dish.pk for dish, _ in with_allergens]).delete()
+        through.objects.bulk_create(
+            [through(dish_id=dish.pk, allergen_id=allergen_id)
+             for dish, allergen_ids in with_allergens for allergen_id in allergen_ids],
+            ignore_conflicts=True,
+        )
+    return len(dishes), was_default or any(dish.is_default for dish in dishes)
+
+
+def import_dishes(fh, restaurant, fmt='csv', chunk_size=DEFAULT_CHUNK_SIZE, replace_allergens=True,
+                  dry_run=False):
+    """
+    Importă felurile din `fh` (fișier text) în `restaurant`. Rândurile invalide sunt
+    raportate și sărite; fiecare bucată validă e scrisă în propria tranzacție.
+    `bulk_create` nu trimite semnale → catalogul e invalidat o singură dată, la final.
+    """
+    report = DishImportReport()
+    allergen_lookup = allergen_lookup_table()
+    rows = iter_rows(fh, fmt)
+    touched_default = False
+    try:
+        while True:
+            batch = list(islice(rows, chunk_size))
+            if not batch:
+                break
+            chunk = []
+            for line_no, row in batch:
+                report.rows += 1
+                if isinstance(row, Exception):
+                    report.add_error(line_no, str(row))
+                    continue
+                try:
+                    chunk.append(build_dish(row, restaurant, allergen_lookup))
+                except ValueError as exc:
+                    report.add_error(line_no, str(exc))
+            if chunk and not dry_run:
+                written, has_default = _write_chunk(restaurant, chunk, replace_allergens)
+                report.imported += written
+                touched_default = touched_default or has_default
+            elif chunk:
+                report.imported += len({dish.name for dish, _, _ in chunk})
+    finally:
+        if report.imported and not dry_run:
+            bump_catalog_version(restaurant)
+            # Un fel implicit (înainte sau după scriere) a fost atins → expirăm și catalogul implicit
+            if touched_default:
+                bump_catalog_version(DEFAULT_CATALOG)
+    return report
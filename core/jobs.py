@@ -0,0 +1,127 @@
+# core/jobs.py
+"""
+Coadă de sarcini de fundal, ținută într-o tabelă (`Job`), fără broker extern.
+
+    @register_job('persist_meal_plan')
+    def persist_meal_plan(payload): ...
+
+    enqueue('persist_meal_plan', {...}, idempotency_key='...')
+
+Comanda `run_jobs` ia sarcinile pe loturi (`SELECT ... FOR UPDATE SKIP LOCKED`
+unde baza de date îl suportă, deci mai mulți workeri nu iau aceeași sarcină),
+le rulează și le reîncearcă cu backoff exponențial până la `max_attempts`.
+Handler-ul și marcarea ca terminată sunt în aceeași tranzacție, deci efectele
+în baza de date ale unei sarcini se aplică o singură dată.
+
+Sarcinile terminate (done / failed) sunt șterse după JOB_RETENTION_DAYS zile
+(`prune_finished_jobs`, apelată periodic de `run_jobs`); odată cu ele dispare și
+cheia de idempotență.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+RETRY_BASE_SECONDS = 5
+STALE_AFTER = timedelta(minutes=10)  # o sarcină „running” mai veche de atât e a unui worker oprit
+
+
+def register_job(name):
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_handler(name):
+    return _registry.get(name)
+
+
+def enqueue(name, payload=None, idempotency_key=None, delay=None, max_attempts=5):
+    """
+    Adaugă o sarcină. Cu `idempotency_key`, a doua adăugare cu aceeași cheie
+    întoarce sarcina existentă în loc să creeze una nouă.
+    """
+    fields = {
+        'name': name,
+        'payload': payload or {},
+        'max_attempts': max_attempts,
+        'run_after': timezone.now() + (delay or timedelta()),
+    }
+    if idempotency_key is None:
+        return Job.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Job.objects.create(idempotency_key=idempotency_key, **fields)
+    except IntegrityError:
+        return Job.objects.get(idempotency_key=idempotency_key)
+
+
+def dequeue(batch_size=20):
+    """Rezervă până la `batch_size` sarcini scadente și le marchează „running”."""
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', run_after__lte=now)
+            .order_by('run_after', 'id')[:batch_size]
+        )
+        if jobs:
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(status='running', locked_at=now)
+            for job in jobs:
+                job.status, job.locked_at = 'running', now
+    return jobs
+
+
+def release_stale_jobs():
+    """Sarcinile rămase „running” de la un worker oprit redevin „pending”."""
+    return Job.objects.filter(status='running', locked_at__lt=timezone.now() - STALE_AFTER).update(
+        status='pending', locked_at=None
+    )
+
+
+def job_retention_days():
+    return getattr(settings, 'JOB_RETENTION_DAYS', 7)
+
+
+def prune_finished_jobs(older_than=None):
+    """Șterge sarcinile terminate (done / failed) de mai mult de `older_than`; întoarce câte."""
+    if older_than is None:
+        older_than = timedelta(days=job_retention_days())
+    deleted, _ = Job.objects.filter(
+        status__in=['done', 'failed'], finished_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
+
+
+def run_job(job):
+    """Rulează o sarcină rezervată; întoarce True dacă a reușit."""
+    job.attempts += 1
+    handler = get_handler(job.name)
+    try:
+        if handler is None:
+            raise LookupError(f'Nu există handler pentru sarcina "{job.name}".')
+        with transaction.atomic():
+            handler(job.payload)
+            job.status, job.finished_at, job.last_error = 'done', timezone.now(), ''
+            job.save(update_fields=['status', 'attempts', 'finished_at', 'last_error'])
+        return True
+    except Exception as exc:
+        logger.warning('Sarcina %s a eșuat (încercarea %s/%s): %s', job, job.attempts, job.max_attempts, exc)
+        job.last_error = f'{type(exc).__name__}: {exc}'
+        if job.attempts >= job.max_attempts:
+            job.status, job.finished_at = 'failed', timezone.now()
+        else:
+            job.status = 'pending'
+            job.run_after = timezone.now() + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+        job.locked_at = None
+        job.save(update_fields=['status', 'attempts', 'run_after', 'finished_at', 'last_error', 'locked_at'])
+        return False
@@ -0,0 +1,49 @@
+# core/management/commands/archive_mealplans.py
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.archive import DEFAULT_CHUNK_SIZE, archive_meal_plans
+
+
+class Command(BaseCommand):
+    help = 'Mută planurile vechi din MealPlan în arhiva comprimată (MealPlanArchive), pe bucăți'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Planurile mai vechi de atâtea zile '
+                                                     '(implicit MEALPLAN_ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--before', help='Planurile create înainte de această dată (YYYY-MM-DD)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Planuri per tranzacție')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Pauza (secunde) între bucăți')
+        parser.add_argument('--dry-run', action='store_true', help='Doar numără, fără să mute nimic')
+
+    def handle(self, *args, **options):
+        if options['before']:
+            try:
+                cutoff = timezone.make_aware(datetime.strptime(options['before'], '%Y-%m-%d'))
+            except ValueError:
+                raise CommandError('--before trebuie să fie o dată YYYY-MM-DD')
+        else:
+            days = options['days'] if options['days'] is not None else getattr(
+                settings, 'MEALPLAN_ARCHIVE_AFTER_DAYS', 365)
+            cutoff = timezone.now() - timedelta(days=days)
+
+        def progress(report):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{report}…')
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        start = time.perf_counter()
+        report = archive_meal_plans(
+            cutoff, chunk_size=options['chunk_size'], dry_run=options['dry_run'], on_chunk=progress
+        )
+        elapsed = time.perf_counter() - start
+
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}{report} (create înainte de {cutoff:%Y-%m-%d}) în {elapsed:.2f}s'
+        ))
@@ -0,0 +1,244 @@
+# core/management/commands/bench_plangen.py
+import json
+import random
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from core.catalog import bump_catalog_version, clear_catalogs, DEFAULT_CATALOG
+from core.models import Allergen, Dish, MacroRatio, Restaurant, MEAL_TYPES
+from core.services import generate_meal_plan
+
+
+# Amestecul de constrângeri folosit implicit (câte un profil din fiecare, pe rând)
+CONSTRAINT_MIXES = {
+    'none': {},
+    'vegetarian': {'is_vegetarian': True},
+    'vegan': {'is_vegan': True},
+    'gluten_free': {'is_gluten_free': True},
+    'lactose_free': {'is_lactose_free': True},
+    'allergens': {'allergens': 'random'},
+    'vegan_gluten_free': {'is_vegan': True, 'is_gluten_free': True},
+}
+
+# Benchmark-ul rulează izolat de instalarea reală: cache local propriu (versiunile de catalog
+# incrementate aici nu ajung în cache-ul partajat), fără replică, fără rezerva de planuri
+# și fără cache de rezultate
+BENCH_SETTINGS = {
+    'CACHES': {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench_plangen'},
+    },
+    'DATABASE_ROUTERS': [],
+    'PLAN_POOL_SIZE': 0,
+    'PLAN_RESULT_CACHE_TIMEOUT': 0,
+}
+
+
+class QueryTimer:
+    """`execute_wrapper` care numără interogările și timpul petrecut în SQL."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark pentru generate_meal_plan pe un restaurant sintetic, într-o bază de date temporară'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dishes', type=int, default=500, help='Numărul de feluri ale restaurantului sintetic')
+        parser.add_argument('--allergens', type=int, default=14, help='Numărul de alergeni')
+        parser.add_argument('--plans', type=int, default=200, help='Câte planuri se generează')
+        parser.add_argument('--mix', default=','.join(CONSTRAINT_MIXES),
+                            help=f'Constrângerile folosite, separate prin virgulă ({", ".join(CONSTRAINT_MIXES)})')
+        parser.add_argument('--save', action='store_true', help='Salvează și MealPlan-ul (user autentificat)')
+        parser.add_argument('--cold', action='store_true', help='Golește catalogul în memorie înainte de fiecare plan')
+        parser.add_argument('--memory-plans', type=int, default=20,
+                            help='Câte planuri se rulează (separat) sub tracemalloc pentru memoria de vârf')
+        parser.add_argument('--seed', type=int, default=42, help='Seed pentru datele sintetice')
+        parser.add_argument('--output', help='Fișierul JSON cu rezultate (implicit: stdout)')
+
+    def handle(self, *args, **options):
+        mixes = [name.strip() for name in options['mix'].split(',') if name.strip()]
+        unknown = set(mixes) - CONSTRAINT_MIXES.keys()
+        if unknown:
+            self.stderr.write(self.style.ERROR(f'Amestecuri necunoscute: {", ".join(sorted(unknown))}'))
+            return
+
+        with override_settings(**BENCH_SETTINGS):
+            old_name = connection.settings_dict['NAME']
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                report = self.run_benchmark(mixes, options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                clear_catalogs()
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                fh.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Rezultate scrise în {options["output"]}'))
+        else:
+            self.stdout.write(output)
+
+    # ==================== DATE SINTETICE ====================
+    def build_fixture(self, options):
+        rng = random.Random(options['seed'])
+        owner = User.objects.create_user('bench-owner', password=None)
+        restaurant = Restaurant.objects.create(name='Bench Restaurant', owner=owner)
+
+        allergens = Allergen.objects.bulk_create(
+            [Allergen(name=f'Alergen {i}') for i in range(1, options['allergens'] + 1)]
+        )
+        macro_ratios = MacroRatio.objects.bulk_create([
+            MacroRatio(name='Bench Echilibrat', proteins=30, carbs=45, fats=25),
+            MacroRatio(name='Bench High-Protein', proteins=40, carbs=30, fats=30),
+            MacroRatio(name='Bench Keto', proteins=20, carbs=5, fats=75),
+        ])
+
+        meal_types = [value for value, _ in MEAL_TYPES]
+        dishes = []
+        for i in range(options['dishes']):
+            is_vegan = rng.random() < 0.25
+            dishes.append(Dish(
+                name=f'Fel sintetic {i}',
+                meal_type=meal_types[i % len(meal_types)],
+                calories=rng.randint(40, 600),
+                proteins=Decimal(rng.randint(0, 400)) / 10,
+                carbs=Decimal(rng.randint(0, 800)) / 10,
+                fats=Decimal(rng.randint(0, 400)) / 10,
+                fiber=Decimal(rng.randint(0, 100)) / 10,
+                is_vegan=is_vegan,
+                is_vegetarian=is_vegan or rng.random() < 0.3,
+                is_raw_vegan=is_vegan and rng.random() < 0.2,
+                is_gluten_free=rng.random() < 0.5,
+                is_lactose_free=is_vegan or rng.random() < 0.5,
+                restaurant=restaurant,
+            ))
+        dishes = Dish.objects.bulk_create(dishes)
+        if not all(dish.pk for dish in dishes):
+            dishes = list(Dish.objects.filter(restaurant=restaurant).order_by('id'))
+
+        through = Dish.allergens.through
+        links = []
+        for dish in dishes:
+            for allergen in rng.sample(allergens, rng.randint(0, min(3, len(allergens)))):
+                links.append(through(dish_id=dish.pk, allergen_id=allergen.pk))
+        through.objects.bulk_create(links)
+
+        # bulk_create nu trimite semnale → invalidăm manual catalogul
+        bump_catalog_version(restaurant)
+        bump_catalog_version(DEFAULT_CATALOG)
+        clear_catalogs()
+        return rng, owner, restaurant, allergens, macro_ratios
+
+    def build_profiles(self, rng, allergens, macro_ratios, mixes, count):
+        profiles = []
+        for i in range(count):
+            constraints = dict(CONSTRAINT_MIXES[mixes[i % len(mixes)]])
+            if constraints.get('allergens') == 'random':
+                constraints['allergens'] = rng.sample(allergens, min(2, len(allergens)))
+            profiles.append({
+                'gender': rng.choice(['M', 'F']),
+                'age': rng.randint(18, 70),
+                'weight': rng.randint(50, 120),
+                'height': rng.randint(150, 200),
+                'activity_level': rng.choice(['sedentary', 'light', 'moderate', 'active', 'very_active']),
+                'macro_ratio': rng.choice(macro_ratios),
+                **constraints,
+            })
+        return profiles
+
+    # ==================== RULARE ====================
+    def run_benchmark(self, mixes, options):
+        rng, owner, restaurant, allergens, macro_ratios = self.build_fixture(options)
+        profiles = self.build_profiles(rng, allergens, macro_ratios, mixes, options['plans'])
+        user = owner if options['save'] else None
+
+        latencies, queries, sql_times = [], [], []
+        for profile in profiles:
+            if options['cold']:
+                clear_catalogs()
+            timer = QueryTimer()
+            with connection.execute_wrapper(timer):
+                start = time.perf_counter()
+                generate_meal_plan(profile, user=user, restaurant=restaurant)
+                elapsed = time.perf_counter() - start
+            latencies.append(elapsed * 1000)
+            queries.append(timer.count)
+            sql_times.append(timer.seconds * 1000)
+
+        # Memoria de vârf: rulare separată (tracemalloc încetinește mult generarea)
+        clear_catalogs()
+        tracemalloc.start()
+        for profile in profiles[:options['memory_plans']]:
+            generate_meal_plan(profile, user=user, restaurant=restaurant)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        total_ms = sum(latencies)
+        total_sql_ms = sum(sql_times)
+        return {
+            'created_at': datetime.now().isoformat(),
+            'git_commit': self.git_commit(),
+            'database': connection.vendor,
+            'config': {
+                'dishes': options['dishes'],
+                'allergens': options['allergens'],
+                'plans': options['plans'],
+                'mix': mixes,
+                'save': options['save'],
+                'cold': options['cold'],
+                'seed': options['seed'],
+            },
+            'latency_ms': {
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'p99': percentile(latencies, 99),
+                'mean': total_ms / len(latencies) if latencies else None,
+                'max': max(latencies, default=None),
+            },
+            'queries_per_plan': {
+                'mean': sum(queries) / len(queries) if queries else None,
+                'max': max(queries, default=None),
+                'first_plan': queries[0] if queries else None,
+            },
+            'sql_ms_per_plan': total_sql_ms / len(latencies) if latencies else None,
+            'python_ms_per_plan': (total_ms - total_sql_ms) / len(latencies) if latencies else None,
+            'sql_share': total_sql_ms / total_ms if total_ms else None,
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
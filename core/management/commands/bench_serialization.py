@@ -0,0 +1,92 @@
+# core/management/commands/bench_serialization.py
+import json
+import random
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from core.api.renderers import CompactPlanJSONRenderer, FastJSONRenderer, orjson
+from core.api.serializers import MealPlanResultSerializer, trusted_plan_result
+from core.management.commands.bench_plangen import percentile
+from core.services import MEAL_ORDER_DISPLAY, dish_entry, past_meal_entry, plan_result
+
+
+class Command(BaseCommand):
+    help = 'Benchmark pentru serializarea răspunsului GenerateMealPlanAPI (serializer + JSON DRF vs. căile rapide)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weeks', default='1,4', help='Lungimile de plan măsurate, separate prin virgulă')
+        parser.add_argument('--iterations', type=int, default=300, help='Câte serializări per variantă')
+        parser.add_argument('--seed', type=int, default=42, help='Seed pentru planurile sintetice')
+        parser.add_argument('--output', help='Fișierul JSON cu rezultate (implicit: stdout)')
+
+    def handle(self, *args, **options):
+        variants = {
+            'serializer+drf_json': lambda plan: JSONRenderer().render(MealPlanResultSerializer(plan).data),
+            'trusted+drf_json': lambda plan: JSONRenderer().render(trusted_plan_result(plan)),
+            'trusted+fast_json': lambda plan: FastJSONRenderer().render(trusted_plan_result(plan)),
+            'trusted+compact': lambda plan: CompactPlanJSONRenderer().render(trusted_plan_result(plan)),
+        }
+        rng = random.Random(options['seed'])
+        report = {
+            'created_at': datetime.now().isoformat(),
+            'orjson': getattr(orjson, '__version__', None),
+            'iterations': options['iterations'],
+            'plans': {},
+        }
+        for weeks in [int(value) for value in options['weeks'].split(',') if value.strip()]:
+            plan = self.build_plan(rng, weeks)
+            baseline = variants['serializer+drf_json'](plan)
+            if json.loads(variants['trusted+fast_json'](plan)) != json.loads(baseline):
+                self.stderr.write(self.style.ERROR(f'{weeks} săpt.: JSON-ul rapid diferă de cel al serializer-ului'))
+
+            results = {}
+            for name, render in variants.items():
+                timings = []
+                for _ in range(options['iterations']):
+                    start = time.perf_counter()
+                    body = render(plan)
+                    timings.append((time.perf_counter() - start) * 1_000_000)
+                results[name] = {
+                    'us_p50': round(percentile(timings, 50), 1),
+                    'us_p95': round(percentile(timings, 95), 1),
+                    'us_mean': round(sum(timings) / len(timings), 1),
+                    'bytes': len(body),
+                }
+            base_mean = results['serializer+drf_json']['us_mean']
+            for result in results.values():
+                result['speedup'] = round(base_mean / result['us_mean'], 2) if result['us_mean'] else None
+            report['plans'][f'{weeks}w'] = results
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                fh.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Rezultate scrise în {options["output"]}'))
+        else:
+            self.stdout.write(output)
+
+    def build_plan(self, rng, weeks):
+        """Un rezultat `plan_result` sintetic (fără bază de date), de forma celor generate."""
+        dishes = [
+            SimpleNamespace(
+                id=i, name=f'Fel sintetic {i} cu legume și brânză', calories=rng.randint(40, 600),
+                proteins=rng.randint(0, 400) / 10, carbs=rng.randint(0, 800) / 10, fats=rng.randint(0, 400) / 10,
+            )
+            for i in range(1, 301)
+        ]
+        meals = {}
+        for day_idx in range(7 * weeks):
+            meals[f'Ziua {day_idx + 1}'] = {
+                meal: [past_meal_entry(meal)] if day_idx == 0 and meal_idx < 2 else [
+                    dish_entry(dish, rng.randint(80, 350)) for dish in rng.sample(dishes, rng.choice([1, 2, 2, 3]))
+                ]
+                for meal_idx, meal in enumerate(MEAL_ORDER_DISPLAY)
+            }
+        targets = {
+            'daily_calories': 2200, 'bmi': 24.7, 'proteins': 165, 'carbs': 247, 'fats': 61, 'fiber': 25,
+        }
+        return plan_result(targets, meals)
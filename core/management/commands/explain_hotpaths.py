@@ -0,0 +1,78 @@
+# core/management/commands/explain_hotpaths.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.catalog import CATALOG_DISH_FIELDS
+from core.models import Dish, MealPlan, Restaurant, MEAL_TYPES
+from core.services import get_available_dishes
+
+
+class Command(BaseCommand):
+    help = 'Afișează EXPLAIN pentru interogările fierbinți (catalog, filtre dish, dashboard) pe baza de date curentă'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--restaurant', help='Slug-ul restaurantului (implicit: primul activ)')
+        parser.add_argument('--user', type=int, help='ID-ul userului pentru interogarea de dashboard')
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Rulează efectiv interogările (EXPLAIN ANALYZE, doar PostgreSQL)'
+        )
+
+    def handle(self, *args, **options):
+        restaurant = self.get_restaurant(options['restaurant'])
+        user = User.objects.filter(pk=options['user']).first() if options['user'] else (
+            User.objects.filter(meal_plans__isnull=False).first() or User.objects.first()
+        )
+
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('--analyze este suportat doar pe PostgreSQL.')
+            explain_options = {'analyze': True, 'buffers': True}
+
+        sample_constraints = {'vegetarian': True, 'gluten_free': True, 'allergens': [1]}
+        queries = [
+            ('Catalog: felurile active ale restaurantului',
+             Dish.objects.filter(restaurant=restaurant, is_active=True).only(*CATALOG_DISH_FIELDS).order_by('id')),
+            ('Catalog: alergenii felurilor (prefetch)',
+             Dish.allergens.through.objects.filter(dish__restaurant=restaurant, dish__is_active=True)),
+            ('Catalog: felurile implicite excluse de restaurant',
+             Restaurant.excluded_default_dishes.through.objects.filter(restaurant_id=restaurant.pk)),
+            # Catalogul implicit (is_default) e încărcat de fiecare proces, pentru toate restaurantele
+            ('Catalog implicit: felurile implicite active',
+             Dish.objects.filter(is_default=True, is_active=True).only(*CATALOG_DISH_FIELDS).order_by('id')),
+            ('Catalog implicit: alergenii felurilor',
+             Dish.allergens.through.objects.filter(dish__is_default=True, dish__is_active=True)),
+            ('Rezolvare restaurant după slug',
+             Restaurant.objects.filter(slug=restaurant.slug, is_active=True)),
+        ]
+        for meal_type, label in MEAL_TYPES:
+            queries.append((
+                f'get_available_dishes – {label} (fără constrângeri)',
+                get_available_dishes(meal_type, restaurant),
+            ))
+        queries.append((
+            f'get_available_dishes – {MEAL_TYPES[2][1]} ({sample_constraints})',
+            get_available_dishes(MEAL_TYPES[2][0], restaurant, sample_constraints),
+        ))
+        if user is not None:
+            queries.append((
+                f'Dashboard: planurile userului {user.username}',
+                MealPlan.objects.filter(user=user).select_related('macro_ratio')
+                .defer('user_snapshot', 'dietary_constraints').order_by('-created_at', '-id')[:13],
+            ))
+
+        self.stdout.write(f'Baza de date: {connection.vendor} ({connection.settings_dict["NAME"]})')
+        for title, queryset in queries:
+            self.stdout.write('')
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {title}'))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(self.style.SUCCESS(queryset.explain(**explain_options)))
+
+    def get_restaurant(self, slug):
+        queryset = Restaurant.objects.filter(is_active=True)
+        restaurant = queryset.filter(slug=slug).first() if slug else queryset.order_by('id').first()
+        if restaurant is None:
+            raise CommandError('Nu există niciun restaurant activ' + (f' cu slug-ul "{slug}".' if slug else '.'))
+        return restaurant
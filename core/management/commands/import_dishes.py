@@ -0,0 +1,58 @@
+# core/management/commands/import_dishes.py
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importers import DEFAULT_CHUNK_SIZE, detect_format, import_dishes
+from core.models import Restaurant
+
+
+class Command(BaseCommand):
+    help = 'Importă (upsert după nume) felurile unui restaurant dintr-un fișier CSV sau JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Fișierul CSV / JSONL ("-" pentru stdin)')
+        parser.add_argument('--restaurant', required=True, help='Slug-ul restaurantului')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Implicit: după extensia fișierului')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Câte rânduri se scriu într-o tranzacție')
+        parser.add_argument('--keep-allergens', action='store_true',
+                            help='Adaugă alergenii la cei existenți în loc să-i înlocuiască')
+        parser.add_argument('--dry-run', action='store_true', help='Doar validează, nu scrie nimic')
+
+    def handle(self, *args, **options):
+        restaurant = Restaurant.objects.filter(slug=options['restaurant']).first()
+        if restaurant is None:
+            raise CommandError(f'Restaurantul "{options["restaurant"]}" nu există.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size trebuie să fie pozitiv.')
+
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        start = time.perf_counter()
+        if path == '-':
+            report = self.run_import(sys.stdin, restaurant, fmt, options)
+        else:
+            try:
+                fh = open(path, encoding='utf-8-sig', newline='')
+            except OSError as exc:
+                raise CommandError(f'Nu pot deschide {path}: {exc}')
+            with fh:
+                report = self.run_import(fh, restaurant, fmt, options)
+        elapsed = time.perf_counter() - start
+
+        for line, message in report.errors:
+            self.stderr.write(self.style.WARNING(f'Linia {line}: {message}'))
+        if report.failed > len(report.errors):
+            self.stderr.write(self.style.WARNING(f'... și încă {report.failed - len(report.errors)} erori'))
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(f'{prefix}{restaurant.name}: {report} în {elapsed:.2f}s'))
+
+    def run_import(self, fh, restaurant, fmt, options):
+        return import_dishes(
+            fh, restaurant, fmt=fmt,
+            chunk_size=options['chunk_size'],
+            replace_allergens=not options['keep_allergens'],
+            dry_run=options['dry_run'],
+        )
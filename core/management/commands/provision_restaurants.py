@@ -0,0 +1,40 @@
+# core/management/commands/provision_restaurants.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importers import detect_format, iter_rows
+from core.provisioning import provision_restaurants
+
+
+class Command(BaseCommand):
+    help = 'Creează în masă restaurante (și proprietarii lor) dintr-un fișier CSV / JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Fișierul CSV / JSONL (coloane: name, owner, owner_email, description, '
+                                         'is_active, template)')
+        parser.add_argument('--template', help='Slug-ul restaurantului ale cărui feluri se copiază (implicit)')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Implicit: după extensia fișierului')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Dimensiunea loturilor bulk_create')
+        parser.add_argument('--dry-run', action='store_true', help='Rulează tot, apoi anulează tranzacția')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        start = time.perf_counter()
+        try:
+            fh = open(path, encoding='utf-8-sig', newline='')
+        except OSError as exc:
+            raise CommandError(f'Nu pot deschide {path}: {exc}')
+        with fh:
+            report = provision_restaurants(
+                iter_rows(fh, options['format'] or detect_format(path)),
+                template=options['template'],
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'],
+            )
+        elapsed = time.perf_counter() - start
+
+        for line, message in report.errors:
+            self.stderr.write(self.style.WARNING(f'Linia {line}: {message}'))
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(f'{prefix}{report} în {elapsed:.2f}s'))
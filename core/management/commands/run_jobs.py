@@ -0,0 +1,53 @@
+# core/management/commands/run_jobs.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+import core.services  # noqa: F401 – înregistrează handler-ele (@register_job)
+from core.jobs import dequeue, prune_finished_jobs, release_stale_jobs, run_job
+
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+class Command(BaseCommand):
+    help = 'Worker pentru coada de sarcini din baza de date (core.jobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=20, help='Câte sarcini se rezervă odată')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Pauza (secunde) când coada e goală')
+        parser.add_argument('--burst', action='store_true', help='Se oprește când coada e goală')
+        parser.add_argument('--no-prune', action='store_true',
+                            help='Nu șterge sarcinile terminate mai vechi de JOB_RETENTION_DAYS')
+
+    def handle(self, *args, **options):
+        done = failed = 0
+        released = release_stale_jobs()
+        if released:
+            self.stdout.write(self.style.WARNING(f'{released} sarcini rămase „running” au fost repuse în coadă'))
+
+        last_prune = None
+        try:
+            while True:
+                close_old_connections()
+                if not options['no_prune'] and (last_prune is None
+                                                or time.monotonic() - last_prune > PRUNE_INTERVAL_SECONDS):
+                    pruned = prune_finished_jobs()
+                    last_prune = time.monotonic()
+                    if pruned:
+                        self.stdout.write(f'{pruned} sarcini terminate au fost șterse')
+                jobs = dequeue(options['batch_size'])
+                if not jobs:
+                    if options['burst']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+                for job in jobs:
+                    if run_job(job):
+                        done += 1
+                    else:
+                        failed += 1
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f'Sarcini terminate: {done}, eșuate: {failed}'))
@@ -0,0 +1,90 @@
+# core/middleware.py
+import json
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from core.timing import current_metrics, start_request_metrics, stop_request_metrics
+
+logger = logging.getLogger('core.timing')
+
+
+# ==================== SERVER-TIMING ====================
+class ServerTimingMiddleware:
+    """
+    Pentru o fracțiune din cereri (`SERVER_TIMING_SAMPLE_RATE`, 0 = dezactivat)
+    măsoară numărul de interogări, timpul în SQL și fazele marcate cu
+    `core.timing.phase()`, le trimite în header-ul `Server-Timing` și scrie
+    o linie JSON în logger-ul `core.timing` (cu cele mai lente interogări).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        metrics, token = start_request_metrics(self.slow_query_limit())
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_request_metrics(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        metrics, token = start_request_metrics(self.slow_query_limit())
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_request_metrics(token)
+        return self.finish(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        # TemplateResponse se randează după view → măsurăm randarea printr-un callback
+        metrics = current_metrics()
+        if metrics is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: metrics.add_phase('render', time.perf_counter() - start)
+            )
+        return response
+
+    # ==================== HELPERS ====================
+    def sampled(self):
+        rate = getattr(settings, 'SERVER_TIMING_SAMPLE_RATE', 0)
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    def slow_query_limit(self):
+        return getattr(settings, 'SERVER_TIMING_SLOW_QUERIES', 3)
+
+    def finish(self, request, response, metrics):
+        total_ms = metrics.elapsed() * 1000
+        sql_ms = metrics.sql_seconds * 1000
+        entries = [f'sql;dur={sql_ms:.2f};desc="{metrics.query_count} queries"']
+        entries += [f'{name};dur={seconds * 1000:.2f}' for name, seconds in metrics.phases.items()]
+        entries.append(f'total;dur={total_ms:.2f}')
+        response['Server-Timing'] = ', '.join(entries)
+
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 3),
+            'queries': metrics.query_count,
+            'sql_ms': round(sql_ms, 3),
+            'phases_ms': {name: round(seconds * 1000, 3) for name, seconds in metrics.phases.items()},
+            'slow_queries': metrics.slow_queries,
+        }, ensure_ascii=False))
+        return response
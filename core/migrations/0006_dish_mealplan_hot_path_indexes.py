@@ -0,0 +1,23 @@
+# Generated by Django 5.1.14 on 2026-10-18 12:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_alter_userprofile_unique_together_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dish',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['restaurant', 'meal_type'], name='dish_rest_meal_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mealplan',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='mealplan_user_created_idx'),
+        ),
+    ]
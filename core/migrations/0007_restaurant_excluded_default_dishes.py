@@ -0,0 +1,22 @@
+# Generated by Django 5.1.14 on 2026-10-18 12:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_dish_mealplan_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='excluded_default_dishes',
+            field=models.ManyToManyField(blank=True, limit_choices_to={'is_default': True}, related_name='excluded_by_restaurants', to='core.dish'),
+        ),
+        migrations.AddIndex(
+            model_name='dish',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_default', True)), fields=['meal_type'], name='dish_default_active_idx'),
+        ),
+    ]
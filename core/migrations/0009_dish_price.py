@@ -0,0 +1,18 @@
+# Generated by Django 5.1.14 on 2026-10-18 12:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dish',
+            name='price',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='lei per 100g (prețul porției se calculează din gramaj)', max_digits=8),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.14 on 2026-10-18 13:03
+
+import core.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_dish_price'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MealPlanArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('daily_calories', models.PositiveIntegerField()),
+                ('snapshot_restaurant_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('data', core.fields.CompressedJSONField()),
+                ('macro_ratio', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_meal_plans', to='core.macroratio')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_meal_plans', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at', '-id'], name='mealplanarchive_user_idx')],
+            },
+        ),
+    ]
@@ -4,7 +4,11 @@ from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils.text import slugify
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+
+from core.fields import CompressedJSONField
 
 class Allergen(models.Model):
     name = models.CharField(max_length=100, unique=True)  # ex: "Nuci", "Ouă", "Lapte"
@@ -47,22 +51,46 @@ class Restaurant(models.Model):
         related_name='restaurants_joined',
         blank=True
     )
+    # Felurile implicite (is_default) pe care restaurantul NU le vrea în catalogul lui
+    excluded_default_dishes = models.ManyToManyField(
+        'Dish',
+        related_name='excluded_by_restaurants',
+        limit_choices_to={'is_default': True},
+        blank=True
+    )
 
     def __str__(self):
         return self.name
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            i = 1
-            while Restaurant.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{i}"
-                i += 1
-            self.slug = slug
+            self.slug = allocate_restaurant_slugs([self.name])[0]
         super().save(*args, **kwargs)
 
 
+def allocate_restaurant_slugs(names):
+    """
+    Slug-uri unice pentru `names` (în ordine), după aceeași regulă ca înainte:
+    `nume`, `nume-1`, `nume-2`... Slug-urile ocupate vin dintr-o singură
+    interogare pe prefixe, nu câte una per coliziune.
+    """
+    bases = [slugify(name)[:110] or 'restaurant' for name in names]
+    prefixes = models.Q()
+    for base in set(bases):
+        prefixes |= models.Q(slug__startswith=base)
+    taken = set(Restaurant.objects.filter(prefixes).values_list('slug', flat=True)) if bases else set()
+
+    slugs = []
+    for base in bases:
+        slug, i = base, 1
+        while slug in taken:
+            slug = f"{base}-{i}"
+            i += 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
 # ==================== USER PROFILE ====================
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
@@ -121,6 +149,12 @@ class Dish(models.Model):
     is_lactose_free = models.BooleanField(default=False)
     allergens = models.ManyToManyField(Allergen, blank=True, related_name='dishes')
     image = models.ImageField(upload_to='dishes/', null=True, blank=True)
+    price = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        default=0,
+        help_text="lei per 100g (prețul porției se calculează din gramaj)"
+    )
 
 
     # MULTI-RESTAURANT
@@ -137,6 +171,20 @@ class Dish(models.Model):
     class Meta:
         unique_together = ('name', 'restaurant')
         ordering = ['name']
+        indexes = [
+            # Catalogul / get_available_dishes: restaurant + tip masă, doar felurile active
+            models.Index(
+                fields=['restaurant', 'meal_type'],
+                condition=models.Q(is_active=True),
+                name='dish_rest_meal_active_idx',
+            ),
+            # Catalogul implicit, partajat de toate restaurantele
+            models.Index(
+                fields=['meal_type'],
+                condition=models.Q(is_default=True, is_active=True),
+                name='dish_default_active_idx',
+            ),
+        ]
 
 
 # ==================== MEAL PLAN ====================
@@ -164,11 +212,92 @@ class MealPlan(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Dashboard: planurile unui user, cele mai noi primele
+            # (id = departajare pentru paginarea keyset)
+            models.Index(fields=['user', '-created_at', '-id'], name='mealplan_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"Plan {self.user.username} – {self.daily_calories} kcal"
 
 
+class MealPlanArchive(models.Model):
+    """
+    Planuri vechi mutate din `MealPlan` de comanda `archive_mealplans`. Păstrează
+    ID-ul original (linkurile spre plan rămân valide); restul câmpurilor, inclusiv
+    snapshot-ul și constrângerile, stau comprimate în `data`. `macro_ratio` e păstrat
+    și ca FK (PROTECT, ca în `MealPlan`): un raport folosit de un plan arhivat nu
+    poate fi șters.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_meal_plans')
+    macro_ratio = models.ForeignKey(
+        MacroRatio, on_delete=models.PROTECT, related_name='archived_meal_plans', null=True, blank=True
+    )
+    daily_calories = models.PositiveIntegerField()
+    snapshot_restaurant_id = models.BigIntegerField(null=True, blank=True)  # pentru ETag, fără decompresie
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = CompressedJSONField()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='mealplanarchive_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"Plan arhivat #{self.pk} – {self.daily_calories} kcal"
+
+    def to_meal_plan(self):
+        """`MealPlan` nesalvat, cu toate câmpurile planului original (pentru afișare)."""
+        plan = MealPlan(id=self.id, user_id=self.user_id, created_at=self.created_at, **self.data)
+        # Raportul deja încărcat (select_related) nu se mai cere o dată per plan
+        macro_ratio_field = self._meta.get_field('macro_ratio')
+        if macro_ratio_field.is_cached(self) and self.macro_ratio_id == plan.macro_ratio_id:
+            plan.macro_ratio = self.macro_ratio
+        return plan
+
+
+# ==================== JOBS (COADĂ ÎN BAZA DE DATE) ====================
+JOB_STATUSES = [
+    ('pending', 'În așteptare'),
+    ('running', 'În lucru'),
+    ('done', 'Terminat'),
+    ('failed', 'Eșuat'),
+]
+
+
+class Job(models.Model):
+    """Sarcină de fundal (vezi core.jobs); rulată de comanda `run_jobs`."""
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=JOB_STATUSES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    idempotency_key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            # Dequeue: doar sarcinile care așteaptă, în ordinea scadenței
+            models.Index(
+                fields=['run_after', 'id'],
+                condition=models.Q(status='pending'),
+                name='job_pending_run_after_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
 # ==================== SIGNAL PENTRU USER PROFILE ====================
 @receiver(post_save, sender=User)
 def add_user_to_restaurant(sender, instance, created, **kwargs):
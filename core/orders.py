@@ -0,0 +1,115 @@
+# core/orders.py
+"""
+Comenzi create dintr-un plan salvat: felurile din snapshot (toată săptămâna sau
+doar zilele alese) devin rânduri `OrderItem`, cu prețul înghețat la momentul comenzii.
+
+Felurile se rezolvă într-o singură interogare, toate rândurile intră cu un singur
+`bulk_create`, iar totalul e calculat în SQL – totul într-o tranzacție.
+"""
+from collections import Counter
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+
+from core.models import Dish, Order, OrderItem
+from core.services import MEAL_ORDER_DISPLAY, is_compact_snapshot
+
+CENT = Decimal('0.01')
+
+
+def portion_price(dish, grams):
+    """Prețul unei porții: `price` e per 100g."""
+    return (dish.price * grams / 100).quantize(CENT)
+
+
+def _compact_slots(snapshot, days):
+    """(id fel, grame) pentru mesele zilelor alese dintr-un snapshot compact."""
+    for day_idx, day_slots in enumerate(snapshot["slots"]):
+        if days is not None and day_idx not in days:
+            continue
+        for meal_idx, entries in enumerate(day_slots):
+            if day_idx == 0 and meal_idx < snapshot["start_index"]:
+                continue  # mese deja trecute
+            for dish_id, grams in entries:
+                if dish_id is not None and grams:
+                    yield dish_id, grams
+
+
+def _legacy_slots(snapshot, days):
+    """(nume fel, grame) din snapshot-urile vechi, cu tot planul salvat ca JSON."""
+    for day_idx, day_meals in enumerate((snapshot.get("meals") or {}).values()):
+        if days is not None and day_idx not in days:
+            continue
+        for display_name in MEAL_ORDER_DISPLAY:
+            for entry in day_meals.get(display_name, []):
+                if not entry.get("is_past") and entry.get("grams"):
+                    yield entry.get("id") or entry["name"], entry["grams"]
+
+
+def _resolve_dishes(keys, restaurant):
+    """Felurile comandabile la `restaurant` (proprii sau implicite, active), după ID sau nume."""
+    ids = {key for key in keys if isinstance(key, int)}
+    names = {key for key in keys if isinstance(key, str)}
+    lookup = Q(pk__in=ids) | Q(name__in=names) if names else Q(pk__in=ids)
+    dishes = Dish.objects.filter(
+        lookup, Q(restaurant=restaurant) | Q(is_default=True), is_active=True
+    ).exclude(excluded_by_restaurants=restaurant)
+
+    resolved = {}
+    for dish in dishes:
+        resolved[dish.pk] = dish
+        # La nume identice, felul propriu al restaurantului are prioritate față de cel implicit
+        if dish.name in names and (dish.name not in resolved or dish.restaurant_id == restaurant.pk):
+            resolved[dish.name] = dish
+    return resolved
+
+
+def create_order_from_plan(plan, restaurant, days=None):
+    """
+    Creează comanda (status „pending”) pentru planul `plan` la `restaurant`.
+    `days` – indicii zilelor (0 = prima zi a planului); implicit tot planul.
+    Întoarce `(order, items, skipped)`: rândurile create și câte porții nu mai
+    pot fi comandate (feluri dezactivate sau care nu sunt ale restaurantului).
+    """
+    snapshot = plan.user_snapshot or {}
+    if is_compact_snapshot(snapshot):
+        if snapshot["restaurant_id"] != restaurant.pk:
+            raise ValueError("Planul a fost generat pentru alt restaurant.")
+        slots = list(_compact_slots(snapshot, days))
+    else:
+        slots = list(_legacy_slots(snapshot, days))
+    if not slots:
+        raise ValueError("Planul nu conține niciun fel de comandat pentru zilele alese.")
+
+    dishes = _resolve_dishes({key for key, _ in slots}, restaurant)
+
+    # Porțiile identice (același fel, același preț) devin un singur rând cu `quantity`
+    quantities = Counter()
+    by_line = {}
+    skipped = 0
+    for key, grams in slots:
+        dish = dishes.get(key)
+        if dish is None:
+            skipped += 1
+            continue
+        line = (dish.pk, portion_price(dish, grams))
+        quantities[line] += 1
+        by_line[line] = dish
+    if not quantities:
+        raise ValueError("Niciun fel din plan nu mai poate fi comandat la acest restaurant.")
+
+    with transaction.atomic():
+        order = Order.objects.create(
+            user_id=plan.user_id, restaurant=restaurant, meal_plan=plan,
+            total_price=0, status='pending',
+        )
+        items = OrderItem.objects.bulk_create([
+            OrderItem(order=order, dish=by_line[(dish_id, price)], quantity=quantity, price=price)
+            for (dish_id, price), quantity in quantities.items()
+        ])
+        order.total_price = OrderItem.objects.filter(order=order).aggregate(
+            total=Sum(F('price') * F('quantity'))
+        )['total']
+        Order.objects.filter(pk=order.pk).update(total_price=order.total_price)
+    return order, items, skipped
@@ -0,0 +1,123 @@
+# core/plan_pool.py
+"""
+Rezervă de planuri săptămânale pre-generate, per restaurant și „bucket”.
+
+Majoritatea utilizatorilor cad în câteva combinații (raport de macro, calorii
+rotunjite la 50, constrângeri), deci planurile se pot genera dinainte: o cerere
+ia un plan gata făcut din rezervă, iar un thread din fundal o reumple.
+Bucket-ul conține și versiunea catalogului, dar nu ora sau data: planurile au zile
+întregi, iar masa de start și etichetele zilelor se aplică la citire
+(`services.apply_start_info`), deci rezerva nu se golește la fiecare schimbare de masă.
+
+Rezerva e locală procesului (ca și catalogul din `core.catalog`), limitată la
+`PLAN_POOL_SIZE` planuri per bucket și `PLAN_POOL_MAX_BUCKETS` bucket-uri (LRU).
+`PLAN_POOL_SIZE = 0` o dezactivează.
+"""
+import json
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pools = OrderedDict()  # bucket → deque de planuri (`meals`)
+_versions = {}  # restaurant_id → versiunea catalogului pentru care există bucket-uri
+_refilling = set()
+_executor = None
+
+
+def pool_size():
+    return getattr(settings, 'PLAN_POOL_SIZE', 0)
+
+
+def _max_buckets():
+    return getattr(settings, 'PLAN_POOL_MAX_BUCKETS', 256)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'PLAN_POOL_WORKERS', 2), thread_name_prefix='plan-pool'
+        )
+    return _executor
+
+
+def plan_bucket(restaurant_id, catalog_version, constraints, daily_calories, macro_ratio):
+    return (
+        restaurant_id,
+        catalog_version,
+        json.dumps(sorted(constraints.items())),
+        daily_calories,
+        (macro_ratio.pk, macro_ratio.proteins, macro_ratio.carbs, macro_ratio.fats),
+    )
+
+
+def _drop_restaurant(restaurant_id):
+    for bucket in [bucket for bucket in _pools if bucket[0] == restaurant_id]:
+        del _pools[bucket]
+
+
+def take_pooled_meals(bucket, generate):
+    """
+    Un plan din rezervă pentru `bucket` (sau None) și reumplerea ei în fundal.
+    `generate()` produce un plan nou (fără acces la DB – catalogul e deja încărcat).
+    """
+    size = pool_size()
+    if size <= 0:
+        return None
+
+    restaurant_id, catalog_version = bucket[0], bucket[1]
+    with _lock:
+        if _versions.get(restaurant_id) != catalog_version:
+            # Catalogul s-a schimbat → planurile vechi ale restaurantului nu mai sunt valide
+            _drop_restaurant(restaurant_id)
+            _versions[restaurant_id] = catalog_version
+        pool = _pools.get(bucket)
+        if pool is None:
+            pool = _pools[bucket] = deque()
+            while len(_pools) > _max_buckets():
+                _pools.popitem(last=False)
+        else:
+            _pools.move_to_end(bucket)
+        meals = pool.popleft() if pool else None
+        needs_refill = len(pool) < size and bucket not in _refilling
+        if needs_refill:
+            _refilling.add(bucket)
+
+    if needs_refill:
+        _get_executor().submit(_refill, bucket, generate, size)
+    return meals
+
+
+def _refill(bucket, generate, size):
+    try:
+        while True:
+            meals = generate()
+            with _lock:
+                pool = _pools.get(bucket)
+                if pool is None:  # bucket invalidat / scos între timp
+                    return
+                pool.append(meals)
+                if len(pool) >= size:
+                    return
+    except Exception:
+        logger.exception('Reumplerea rezervei de planuri a eșuat pentru %s', bucket[:2])
+    finally:
+        with _lock:
+            _refilling.discard(bucket)
+
+
+def clear_plan_pools():
+    with _lock:
+        _pools.clear()
+        _versions.clear()
+
+
+def plan_pool_stats():
+    with _lock:
+        return {'buckets': len(_pools), 'plans': sum(len(pool) for pool in _pools.values())}
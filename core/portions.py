@@ -0,0 +1,70 @@
+# core/portions.py
+"""
+Calculul gramajelor pentru felurile unei mese.
+
+Pentru felurile alese se caută gramajele care minimizează abaterea ponderată
+(relativă) față de țintele mesei: calorii, proteine, carbohidrați, grăsimi.
+Problema este un least-squares mic (4 ținte × 1-3 feluri) cu limite per fel,
+rezolvat cu NumPy printr-un set activ: variabilele care ies din limite sunt
+fixate pe limită și restul se re-rezolvă. Rezultatul se rotunjește la 10g.
+"""
+import numpy as np
+
+
+MIN_PORTION_GRAMS = 50
+MAX_PORTION_GRAMS = 400
+PORTION_STEP_GRAMS = 10
+
+# Ponderi pentru (calorii, proteine, carbohidrați, grăsimi)
+DEFAULT_WEIGHTS = (2.0, 1.0, 0.75, 0.75)
+
+
+def nutrient_matrix(dishes):
+    """Matricea n×4 (kcal, P, C, G per 100g) pentru o listă de feluri."""
+    return np.array(
+        [[dish.calories, dish.proteins, dish.carbs, dish.fats] for dish in dishes],
+        dtype=np.float64,
+    ).reshape(len(dishes), 4)
+
+
+def solve_portions(nutrients, targets, min_grams=MIN_PORTION_GRAMS, max_grams=MAX_PORTION_GRAMS,
+                   weights=DEFAULT_WEIGHTS, step=PORTION_STEP_GRAMS):
+    """
+    Returnează gramajele (array de int-uri, multipli de `step`) pentru fiecare fel.
+
+    `nutrients` este matricea n×4 per 100g, `targets` cele 4 ținte ale mesei.
+    `min_grams` / `max_grams` pot fi scalari sau array-uri (limite per fel).
+    """
+    nutrients = np.asarray(nutrients, dtype=np.float64)
+    n = nutrients.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    targets = np.asarray(targets, dtype=np.float64)
+    lower = np.broadcast_to(np.asarray(min_grams, dtype=np.float64), (n,)) / 100.0
+    upper = np.broadcast_to(np.asarray(max_grams, dtype=np.float64), (n,)) / 100.0
+
+    # Abatere relativă: fiecare rând e împărțit la țintă, ca gramele de grăsime
+    # să nu fie copleșite de sutele de kcal
+    row_scale = np.sqrt(np.asarray(weights, dtype=np.float64)) / np.maximum(targets, 1.0)
+    system = nutrients.T * row_scale[:, None]   # 4×n, în unități de 100g
+    rhs = targets * row_scale
+
+    portions = np.zeros(n)
+    free = np.ones(n, dtype=bool)
+    for _ in range(n + 1):
+        if not free.any():
+            break
+        residual = rhs - system[:, ~free] @ portions[~free]
+        portions[free] = np.linalg.lstsq(system[:, free], residual, rcond=None)[0]
+
+        violated = free & ((portions < lower) | (portions > upper))
+        if not violated.any():
+            break
+        portions = np.clip(portions, lower, upper)
+        free &= ~violated
+
+    grams = np.clip(portions, lower, upper) * 100.0
+    grams = np.round(grams / step) * step
+    grams = np.clip(grams, np.ceil(lower * 100 / step) * step, np.floor(upper * 100 / step) * step)
+    return grams.astype(np.int64)
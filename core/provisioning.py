@@ -0,0 +1,208 @@
+# core/provisioning.py
+"""
+Crearea în masă a restaurantelor (lanțuri / francize), folosită de comanda
+`provision_restaurants`.
+
+Proprietarii lipsă și restaurantele intră cu câte un `bulk_create`, slug-urile
+sunt alocate toate dintr-o singură interogare (`allocate_restaurant_slugs`), iar
+felurile de start se copiază dintr-un restaurant șablon tot în masă (feluri +
+alergeni). Numărul de interogări nu crește cu numărul de restaurante.
+
+Coloane: name, owner (username), owner_email, description, is_active, template
+(slug-ul restaurantului șablon; implicit cel dat comenzii).
+"""
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from core.importers import parse_bool
+from core.models import Dish, Restaurant, allocate_restaurant_slugs
+from core.restaurants import invalidate_restaurant
+
+# Câmpurile copiate din felurile restaurantului șablon
+SEED_DISH_FIELDS = [
+    'name', 'meal_type', 'calories', 'proteins', 'carbs', 'fats', 'fiber', 'price',
+    'is_vegan', 'is_vegetarian', 'is_raw_vegan', 'is_gluten_free', 'is_lactose_free', 'is_active',
+]
+# De câte ori se realocă slug-urile dacă un proces concurent ocupă unul între citire și INSERT
+SLUG_ALLOCATION_ATTEMPTS = 3
+
+
+class ProvisioningReport:
+    def __init__(self):
+        self.restaurants = []
+        self.owners_created = 0
+        self.dishes_seeded = 0
+        self.errors = []  # (linie, mesaj)
+
+    def __str__(self):
+        return (f'{len(self.restaurants)} restaurante create, {self.owners_created} proprietari noi, '
+                f'{self.dishes_seeded} feluri copiate, {len(self.errors)} rânduri respinse')
+
+
+def _clean_rows(rows, report):
+    """Validează rândurile; întoarce lista de dict-uri acceptate (nume unice în lot)."""
+    accepted, seen = [], set()
+    for line_no, row in rows:
+        if isinstance(row, Exception):
+            report.errors.append((line_no, str(row)))
+            continue
+        name = str(row.get('name') or '').strip()
+        owner = str(row.get('owner') or '').strip()
+        if not name or not owner:
+            report.errors.append((line_no, 'lipsește numele restaurantului sau proprietarul'))
+            continue
+        if len(name) > Restaurant._meta.get_field('name').max_length:
+            report.errors.append((line_no, 'numele restaurantului e prea lung'))
+            continue
+        if name.lower() in seen:
+            report.errors.append((line_no, f'restaurantul "{name}" apare de două ori'))
+            continue
+        try:
+            is_active = parse_bool(row['is_active']) if row.get('is_active') not in (None, '') else True
+        except ValueError as exc:
+            report.errors.append((line_no, str(exc)))
+            continue
+        seen.add(name.lower())
+        accepted.append({
+            'line': line_no,
+            'name': name,
+            'owner': owner,
+            'owner_email': str(row.get('owner_email') or '').strip(),
+            'description': str(row.get('description') or ''),
+            'is_active': is_active,
+            'template': str(row.get('template') or '').strip() or None,
+        })
+    return accepted
+
+
+def _owners(rows, report):
+    usernames = {row['owner'] for row in rows}
+    users = User.objects.in_bulk(usernames, field_name='username')
+    missing = [
+        User(username=row['owner'], email=row['owner_email'], password=make_password(None))
+        for row in {row['owner']: row for row in rows if row['owner'] not in users}.values()
+    ]
+    if missing:
+        User.objects.bulk_create(missing)
+        report.owners_created = len(missing)
+        users = User.objects.in_bulk(usernames, field_name='username')
+    return users
+
+
+def _seed_dishes(restaurants_by_template, templates, batch_size):
+    """Copiază felurile proprii ale fiecărui șablon în restaurantele noi; întoarce numărul de feluri."""
+    through = Dish.allergens.through
+    seeded = 0
+    for template_slug, restaurants in restaurants_by_template.items():
+        template = templates[template_slug]
+        source = list(Dish.objects.filter(restaurant=template, is_default=False).values('id', *SEED_DISH_FIELDS))
+        if not source:
+            continue
+        allergens = {}
+        for dish_id, allergen_id in through.objects.filter(dish__in=[d['id'] for d in source]).values_list(
+                'dish_id', 'allergen_id'):
+            allergens.setdefault(dish_id, []).append(allergen_id)
+
+        copies = [
+            Dish(restaurant=restaurant, **{field: dish[field] for field in SEED_DISH_FIELDS})
+            for restaurant in restaurants for dish in source
+        ]
+        Dish.objects.bulk_create(copies, batch_size=batch_size)
+        if not all(copy.pk for copy in copies):
+            ids = {
+                (restaurant_id, name): pk for pk, restaurant_id, name in Dish.objects.filter(
+                    restaurant__in=restaurants).values_list('pk', 'restaurant_id', 'name')
+            }
+            for copy in copies:
+                copy.pk = ids[(copy.restaurant_id, copy.name)]
+
+        links = []
+        for index, copy in enumerate(copies):
+            for allergen_id in allergens.get(source[index % len(source)]['id'], ()):
+                links.append(through(dish_id=copy.pk, allergen_id=allergen_id))
+        through.objects.bulk_create(links, batch_size=batch_size)
+        seeded += len(copies)
+    return seeded
+
+
+def _create_restaurants(rows, owners, batch_size):
+    """
+    `bulk_create` pentru restaurante, cu slug-uri alocate dintr-o interogare. Dacă alt proces
+    ocupă între timp unul dintre slug-uri, INSERT-ul (într-un savepoint) eșuează și alocarea
+    se reia; după SLUG_ALLOCATION_ATTEMPTS încercări întoarce (None, None).
+    """
+    for _ in range(SLUG_ALLOCATION_ATTEMPTS):
+        slugs = allocate_restaurant_slugs([row['name'] for row in rows])
+        try:
+            with transaction.atomic():
+                restaurants = Restaurant.objects.bulk_create([
+                    Restaurant(name=row['name'], slug=slug, owner=owners[row['owner']],
+                               description=row['description'], is_active=row['is_active'])
+                    for row, slug in zip(rows, slugs)
+                ], batch_size=batch_size)
+        except IntegrityError:
+            continue
+        return restaurants, slugs
+    return None, None
+
+
+def provision_restaurants(rows, template=None, batch_size=1000, dry_run=False):
+    """
+    Creează restaurantele din `rows` (perechi `(linie, dict)`, ca `core.importers.iter_rows`).
+    Restaurantele cu nume deja existent sau cu șablon inexistent sunt raportate și sărite.
+    Totul rulează într-o tranzacție; cu `dry_run` nu rămâne nimic scris.
+    """
+    report = ProvisioningReport()
+    rows = _clean_rows(rows, report)
+
+    # Numele se compară fără diferență de majuscule, ca și duplicatele din lot
+    existing = {
+        name.lower() for name in Restaurant.objects.annotate(name_lower=Lower('name'))
+        .filter(name_lower__in=[row['name'].lower() for row in rows])
+        .values_list('name', flat=True)
+    }
+    template_slugs = {row['template'] or template for row in rows} - {None}
+    templates = Restaurant.objects.in_bulk(template_slugs, field_name='slug')
+
+    accepted = []
+    for row in rows:
+        row_template = row['template'] or template
+        if row['name'].lower() in existing:
+            report.errors.append((row['line'], f'restaurantul "{row["name"]}" există deja'))
+        elif row_template and row_template not in templates:
+            report.errors.append((row['line'], f'șablonul "{row_template}" nu există'))
+        else:
+            accepted.append(row)
+    if not accepted:
+        return report
+
+    with transaction.atomic():
+        owners = _owners(accepted, report)
+        restaurants, slugs = _create_restaurants(accepted, owners, batch_size)
+        if restaurants is None:
+            for row in accepted:
+                report.errors.append((row['line'], 'slug-ul nu a putut fi alocat (scrieri concurente); reîncearcă'))
+            report.owners_created = 0
+            transaction.set_rollback(True)
+            return report
+        if not all(restaurant.pk for restaurant in restaurants):
+            by_slug = Restaurant.objects.in_bulk(slugs, field_name='slug')
+            restaurants = [by_slug[slug] for slug in slugs]
+
+        restaurants_by_template = {}
+        for row, restaurant in zip(accepted, restaurants):
+            row_template = row['template'] or template
+            if row_template:
+                restaurants_by_template.setdefault(row_template, []).append(restaurant)
+        report.dishes_seeded = _seed_dishes(restaurants_by_template, templates, batch_size)
+        report.restaurants = restaurants
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    if not dry_run:
+        # bulk_create nu trimite semnale: slug-urile noi pot fi în cache ca „inexistente”
+        invalidate_restaurant(*slugs)
+    return report
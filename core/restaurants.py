@@ -0,0 +1,62 @@
+# core/restaurants.py
+"""
+Rezolvarea slug → restaurant, cu cache.
+
+Fiecare cerere pe un restaurant (`RestaurantRequiredMixin`, `plan_detail_view`,
+API-ul) căuta restaurantul în baza de date. Restaurantele se schimbă foarte rar,
+așa că le ținem în cache-ul Django cu TTL (`RESTAURANT_CACHE_TIMEOUT`), iar
+semnalele din `core.signals` șterg intrările la `Restaurant.save` / `delete`.
+Tot aici stă și lista restaurantelor active (pagina de start).
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models import Restaurant
+
+
+RESTAURANT_SLUG_KEY = 'restaurant:slug:{slug}'
+RESTAURANT_DIRECTORY_KEY = 'restaurant:directory'
+
+# Ținem minte și slug-urile inexistente, ca URL-urile greșite să nu lovească DB-ul la fiecare cerere
+_MISSING = 'missing'
+
+
+def _timeout():
+    return getattr(settings, 'RESTAURANT_CACHE_TIMEOUT', 300)
+
+
+def resolve_restaurant(slug):
+    """Restaurantul activ cu slug-ul dat sau None."""
+    if not slug:
+        return None
+    key = RESTAURANT_SLUG_KEY.format(slug=slug)
+    restaurant = cache.get(key)
+    if restaurant is None:
+        restaurant = Restaurant.objects.filter(slug=slug, is_active=True).first() or _MISSING
+        cache.set(key, restaurant, _timeout())
+    return None if restaurant == _MISSING else restaurant
+
+
+async def aresolve_restaurant(slug):
+    if not slug:
+        return None
+    key = RESTAURANT_SLUG_KEY.format(slug=slug)
+    restaurant = await cache.aget(key)
+    if restaurant is None:
+        restaurant = await Restaurant.objects.filter(slug=slug, is_active=True).afirst() or _MISSING
+        await cache.aset(key, restaurant, _timeout())
+    return None if restaurant == _MISSING else restaurant
+
+
+def get_restaurant_directory():
+    """Restaurantele active, ordonate după nume (pentru landing page)."""
+    restaurants = cache.get(RESTAURANT_DIRECTORY_KEY)
+    if restaurants is None:
+        restaurants = list(Restaurant.objects.filter(is_active=True).order_by('name'))
+        cache.set(RESTAURANT_DIRECTORY_KEY, restaurants, _timeout())
+    return restaurants
+
+
+def invalidate_restaurant(*slugs):
+    keys = [RESTAURANT_SLUG_KEY.format(slug=slug) for slug in slugs if slug]
+    cache.delete_many(keys + [RESTAURANT_DIRECTORY_KEY])
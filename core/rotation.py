@@ -0,0 +1,60 @@
+# core/rotation.py
+"""
+Rotația felurilor pe un plan de mai multe zile / săptămâni.
+
+Pentru fiecare tip de masă ținem felurile „disponibile” într-o listă și pe cele
+folosite recent într-o coadă, ordonată după ziua în care redevin disponibile.
+Alegerea unui fel e O(1) (index aleator + swap cu ultimul), iar eliberarea din
+coadă e O(1) amortizat – fără reeșantionare până nimerim un fel nefolosit.
+
+Un fel ales în ziua `d` nu mai apare la același tip de masă în următoarele
+`cooldown_days` zile. Dacă restaurantul are prea puține feluri pentru pauza
+cerută, cele mai vechi feluri din coadă sunt eliberate mai devreme.
+"""
+from collections import deque
+
+
+class DishRotation:
+    def __init__(self, dishes, cooldown_days, rng):
+        self.ready = list(dishes)
+        self.cooling = deque()  # (ziua de eliberare, [feluri])
+        self.cooldown_days = cooldown_days
+        self.rng = rng
+
+    def __len__(self):
+        return len(self.ready) + sum(len(dishes) for _, dishes in self.cooling)
+
+    def _release(self, day):
+        while self.cooling and self.cooling[0][0] <= day:
+            self.ready.extend(self.cooling.popleft()[1])
+
+    def take(self, day, k):
+        """Maxim `k` feluri diferite, disponibile în ziua `day`, în ordine aleatoare."""
+        self._release(day)
+        while len(self.ready) < k and self.cooling:
+            self.ready.extend(self.cooling.popleft()[1])
+
+        ready = self.ready
+        picked = []
+        for _ in range(min(k, len(ready))):
+            i = self.rng.randrange(len(ready))
+            ready[i], ready[-1] = ready[-1], ready[i]
+            picked.append(ready.pop())
+        return picked
+
+    def put_back(self, dishes):
+        """Felurile luate dar nefolosite redevin disponibile imediat."""
+        self.ready.extend(dishes)
+
+    def cool(self, day, dishes):
+        """Felurile folosite în ziua `day` pauzează `cooldown_days` zile."""
+        if dishes:
+            self.cooling.append((day + self.cooldown_days + 1, list(dishes)))
+
+
+def build_rotations(catalog, meal_types, constraints, cooldown_days, rng):
+    """O rotație per tip de masă, din felurile compatibile ale catalogului (o filtrare per tip)."""
+    return {
+        meal_type: DishRotation(catalog.available(meal_type, constraints), cooldown_days, rng)
+        for meal_type in meal_types
+    }
@@ -0,0 +1,36 @@
+# core/sampling.py
+"""
+Eșantionarea felurilor pentru fiecare masă, fără `ORDER BY RANDOM()`.
+
+Candidații vin din catalogul în memorie (`core.catalog`), deci alegerea a `k`
+feluri costă O(k) și nu mai cere bazei de date să sorteze tot setul filtrat.
+Cu un `seed` fix, aceleași intrări dau aceeași selecție.
+"""
+import random
+
+
+class DishSampler:
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    def sample(self, candidates, k):
+        """Maxim `k` elemente distincte din `candidates`, în ordine aleatoare."""
+        if k >= len(candidates):
+            picked = list(candidates)
+            self.rng.shuffle(picked)
+            return picked
+        return self.rng.sample(candidates, k)
+
+    def choice(self, options):
+        return self.rng.choice(options)
+
+    def randint(self, a, b):
+        return self.rng.randint(a, b)
+
+
+def get_sampler(sampler=None, seed=None):
+    """Returnează sampler-ul primit sau unul nou (cu `seed` opțional)."""
+    if sampler is not None:
+        return sampler
+    return DishSampler(seed)
@@ -1,8 +1,22 @@
-
-import random
+import hashlib
+import json
+from functools import partial
 from datetime import datetime, timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
+from core.catalog import aget_catalog, get_catalog
+from core.dish_index import CompiledConstraints
+from core.jobs import enqueue, register_job
 from core.models import Dish, MacroRatio, MealPlan, Restaurant
+from core.plan_pool import plan_bucket, pool_size, take_pooled_meals
+from core.portions import MIN_PORTION_GRAMS, nutrient_matrix, solve_portions
+from core.rotation import build_rotations
+from core.sampling import get_sampler
+from core.timing import phase
 
 
 # ==================== CONFIGURAȚII ====================
@@ -50,10 +64,17 @@ def get_available_dishes(meal_type, restaurant, constraints=None):
     if constraints is None:
         constraints = {}
 
+    # Felurile proprii + cele implicite (is_default), minus cele excluse de restaurant
+    # și cele implicite înlocuite de un fel propriu cu același nume
+    own_names = Dish.objects.filter(restaurant=restaurant).values('name')
     queryset = Dish.objects.filter(
+        models.Q(restaurant=restaurant) | models.Q(is_default=True),
         meal_type=meal_type,
-        restaurant=restaurant,
         is_active=True
+    ).exclude(
+        models.Q(is_default=True) & ~models.Q(restaurant=restaurant) & (
+            models.Q(excluded_by_restaurants=restaurant) | models.Q(name__in=own_names)
+        )
     )
 
     # Aplicăm filtrele dietetice
@@ -99,10 +120,11 @@ def get_meal_start_info():
 
 
 # ==================== ZILELE SĂPTĂMÂNII ====================
-def get_week_days_labels(days_offset, first_day_label):
-    base_date = datetime.now().date() + timedelta(days=days_offset)
+def get_week_days_labels(days_offset, first_day_label, today=None, days=7):
+    """Etichetele zilelor planului; după prima săptămână numele zilei se repetă → adăugăm data."""
+    base_date = (today or datetime.now().date()) + timedelta(days=days_offset)
     labels = []
-    for i in range(7):
+    for i in range(days):
         day_date = base_date + timedelta(days=i)
         weekday_name = ROMANIAN_DAYS[day_date.weekday()]
 
@@ -110,6 +132,8 @@ def get_week_days_labels(days_offset, first_day_label):
             labels.append(first_day_label)
         elif i == 1 and days_offset == 1:
             labels.append("Azi")
+        elif i >= 7:
+            labels.append(f"{weekday_name} {day_date:%d.%m}")
         else:
             labels.append(weekday_name)
     return labels
@@ -161,76 +185,149 @@ def calculate_macros(daily_calories, macro_ratio):
     return proteins, carbs, fats, fiber
 
 
+# ==================== INTRĂRI MESE ====================
+def dish_entry(dish, grams):
+    """Intrarea afișată pentru un fel: gramaj + nutrienți calculați din valorile per 100g."""
+    return {
+        "id": dish.id,
+        "name": dish.name,
+        "grams": grams,
+        "calories": round((dish.calories / 100) * grams),
+        "proteins": round((float(dish.proteins) / 100) * grams),
+        "carbs": round((float(dish.carbs) / 100) * grams),
+        "fats": round((float(dish.fats) / 100) * grams),
+        "is_past": False
+    }
+
+
+def manual_option_entry():
+    return {
+        "id": None,
+        "name": "Opțiune manuală recomandată (fără sugestii disponibile)",
+        "grams": 0,
+        "calories": 0,
+        "proteins": 0,
+        "carbs": 0,
+        "fats": 0,
+        "is_past": False
+    }
+
+
+def past_meal_entry(meal_name):
+    return {
+        "id": None,
+        "name": f"→ {meal_name} deja trecut",
+        "grams": 0,
+        "calories": 0,
+        "proteins": 0,
+        "carbs": 0,
+        "fats": 0,
+        "is_past": True
+    }
+
+
 # ==================== SELECȚIE DISHES ====================
-def get_dishes_for_meal(meal_type_db, restaurant, constraints):
-    """Returnează maxim 12 feluri compatibile cu constrângerile."""
-    return list(
-        get_available_dishes(meal_type_db, restaurant, constraints)
-        .order_by('?')[:12]
-    )
+def get_dishes_for_meal(meal_type_db, restaurant, constraints, catalog=None, sampler=None):
+    """Returnează maxim 12 feluri compatibile cu constrângerile (din catalogul în memorie)."""
+    if catalog is None:
+        catalog = get_catalog(restaurant)
+    return catalog.sample(meal_type_db, constraints, k=12, sampler=sampler)
+
+
+def select_and_scale_dishes(meal_type_db, target_calories, target_p, target_c, target_f, restaurant, constraints,
+                            catalog=None, sampler=None):
+    sampler = get_sampler(sampler)
+    with phase('select'):
+        candidates = get_dishes_for_meal(meal_type_db, restaurant, constraints, catalog=catalog, sampler=sampler)
+        if not candidates:
+            return [manual_option_entry()]
+
+        num_dishes = sampler.choice([1, 2, 2, 3])
+        chosen = fit_meal_size(candidates[:num_dishes], target_calories)
+
+    return scale_dishes(chosen, target_calories, target_p, target_c, target_f)
+
 
+def select_rotated_dishes(rotation, day_idx, target_calories, target_p, target_c, target_f, sampler):
+    """Ca `select_and_scale_dishes`, dar felurile vin din rotația tipului de masă (fără repetări recente)."""
+    with phase('select'):
+        num_dishes = sampler.choice([1, 2, 2, 3])
+        picked = rotation.take(day_idx, num_dishes)
+        if not picked:
+            return [manual_option_entry()]
+
+        chosen = fit_meal_size(list(picked), target_calories)
+        rotation.put_back(picked[len(chosen):])
+        rotation.cool(day_idx, chosen)
+
+    return scale_dishes(chosen, target_calories, target_p, target_c, target_f)
+
+
+def fit_meal_size(chosen, target_calories):
+    # Mesele mici (gustările) nu au loc pentru prea multe porții minime
+    while len(chosen) > 1 and sum(d.calories for d in chosen) / 100 * MIN_PORTION_GRAMS > target_calories:
+        chosen.pop()
+    return chosen
+
+
+def scale_dishes(chosen, target_calories, target_p, target_c, target_f):
+    with phase('scale'):
+        grams_list = solve_portions(
+            nutrient_matrix(chosen), (target_calories, target_p, target_c, target_f)
+        )
+
+    return [dish_entry(dish, int(grams)) for dish, grams in zip(chosen, grams_list)]
+
+
+# ==================== GENERARE PLAN (1–4 SĂPTĂMÂNI) ====================
+MAX_PLAN_WEEKS = 4
+
+
+def rotation_cooldown_days():
+    return getattr(settings, 'PLAN_ROTATION_COOLDOWN_DAYS', 3)
+
+
+def generate_weekly_meals(daily_calories, total_proteins, total_carbs, total_fats, restaurant, constraints,
+                          catalog=None, seed=None, start_info=None, weeks=1):
+    """
+    Cu același `seed`, același catalog și aceeași masă de start (`start_info`,
+    implicit calculată din ora curentă) rezultatul este identic.
+    """
+    return dict(iter_weekly_meals(
+        daily_calories, total_proteins, total_carbs, total_fats, restaurant, constraints,
+        catalog=catalog, seed=seed, start_info=start_info, weeks=weeks
+    ))
+
+
+def iter_weekly_meals(daily_calories, total_proteins, total_carbs, total_fats, restaurant, constraints,
+                      catalog=None, seed=None, start_info=None, weeks=1):
+    """
+    `(zi, mese)` pe rând, fiecare zi generată abia când e cerută (pentru răspunsul în flux).
 
-def select_and_scale_dishes(meal_type_db, target_calories, target_p, target_c, target_f, restaurant, constraints):
-    candidates = get_dishes_for_meal(meal_type_db, restaurant, constraints)
-    if not candidates:
-        return [{
-            "name": "Opțiune manuală recomandată (fără sugestii disponibile)",
-            "grams": 0,
-            "calories": 0,
-            "proteins": 0,
-            "carbs": 0,
-            "fats": 0,
-            "is_past": False
-        }]
-
-    selected = []
-    remaining_cal = target_calories
-    num_dishes = random.choice([1, 2, 2, 3])
-
-    for dish in candidates[:num_dishes]:
-        if remaining_cal < 120:
-            break
-        grams = random.randint(80, 380)
-        grams = min(grams, int(remaining_cal / (dish.calories / 100 * 0.8)))
-        grams = round(grams / 10) * 10
-
-        selected.append({
-            "name": dish.name,
-            "grams": int(grams),
-            "calories": round((dish.calories / 100) * grams),
-            "proteins": round((dish.proteins / 100) * grams),
-            "carbs": round((dish.carbs / 100) * grams),
-            "fats": round((dish.fats / 100) * grams),
-            "is_past": False
-        })
-        remaining_cal -= selected[-1]["calories"]
-
-    return selected
-
-
-# ==================== GENERARE PLAN SĂPTĂMÂNAL ====================
-def generate_weekly_meals(daily_calories, total_proteins, total_carbs, total_fats, restaurant, constraints):
-    plan = {}
-    start_meal_name, days_offset, first_day_label = get_meal_start_info()
-    week_days = get_week_days_labels(days_offset, first_day_label)
+    Planul are `weeks` săptămâni. Felurile fiecărui tip de masă vin dintr-o rotație
+    (`core.rotation`): un fel nu se repetă la aceeași masă mai devreme de
+    PLAN_ROTATION_COOLDOWN_DAYS zile, cât timp restaurantul are destule feluri.
+    """
+    if catalog is None:
+        catalog = get_catalog(restaurant)  # o singură încărcare pentru toate mesele planului
+    compiled = CompiledConstraints.from_constraints(constraints)  # compilate o dată, nu la fiecare masă
+    sampler = get_sampler(seed=seed)
+    start_meal_name, days_offset, first_day_label = start_info or get_meal_start_info()
+    plan_days = get_week_days_labels(days_offset, first_day_label, days=7 * weeks)
     start_index = MEAL_ORDER_DISPLAY.index(start_meal_name)
+    with phase('select'):
+        rotations = build_rotations(
+            catalog, MEAL_CALORIE_DISTRIBUTION, compiled, rotation_cooldown_days(), sampler.rng
+        )
 
-    for day_idx, day_name in enumerate(week_days):
+    for day_idx, day_name in enumerate(plan_days):
         day_meals = {}
         meals_to_show = MEAL_ORDER_DISPLAY[start_index:] if day_idx == 0 else MEAL_ORDER_DISPLAY
 
         # Mesele din trecut (doar în prima zi)
         if day_idx == 0 and start_index > 0:
             for past_meal in MEAL_ORDER_DISPLAY[:start_index]:
-                day_meals[past_meal] = [{
-                    "name": f"→ {past_meal} deja trecut",
-                    "grams": 0,
-                    "calories": 0,
-                    "proteins": 0,
-                    "carbs": 0,
-                    "fats": 0,
-                    "is_past": True
-                }]
+                day_meals[past_meal] = [past_meal_entry(past_meal)]
 
         # Mesele active
         for display_name in meals_to_show:
@@ -241,33 +338,222 @@ def generate_weekly_meals(daily_calories, total_proteins, total_carbs, total_fat
             meal_c = int(total_carbs * cal_pct)
             meal_f = int(total_fats * cal_pct)
 
-            dishes = select_and_scale_dishes(
-                meal_type_db, meal_cal, meal_p, meal_c, meal_f, restaurant, constraints
+            day_meals[display_name] = select_rotated_dishes(
+                rotations[meal_type_db], day_idx, meal_cal, meal_p, meal_c, meal_f, sampler
             )
-            day_meals[display_name] = dishes
 
-        plan[day_name] = day_meals
+        yield day_name, day_meals
         start_index = 0  # doar prima zi începe mai târziu
 
-    return plan
 
+# ==================== CACHE REZULTATE ====================
+def plan_cache_key(restaurant_id, catalog_version, constraints, daily_calories, macro_ratio, start_info, seed,
+                   weeks=1):
+    """
+    Cheia include tot ce influențează mesele: catalogul (prin versiune),
+    constrângerile normalizate, caloriile, procentele raportului de macro,
+    masa de start (+ data, pentru etichetele zilelor), seed-ul și numărul de săptămâni.
+    """
+    payload = json.dumps([
+        restaurant_id,
+        catalog_version,
+        sorted(constraints.items()),
+        daily_calories,
+        [macro_ratio.pk, macro_ratio.proteins, macro_ratio.carbs, macro_ratio.fats],
+        list(start_info),
+        datetime.now().date().isoformat(),
+        seed,
+        weeks,
+    ], sort_keys=True, default=str)
+    return 'plan:meals:' + hashlib.sha1(payload.encode('utf-8')).hexdigest()
 
-# ==================== FUNCȚIA PRINCIPALĂ ====================
-def generate_meal_plan(data, user=None, restaurant=None):
+
+# Rezerva generează zile întregi, de azi; masa de start reală se aplică la citire (`apply_start_info`)
+FULL_DAY_START = (MEAL_ORDER_DISPLAY[0], 0, "Azi")
+
+
+def uses_plan_pool(seed, weeks):
+    """Planurile fără seed, de o săptămână, vin din rezerva pre-generată (dacă e activă)."""
+    return seed is None and weeks == 1 and pool_size() > 0
+
+
+def apply_start_info(meals, start_info):
+    """Un plan de zile întregi adus la masa de start: etichetele zilelor și mesele deja trecute."""
+    start_meal_name, days_offset, first_day_label = start_info
+    start_index = MEAL_ORDER_DISPLAY.index(start_meal_name)
+    labels = get_week_days_labels(days_offset, first_day_label, days=len(meals))
+    result = {}
+    for day_idx, (day_name, day_meals) in enumerate(zip(labels, meals.values())):
+        if day_idx == 0 and start_index > 0:
+            day_meals = {
+                meal: [past_meal_entry(meal)] if meal_idx < start_index else day_meals[meal]
+                for meal_idx, meal in enumerate(MEAL_ORDER_DISPLAY)
+            }
+        result[day_name] = day_meals
+    return result
+
+
+def find_ready_weekly_meals(daily_calories, proteins, carbs, fats, restaurant, constraints, macro_ratio,
+                            catalog, seed, start_info, weeks=1):
     """
-    Generează planul alimentar personalizat, respectând constrângerile dietetice.
+    Planul deja calculat. Cu rezerva activă, planurile fără seed de o săptămână vin
+    de acolo – fiecare cerere primește alt plan, deci nu trec prin cache-ul de
+    rezultate; restul vin din cache-ul de rezultate.
     """
-    if restaurant is None:
-        raise ValueError("Restaurantul este obligatoriu pentru generarea planului.")
+    if uses_plan_pool(seed, weeks):
+        bucket = plan_bucket(restaurant.id, catalog.version, constraints, daily_calories, macro_ratio)
+        with phase('pool'):
+            meals = take_pooled_meals(bucket, partial(
+                generate_weekly_meals, daily_calories, proteins, carbs, fats, restaurant, constraints,
+                catalog=catalog, start_info=FULL_DAY_START
+            ))
+        return apply_start_info(meals, start_info) if meals is not None else None
+
+    timeout = getattr(settings, 'PLAN_RESULT_CACHE_TIMEOUT', 600)
+    if not timeout:
+        return None
+    return cache.get(plan_cache_key(restaurant.id, catalog.version, constraints, daily_calories, macro_ratio,
+                                    start_info, seed, weeks))
+
+
+def remember_weekly_meals(meals, daily_calories, restaurant, constraints, macro_ratio, catalog, seed, start_info,
+                          weeks=1):
+    timeout = getattr(settings, 'PLAN_RESULT_CACHE_TIMEOUT', 600)
+    if timeout and not uses_plan_pool(seed, weeks):
+        key = plan_cache_key(restaurant.id, catalog.version, constraints, daily_calories, macro_ratio, start_info,
+                             seed, weeks)
+        cache.set(key, meals, timeout)
+
+
+def get_or_generate_weekly_meals(daily_calories, proteins, carbs, fats, restaurant, constraints, macro_ratio,
+                                 catalog=None, seed=None, start_info=None, weeks=1):
+    """
+    `generate_weekly_meals` cu cache pe rezultat (retrimiterile aceluiași profil nu se
+    mai recalculează). Cu rezerva activă, un plan fără seed vine din rezerva
+    pre-generată (`core.plan_pool`) – fiecare cerere primește alt plan, deci nu trece
+    prin cache-ul de rezultate – și abia apoi e generat pe loc.
+    """
+    if catalog is None:
+        catalog = get_catalog(restaurant)
+    if start_info is None:
+        start_info = get_meal_start_info()
+
+    meals = find_ready_weekly_meals(
+        daily_calories, proteins, carbs, fats, restaurant, constraints, macro_ratio, catalog, seed, start_info, weeks
+    )
+    if meals is None:
+        meals = generate_weekly_meals(
+            daily_calories, proteins, carbs, fats, restaurant, constraints,
+            catalog=catalog, seed=seed, start_info=start_info, weeks=weeks
+        )
+        remember_weekly_meals(meals, daily_calories, restaurant, constraints, macro_ratio, catalog, seed, start_info,
+                              weeks)
+    return meals
+
+
+# ==================== SNAPSHOT COMPACT ====================
+# Formatul 2 păstrează doar [dish_id, grame] pentru fiecare masă, plus totalurile.
+# Numele, nutrienții, etichetele zilelor și mesele trecute se reconstruiesc la citire.
+SNAPSHOT_FORMAT = 2
+
+
+def build_compact_snapshot(meals, start_info, catalog_version, restaurant, **totals):
+    start_meal_name, days_offset, first_day_label = start_info
+    start_index = MEAL_ORDER_DISPLAY.index(start_meal_name)
+
+    slots = []
+    day_totals = []
+    for day_idx, day_meals in enumerate(meals.values()):
+        day_slots = []
+        day_sum = [0, 0, 0, 0]
+        for meal_idx, display_name in enumerate(MEAL_ORDER_DISPLAY):
+            if day_idx == 0 and meal_idx < start_index:
+                day_slots.append([])
+                continue
+            entries = []
+            for dish in day_meals.get(display_name, []):
+                entries.append([dish.get("id"), dish["grams"]])
+                day_sum[0] += dish["calories"]
+                day_sum[1] += dish["proteins"]
+                day_sum[2] += dish["carbs"]
+                day_sum[3] += dish["fats"]
+            day_slots.append(entries)
+        slots.append(day_slots)
+        day_totals.append(day_sum)
+
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "catalog_version": catalog_version,
+        "restaurant_id": restaurant.id,
+        "restaurant_name": restaurant.name,
+        "generated_at": datetime.now().isoformat(),
+        "days_offset": days_offset,
+        "first_day_label": first_day_label,
+        "start_index": start_index,
+        "slots": slots,
+        "day_totals": day_totals,  # [kcal, P, C, G] pe zi
+        **totals,
+    }
 
-    # Extragere constrângeri dietetice din datele formularului
+
+def is_compact_snapshot(snapshot):
+    return bool(snapshot) and snapshot.get("format") == SNAPSHOT_FORMAT
+
+
+def hydrate_snapshot(snapshot, catalog=None):
+    """
+    Reconstruiește structura completă (`meals` pe zile / mese / feluri) dintr-un
+    snapshot compact. Snapshot-urile vechi (JSON complet) sunt întoarse neschimbate.
+    """
+    if not is_compact_snapshot(snapshot):
+        return snapshot or {}
+
+    if catalog is None:
+        catalog = get_catalog(snapshot["restaurant_id"])
+    dish_ids = {
+        dish_id
+        for day_slots in snapshot["slots"] for entries in day_slots for dish_id, _ in entries
+        if dish_id is not None
+    }
+    dishes = {dish_id: catalog.by_id[dish_id] for dish_id in dish_ids if dish_id in catalog.by_id}
+    missing = dish_ids - dishes.keys()
+    if missing:
+        # Feluri dezactivate între timp: o singură interogare pentru toate
+        dishes.update(Dish.objects.in_bulk(missing))
+
+    generated_on = datetime.fromisoformat(snapshot["generated_at"]).date()
+    plan_days = get_week_days_labels(snapshot["days_offset"], snapshot["first_day_label"], today=generated_on,
+                                     days=len(snapshot["slots"]))
+
+    meals = {}
+    for day_idx, (day_name, day_slots) in enumerate(zip(plan_days, snapshot["slots"])):
+        day_meals = {}
+        for meal_idx, (display_name, entries) in enumerate(zip(MEAL_ORDER_DISPLAY, day_slots)):
+            if day_idx == 0 and meal_idx < snapshot["start_index"]:
+                day_meals[display_name] = [past_meal_entry(display_name)]
+                continue
+            day_meals[display_name] = [
+                dish_entry(dishes[dish_id], grams) if dish_id in dishes else manual_option_entry()
+                for dish_id, grams in entries
+            ]
+        meals[day_name] = day_meals
+
+    hydrated = {key: value for key, value in snapshot.items() if key not in ("slots", "format")}
+    hydrated["meals"] = meals
+    return hydrated
+
+
+# ==================== CONSTRÂNGERI ====================
+def build_constraints(data):
+    """Extrage constrângerile dietetice din datele formularului / API-ului."""
     constraints = {
         'vegan': data.get('is_vegan', False),
         'vegetarian': data.get('is_vegetarian', False),
         'raw_vegan': data.get('is_raw_vegan', False),
         'gluten_free': data.get('is_gluten_free', False),
         'lactose_free': data.get('is_lactose_free', False),
-        'allergens': data.get('allergens', []),  # listă de ID-uri Allergen
+        # listă de ID-uri Allergen (formularul / DRF dau obiecte → le reducem la ID-uri, ca să fie JSON)
+        'allergens': sorted(getattr(a, 'pk', a) for a in data.get('allergens') or []),
     }
 
     # Logică de consistență
@@ -277,55 +563,265 @@ def generate_meal_plan(data, user=None, restaurant=None):
     if constraints['raw_vegan']:
         constraints['vegan'] = True
 
+    return constraints
+
+
+# ==================== CONSTRUIRE PLAN (FĂRĂ SALVARE) ====================
+def plan_targets(data):
+    """Constrângerile, caloriile, BMI-ul și macro-urile calculate din profil."""
+    with phase('constraints'):
+        constraints = build_constraints(data)
+
     daily_calories = calculate_daily_calories(data)
-    bmi = calculate_bmi(data['weight'], data.get('height'))
     macro_ratio = data['macro_ratio']
-
     proteins, carbs, fats, fiber = calculate_macros(daily_calories, macro_ratio)
-    meals = generate_weekly_meals(daily_calories, proteins, carbs, fats, restaurant, constraints)
-
-    saved_plan = None
-    if user and user.is_authenticated:
-        saved_plan = MealPlan.objects.create(
-            user=user,
-            macro_ratio=macro_ratio,
-            daily_calories=daily_calories,
-            proteins=proteins,
-            carbs=carbs,
-            fats=fats,
-            fiber=fiber,
-            bmi=bmi,
-            target_weight=data.get('target_weight'),
-            activity_level=data['activity_level'],
-            age=data['age'],
-            gender=data['gender'],
-            weight=data['weight'],
-            height=data.get('height'),
-            dietary_constraints=constraints,  # salvăm și constrângerile
-            user_snapshot={
-                "daily_calories": daily_calories,
-                "bmi": bmi,
-                "proteins": proteins,
-                "carbs": carbs,
-                "fats": fats,
-                "fiber": fiber,
-                "meals": meals,
-                "dietary_constraints": constraints,
-                "generated_at": datetime.now().isoformat(),
-                "restaurant_id": restaurant.id,
-                "restaurant_name": restaurant.name,
-            }
+    return {
+        'constraints': constraints,
+        'daily_calories': daily_calories,
+        'bmi': calculate_bmi(data['weight'], data.get('height')),
+        'macro_ratio': macro_ratio,
+        'proteins': proteins,
+        'carbs': carbs,
+        'fats': fats,
+        'fiber': fiber,
+    }
+
+
+def new_meal_plan(data, user, targets, meals, start_info, catalog, restaurant):
+    """Instanța `MealPlan` nesalvată (sau None pentru utilizatori anonimi)."""
+    if not (user and user.is_authenticated):
+        return None
+    return MealPlan(
+        user=user,
+        macro_ratio=targets['macro_ratio'],
+        daily_calories=targets['daily_calories'],
+        proteins=targets['proteins'],
+        carbs=targets['carbs'],
+        fats=targets['fats'],
+        fiber=targets['fiber'],
+        bmi=targets['bmi'],
+        target_weight=data.get('target_weight'),
+        activity_level=data['activity_level'],
+        age=data['age'],
+        gender=data['gender'],
+        weight=data['weight'],
+        height=data.get('height'),
+        dietary_constraints=targets['constraints'],  # salvăm și constrângerile
+        user_snapshot=build_compact_snapshot(
+            meals, start_info, catalog.version, restaurant,
+            daily_calories=targets['daily_calories'], bmi=targets['bmi'],
+            proteins=targets['proteins'], carbs=targets['carbs'], fats=targets['fats'], fiber=targets['fiber'],
         )
+    )
+
 
+def plan_result(targets, meals):
     return {
         "success": True,
         "message": "Planul tău personalizat a fost generat cu succes!",
-        "daily_calories": daily_calories,
-        "bmi": bmi,
-        "proteins": proteins,
-        "carbs": carbs,
-        "fats": fats,
-        "fiber": fiber,
+        "daily_calories": targets['daily_calories'],
+        "bmi": targets['bmi'],
+        "proteins": targets['proteins'],
+        "carbs": targets['carbs'],
+        "fats": targets['fats'],
+        "fiber": targets['fiber'],
         "meals": meals,
-        "saved_plan_id": saved_plan.id if saved_plan else None,
-    }
\ No newline at end of file
+        "saved_plan_id": None,
+    }
+
+
+def build_meal_plan(data, restaurant, user=None, catalog=None):
+    """
+    Calculează planul și întoarce `(rezultat, meal_plan)`, unde `meal_plan` este
+    instanța `MealPlan` nesalvată (sau None pentru utilizatori anonimi).
+    `data['seed']` (opțional) face generarea deterministă, `data['weeks']` (1–4)
+    dă lungimea planului.
+    """
+    targets = plan_targets(data)
+    if catalog is None:
+        with phase('catalog'):
+            catalog = get_catalog(restaurant)
+    start_info = get_meal_start_info()
+    meals = get_or_generate_weekly_meals(
+        targets['daily_calories'], targets['proteins'], targets['carbs'], targets['fats'],
+        restaurant, targets['constraints'], targets['macro_ratio'],
+        catalog=catalog, seed=data.get('seed'), start_info=start_info, weeks=data.get('weeks') or 1
+    )
+    meal_plan = new_meal_plan(data, user, targets, meals, start_info, catalog, restaurant)
+    return plan_result(targets, meals), meal_plan
+
+
+# ==================== FUNCȚIA PRINCIPALĂ ====================
+def generate_meal_plan(data, user=None, restaurant=None):
+    """
+    Generează planul alimentar personalizat, respectând constrângerile dietetice.
+    """
+    if restaurant is None:
+        raise ValueError("Restaurantul este obligatoriu pentru generarea planului.")
+
+    result, meal_plan = build_meal_plan(data, restaurant, user=user)
+    if meal_plan is not None:
+        save_meal_plan(meal_plan, result)
+
+    return result
+
+
+def save_meal_plan(meal_plan, result):
+    """Salvează planul (sau îl pune în coadă, cu DEFER_PLAN_PERSISTENCE) și notează asta în `result`."""
+    with phase('save'):
+        if defer_plan_persistence():
+            defer_meal_plan(meal_plan)
+            result["saved_plan_pending"] = True
+        else:
+            meal_plan.save()
+            result["saved_plan_id"] = meal_plan.id
+
+
+# ==================== GENERARE ÎN FLUX (ZI CU ZI) ====================
+def stream_meal_plan(data, user=None, restaurant=None):
+    """
+    Ca `generate_meal_plan`, dar produce evenimente pe măsură ce planul e gata:
+    `('summary', rezultat fără mese)`, apoi `('day', zi, mese)` pentru fiecare zi
+    (prima e ziua de azi, cu mesele rămase) și la final `('done', rezultat)`,
+    după ce planul complet a fost salvat.
+    """
+    if restaurant is None:
+        raise ValueError("Restaurantul este obligatoriu pentru generarea planului.")
+
+    targets = plan_targets(data)
+    result = plan_result(targets, {})
+    yield 'summary', result
+
+    with phase('catalog'):
+        catalog = get_catalog(restaurant)
+    start_info = get_meal_start_info()
+    seed = data.get('seed')
+    weeks = data.get('weeks') or 1
+    args = (targets['daily_calories'], targets['proteins'], targets['carbs'], targets['fats'],
+            restaurant, targets['constraints'])
+    ready = find_ready_weekly_meals(*args, targets['macro_ratio'], catalog, seed, start_info, weeks)
+    days = ready.items() if ready is not None else iter_weekly_meals(
+        *args, catalog=catalog, seed=seed, start_info=start_info, weeks=weeks
+    )
+    meals = result["meals"]
+    for day_name, day_meals in days:
+        meals[day_name] = day_meals
+        yield 'day', day_name, day_meals
+
+    if ready is None:
+        remember_weekly_meals(meals, targets['daily_calories'], restaurant, targets['constraints'],
+                              targets['macro_ratio'], catalog, seed, start_info, weeks)
+    meal_plan = new_meal_plan(data, user, targets, meals, start_info, catalog, restaurant)
+    if meal_plan is not None:
+        save_meal_plan(meal_plan, result)
+    yield 'done', result
+
+
+# ==================== VARIANTA ASYNC ====================
+async def agenerate_meal_plan(data, user=None, restaurant=None):
+    """
+    Varianta async a `generate_meal_plan` (pentru ASGI): catalogul se încarcă
+    cu ORM-ul async, iar generarea (CPU + cache-ul de rezultate) rulează în
+    thread-ul sincron, nu pe event loop.
+    """
+    if restaurant is None:
+        raise ValueError("Restaurantul este obligatoriu pentru generarea planului.")
+
+    with phase('catalog'):
+        catalog = await aget_catalog(restaurant)
+    result, meal_plan = await sync_to_async(build_meal_plan)(data, restaurant, user=user, catalog=catalog)
+    if meal_plan is not None:
+        with phase('save'):
+            if defer_plan_persistence():
+                await sync_to_async(defer_meal_plan)(meal_plan)
+                result["saved_plan_pending"] = True
+            else:
+                await meal_plan.asave()
+                result["saved_plan_id"] = meal_plan.id
+
+    return result
+
+
+# ==================== SALVARE AMÂNATĂ ====================
+def defer_plan_persistence():
+    return getattr(settings, 'DEFER_PLAN_PERSISTENCE', False)
+
+
+def meal_plan_payload(meal_plan):
+    """Câmpurile unui `MealPlan` nesalvat, ca payload JSON pentru coada de sarcini."""
+    return {
+        field.attname: getattr(meal_plan, field.attname)
+        for field in MealPlan._meta.concrete_fields
+        if not field.primary_key and field.name != 'created_at'
+    }
+
+
+def defer_meal_plan(meal_plan):
+    """
+    Pune salvarea planului în coadă (`run_jobs` o execută) în loc de INSERT-ul
+    cu tot snapshot-ul pe drumul cererii. Cheia de idempotență conține ziua generării,
+    dar nu și ora: o retrimitere dublă a aceluiași plan se salvează o singură dată,
+    iar același plan generat din nou în altă zi e un plan nou.
+    """
+    payload = meal_plan_payload(meal_plan)
+    snapshot = payload['user_snapshot'] or {}
+    fingerprint = dict(payload, user_snapshot={
+        key: value for key, value in snapshot.items() if key != 'generated_at'
+    })
+    digest = hashlib.sha1(
+        json.dumps(fingerprint, sort_keys=True, cls=DjangoJSONEncoder).encode('utf-8')
+    ).hexdigest()
+    generated_at = snapshot.get('generated_at')
+    generated_on = datetime.fromisoformat(generated_at).date() if generated_at else datetime.now().date()
+    # Ora generării călătorește cu sarcina: `created_at` nu e ora la care rulează worker-ul
+    return enqueue(
+        'persist_meal_plan', dict(payload, created_at=timezone.now().isoformat()),
+        idempotency_key=f'meal_plan:{meal_plan.user_id}:{generated_on.isoformat()}:{digest}',
+    )
+
+
+@register_job('persist_meal_plan')
+def persist_meal_plan(payload):
+    created_at = payload.pop('created_at', None)
+    meal_plan = MealPlan.objects.create(**payload)
+    if created_at:
+        # `auto_now_add` pune ora INSERT-ului; planul păstrează momentul generării
+        MealPlan.objects.filter(pk=meal_plan.pk).update(created_at=datetime.fromisoformat(created_at))
+
+
+# ==================== GENERARE ÎN LOT ====================
+MAX_BATCH_SIZE = 500
+
+
+def generate_meal_plans_batch(items, user=None, restaurant=None):
+    """
+    Generează planuri pentru mai multe profiluri validate, cu un singur catalog
+    încărcat și un singur `bulk_create` pentru rândurile `MealPlan`.
+
+    Întoarce lista de rezultate, în ordinea intrărilor. Un profil care eșuează
+    la generare primește `{"success": False, "errors": ...}`, restul merg mai departe.
+    """
+    if restaurant is None:
+        raise ValueError("Restaurantul este obligatoriu pentru generarea planului.")
+
+    with phase('catalog'):
+        catalog = get_catalog(restaurant)
+    results = []
+    pending = []  # (rezultat, MealPlan nesalvat)
+    for data in items:
+        try:
+            result, meal_plan = build_meal_plan(data, restaurant, user=user, catalog=catalog)
+        except (KeyError, TypeError, ValueError) as exc:
+            results.append({"success": False, "errors": {"non_field_errors": [str(exc)]}})
+            continue
+        results.append(result)
+        if meal_plan is not None:
+            pending.append((result, meal_plan))
+
+    if pending:
+        with phase('save'):
+            saved = MealPlan.objects.bulk_create([meal_plan for _, meal_plan in pending])
+        for (result, _), meal_plan in zip(pending, saved):
+            result["saved_plan_id"] = meal_plan.pk
+
+    return results
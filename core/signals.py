@@ -0,0 +1,116 @@
+# core/signals.py
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_init, post_save, post_delete, pre_save, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from core.catalog import DEFAULT_CATALOG, bump_catalog_version
+from core.models import Allergen, Dish, Restaurant
+from core.restaurants import invalidate_restaurant
+from core.timing import record_query
+
+
+# ==================== INVALIDARE CATALOG ====================
+def _bump_for_dish(dish, was_default=False):
+    bump_catalog_version(dish.restaurant_id)
+    if dish.is_default or was_default:
+        bump_catalog_version(DEFAULT_CATALOG)
+
+
+@receiver(post_init, sender=Dish)
+def remember_loaded_dish_state(sender, instance, **kwargs):
+    # Restaurantul și `is_default` cu care felul a fost citit / creat, fără interogări
+    # (un câmp amânat lipsește din __dict__ și e tratat ca neschimbat)
+    state = instance.__dict__
+    instance._loaded_restaurant_id = state.get('restaurant_id')
+    instance._loaded_is_default = state.get('is_default')
+
+
+@receiver(post_save, sender=Dish)
+@receiver(post_delete, sender=Dish)
+def invalidate_catalog_on_dish_change(sender, instance, **kwargs):
+    # Un fel care nu mai e implicit iese și din catalogul implicit, iar unul mutat
+    # la alt restaurant dispare și din catalogul celui vechi
+    _bump_for_dish(instance, was_default=bool(getattr(instance, '_loaded_is_default', False)))
+    previous = getattr(instance, '_loaded_restaurant_id', None)
+    if previous is not None and previous != instance.restaurant_id:
+        bump_catalog_version(previous)
+    instance._loaded_restaurant_id = instance.restaurant_id
+    instance._loaded_is_default = instance.is_default
+
+
+@receiver(m2m_changed, sender=Dish.allergens.through)
+def invalidate_catalog_on_allergens_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        # dish.allergens.add(...) → un singur restaurant afectat
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            _bump_for_dish(instance)
+        return
+
+    # allergen.dishes.add(...) → restaurantele felurilor afectate
+    if action == 'pre_clear':
+        dishes = instance.dishes.all()
+    elif action in ('post_add', 'post_remove'):
+        dishes = Dish.objects.filter(pk__in=pk_set)
+    else:
+        return
+    _bump_for_dishes(dishes)
+
+
+@receiver(pre_delete, sender=Allergen)
+def invalidate_catalog_on_allergen_delete(sender, instance, **kwargs):
+    # Rândurile din tabela de legătură dispar în cascadă, fără m2m_changed
+    _bump_for_dishes(instance.dishes.all())
+
+
+def _bump_for_dishes(dishes):
+    rows = dishes.values_list('restaurant_id', 'is_default').order_by().distinct()
+    if any(is_default for _, is_default in rows):
+        bump_catalog_version(DEFAULT_CATALOG)
+    for restaurant_id in {restaurant_id for restaurant_id, _ in rows}:
+        bump_catalog_version(restaurant_id)
+
+
+@receiver(m2m_changed, sender=Restaurant.excluded_default_dishes.through)
+def invalidate_catalog_on_exclusions_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        # restaurant.excluded_default_dishes.add(...)
+        if action != 'pre_clear':
+            bump_catalog_version(instance.pk)
+        return
+
+    # dish.excluded_by_restaurants.add(...)
+    if action == 'pre_clear':
+        restaurant_ids = instance.excluded_by_restaurants.values_list('pk', flat=True)
+    elif action == 'post_clear':
+        return
+    else:
+        restaurant_ids = pk_set
+    for restaurant_id in list(restaurant_ids):
+        bump_catalog_version(restaurant_id)
+
+
+# ==================== INVALIDARE CACHE RESTAURANTE ====================
+@receiver(pre_save, sender=Restaurant)
+def remember_previous_restaurant_slug(sender, instance, **kwargs):
+    # Dacă slug-ul se schimbă, trebuie șters și cel vechi din cache
+    instance._previous_slug = None
+    if instance.pk:
+        instance._previous_slug = (
+            Restaurant.objects.filter(pk=instance.pk).values_list('slug', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+def invalidate_restaurant_cache(sender, instance, **kwargs):
+    invalidate_restaurant(instance.slug, getattr(instance, '_previous_slug', None))
+
+
+# ==================== MĂSURĂTORI SQL ====================
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    # Rămâne instalat pe conexiune; nu face nimic în afara cererilor eșantionate (vezi core.timing)
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
@@ -0,0 +1,56 @@
+// core/static/core/js/plan_stream.js
+// Formularele cu `data-stream-target` primesc planul în flux: fiecare bucată HTML
+// (rezumat, apoi zi cu zi) apare în țintă imediat ce sosește de la server.
+// Ascultătorul e pe `document`, după validarea din global.js: un submit oprit acolo
+// (`defaultPrevented`) nu mai pleacă la server.
+document.addEventListener('submit', async function (event) {
+    const form = event.target;
+    if (!form.matches('form[data-stream-target]') || event.defaultPrevented) return;
+    event.preventDefault();
+    if (!form.checkValidity()) {
+        form.classList.add('was-validated');
+        return;
+    }
+
+    const target = document.querySelector(form.dataset.streamTarget);
+    const loading = form.querySelector('.htmx-indicator');
+    const button = form.querySelector('[type="submit"]');
+    button.disabled = true;
+    loading?.classList.add('htmx-request');
+    target.innerHTML = '';
+
+    function hideLoading() {
+        if (!loading) return;
+        loading.classList.remove('htmx-request');
+        loading.style.display = '';  // global.js îl afișează la orice submit
+    }
+
+    try {
+        const response = await fetch(form.action, {
+            method: 'POST',
+            body: new FormData(form),
+            headers: {'X-Requested-With': 'XMLHttpRequest'},
+        });
+        if (!response.body) {  // browsere fără ReadableStream
+            target.innerHTML = await response.text();
+            return;
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let html = '';
+        for (;;) {
+            const {value, done} = await reader.read();
+            if (done) break;
+            html += decoder.decode(value, {stream: true});
+            target.innerHTML = html;
+            hideLoading();
+        }
+        target.innerHTML = html + decoder.decode();
+    } catch (error) {
+        target.innerHTML = '<div class="alert alert-danger">Planul nu a putut fi generat. Încearcă din nou.</div>';
+    } finally {
+        button.disabled = false;
+        hideLoading();
+    }
+});
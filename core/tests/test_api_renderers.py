@@ -0,0 +1,94 @@
+# core/tests/test_api_renderers.py
+import json
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from core.api.renderers import DISH_FIELDS, CompactPlanJSONRenderer, FastJSONRenderer, compact_plan_result
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, MacroRatio, Restaurant
+
+
+class RendererTests(SimpleTestCase):
+    def setUp(self):
+        self.result = {
+            'success': True, 'daily_calories': 2000, 'bmi': Decimal('22.5'),
+            'meals': {'Azi': {'Prânz': [
+                {'id': 3, 'name': 'Ciorbă\u2028', 'grams': 300, 'calories': 180, 'proteins': 9, 'carbs': 18,
+                 'fats': 6, 'is_past': False},
+            ]}},
+        }
+
+    def test_fast_renderer_matches_drf(self):
+        fast = FastJSONRenderer().render(self.result)
+        self.assertEqual(json.loads(fast), json.loads(JSONRenderer().render(self.result)))
+        self.assertIn(b'\\u2028', fast)
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_compact_format_lists_dish_values(self):
+        compact = compact_plan_result(self.result)
+
+        self.assertEqual(compact['dish_fields'], DISH_FIELDS)
+        self.assertEqual(compact['meals']['Azi']['Prânz'], [[3, 'Ciorbă\u2028', 300, 180, 9, 18, 6, False]])
+        self.assertEqual(compact['daily_calories'], 2000)
+        self.assertNotIn('dish_fields', self.result)  # originalul rămâne neschimbat
+        self.assertEqual(compact_plan_result({'detail': 'x'}), {'detail': 'x'})
+
+    def test_compact_renderer_handles_batches(self):
+        data = json.loads(CompactPlanJSONRenderer().render({'succeeded': 1, 'results': [self.result]}))
+        self.assertEqual(data['results'][0]['dish_fields'], DISH_FIELDS)
+
+
+class CompactPlanAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=User.objects.create_user('owner'))
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(6):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=120 + 10 * i, proteins=8, carbs=15, fats=5,
+                )
+        macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        self.profile = {'age': 30, 'gender': 'F', 'weight': 65, 'height': 168, 'activity_level': 'moderate',
+                        'macro_ratio': macro_ratio.pk, 'seed': 8}
+
+    def assert_same_plan(self, full, compact):
+        self.assertEqual(compact['dish_fields'], DISH_FIELDS)
+        self.assertEqual(compact['meals'], compact_plan_result(full)['meals'])
+        self.assertLess(len(json.dumps(compact['meals'])), len(json.dumps(full['meals'])))
+
+    def test_batch_api_compact_on_request(self):
+        url = reverse('api-generate-batch', args=[self.restaurant.slug])
+        full = self.client.post(url, [self.profile], content_type='application/json')
+        compact = self.client.post(url + '?format=compact', [self.profile], content_type='application/json')
+
+        self.assertEqual(full['Content-Type'], 'application/json')
+        self.assertEqual(compact['Content-Type'], CompactPlanJSONRenderer.media_type)
+        self.assert_same_plan(full.json()['results'][0], compact.json()['results'][0])
+
+    def test_async_api_compact_by_accept_header(self):
+        url = reverse('api-generate-async', args=[self.restaurant.slug])
+        full = self.client.post(url, self.profile, content_type='application/json')
+        compact = self.client.post(url, self.profile, content_type='application/json',
+                                   HTTP_ACCEPT=CompactPlanJSONRenderer.media_type)
+
+        self.assertEqual(compact['Content-Type'], CompactPlanJSONRenderer.media_type)
+        self.assert_same_plan(full.json(), compact.json())
+
+    def test_generate_api_under_restaurant_slug(self):
+        url = reverse('api-generate-plan', args=[self.restaurant.slug])
+        full = self.client.post(url, self.profile, content_type='application/json')
+        compact = self.client.post(url + '?format=compact', self.profile, content_type='application/json')
+
+        self.assertEqual(full.status_code, 200)
+        self.assert_same_plan(full.json(), compact.json())
+        missing = self.client.post(reverse('api-generate-plan', args=['nu-exista']), self.profile,
+                                   content_type='application/json')
+        self.assertEqual(missing.status_code, 404)
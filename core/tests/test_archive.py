@@ -0,0 +1,94 @@
+# core/tests/test_archive.py
+import io
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.archive import archive_meal_plans
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, MacroRatio, MealPlan, MealPlanArchive, Order, Restaurant
+from core.services import generate_meal_plan
+
+
+class ArchiveMealPlansTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.user = User.objects.create_user('client', password='parola')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=self.user)
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(6):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=120 + 10 * i, proteins=8, carbs=15, fats=5,
+                )
+        macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        data = {'age': 30, 'gender': 'F', 'weight': 65, 'height': 168, 'activity_level': 'moderate',
+                'macro_ratio': macro_ratio}
+        self.plans = [
+            MealPlan.objects.get(pk=generate_meal_plan(dict(data, seed=seed), user=self.user,
+                                                       restaurant=self.restaurant)['saved_plan_id'])
+            for seed in range(5)
+        ]
+        old = timezone.now() - timedelta(days=400)
+        MealPlan.objects.filter(pk__in=[plan.pk for plan in self.plans[:4]]).update(created_at=old)
+        self.cutoff = timezone.now() - timedelta(days=365)
+
+    def test_command_moves_old_plans_in_chunks(self):
+        Order.objects.create(user=self.user, restaurant=self.restaurant, meal_plan=self.plans[0],
+                             total_price=0, status='pending')
+        out = io.StringIO()
+        call_command('archive_mealplans', '--chunk-size', '2', stdout=out)
+
+        archived = [plan.pk for plan in self.plans[1:4]]
+        self.assertEqual(sorted(MealPlanArchive.objects.values_list('id', flat=True)), archived)
+        self.assertFalse(MealPlan.objects.filter(pk__in=archived).exists())
+        self.assertEqual(MealPlan.objects.filter(pk__in=[self.plans[0].pk, self.plans[4].pk]).count(), 2)
+        self.assertIn('3 planuri arhivate în 2 bucăți', out.getvalue())
+
+        entry = MealPlanArchive.objects.get(pk=self.plans[1].pk).to_meal_plan()
+        self.assertEqual(entry.user_snapshot, self.plans[1].user_snapshot)
+        self.assertEqual(entry.macro_ratio_id, self.plans[1].macro_ratio_id)
+
+    def test_dry_run_and_conflicts_leave_plans(self):
+        report = archive_meal_plans(self.cutoff, dry_run=True)
+        self.assertEqual(report.archived, 4)
+        self.assertEqual(MealPlanArchive.objects.count(), 0)
+
+        MealPlanArchive.objects.create(id=self.plans[2].pk, user=self.user, daily_calories=1, data={},
+                                       created_at=timezone.now())
+        report = archive_meal_plans(self.cutoff)
+        self.assertEqual((report.archived, report.conflicts), (3, [self.plans[2].pk]))
+        self.assertTrue(MealPlan.objects.filter(pk=self.plans[2].pk).exists())
+        self.assertEqual(MealPlanArchive.objects.get(pk=self.plans[2].pk).daily_calories, 1)
+
+    def test_compressed_field_round_trip(self):
+        archive_meal_plans(self.cutoff)
+        stored = MealPlanArchive.objects.get(pk=self.plans[1].pk)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT data FROM {MealPlanArchive._meta.db_table} WHERE id = %s', [stored.pk])
+            raw = bytes(cursor.fetchone()[0])
+        self.assertLess(len(raw), len(repr(stored.data)))
+        self.assertEqual(stored.data['user_snapshot'], self.plans[1].user_snapshot)
+        self.assertEqual(stored.data['dietary_constraints'], self.plans[1].dietary_constraints)
+
+    def test_archived_plan_detail_and_dashboard(self):
+        archive_meal_plans(self.cutoff)
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('view-plan', args=[self.restaurant.slug, self.plans[1].pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'{self.plans[1].daily_calories}')
+
+        dashboard = self.client.get(reverse('dashboard'), {'archived': '1'})
+        self.assertEqual([plan.pk for plan in dashboard.context['plans']],
+                         [plan.pk for plan in reversed(self.plans[:4])])
+        self.assertEqual(dashboard.context['total_archived'], 4)
@@ -0,0 +1,70 @@
+# core/tests/test_async_views.py
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, MacroRatio, MealPlan, Restaurant
+
+
+class AsyncGenerationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.user = User.objects.create_user('client', password='parola')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=self.user)
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(6):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=120 + 10 * i, proteins=8, carbs=15, fats=5,
+                )
+        self.macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        self.profile = {'age': 30, 'gender': 'F', 'weight': 65, 'height': 168, 'activity_level': 'moderate',
+                        'macro_ratio': self.macro_ratio.pk}
+
+    async def test_async_htmx_view_saves_plan_for_user(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(
+            reverse('generate-plan-async', args=[self.restaurant.slug]), self.profile
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(await MealPlan.objects.filter(user=self.user).acount(), 1)
+
+    async def test_async_api_reports_validation_errors(self):
+        response = await self.async_client.post(
+            reverse('api-generate-async', args=[self.restaurant.slug]), dict(self.profile, age=5),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('age', response.json())
+
+    async def test_async_htmx_view_reports_form_errors(self):
+        response = await self.async_client.post(
+            reverse('generate-plan-async', args=[self.restaurant.slug]), dict(self.profile, age=5)
+        )
+
+        self.assertContains(response, 'alert-danger')
+        self.assertEqual(await MealPlan.objects.acount(), 0)
+
+    async def test_async_api_matches_sync_format(self):
+        response = await self.async_client.post(
+            reverse('api-generate-async', args=[self.restaurant.slug]), self.profile,
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual(len(data['meals']), 7)
+        self.assertIsNone(data['saved_plan_id'])
+
+    async def test_async_api_unknown_restaurant(self):
+        response = await self.async_client.post(
+            reverse('api-generate-async', args=['nu-exista']), self.profile, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 404)
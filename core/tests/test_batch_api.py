@@ -0,0 +1,59 @@
+# core/tests/test_batch_api.py
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, MacroRatio, MealPlan, Restaurant
+
+
+class GenerateMealPlanBatchAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.user = User.objects.create_user('client', password='parola')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=self.user)
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(6):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=150 + 10 * i, proteins=10, carbs=15, fats=5,
+                )
+        self.macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        self.url = reverse('api-generate-batch', args=[self.restaurant.slug])
+
+    def profile(self, **fields):
+        data = {'gender': 'F', 'age': 30, 'weight': 65, 'height': 168, 'activity_level': 'moderate',
+                'macro_ratio': self.macro_ratio.pk}
+        data.update(fields)
+        return data
+
+    def test_results_keep_input_order_with_individual_errors(self):
+        items = [self.profile(), self.profile(macro_ratio=9999), self.profile(weight=90, gender='M')]
+        response = self.client.post(self.url, items, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['succeeded'], data['failed']), (2, 1))
+        self.assertEqual([result['index'] for result in data['results']], [0, 1, 2])
+        self.assertIn('macro_ratio', data['results'][1]['errors'])
+        self.assertFalse(data['results'][1]['success'])
+        self.assertGreater(data['results'][2]['daily_calories'], data['results'][0]['daily_calories'])
+        self.assertEqual(MealPlan.objects.count(), 0)  # anonim → nimic salvat
+
+    def test_authenticated_batch_saves_every_plan(self):
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, {'items': [self.profile(), self.profile(age=50)]},
+                                    content_type='application/json')
+
+        saved = [result['saved_plan_id'] for result in response.json()['results']]
+        self.assertEqual(set(MealPlan.objects.filter(user=self.user).values_list('id', flat=True)), set(saved))
+        self.assertEqual(len(saved), 2)
+
+    def test_invalid_payloads_are_rejected(self):
+        for payload in ([], {'items': 'x'}, {'alt': []}):
+            with self.subTest(payload=payload):
+                response = self.client.post(self.url, payload, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
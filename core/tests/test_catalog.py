@@ -0,0 +1,69 @@
+# core/tests/test_catalog.py
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.catalog import clear_catalogs, get_catalog, get_catalog_version
+from core.models import Dish, Restaurant
+
+
+class CatalogInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        owner = User.objects.create_user('owner')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=owner)
+        self.other = Restaurant.objects.create(name='Cantina', owner=owner)
+        self.dish = Dish.objects.create(
+            restaurant=self.restaurant, name='Ciorbă', meal_type='pranz',
+            calories=60, proteins=3, carbs=6, fats=2,
+        )
+
+    def dish_names(self, restaurant):
+        return {dish.name for dish in get_catalog(restaurant).available('pranz')}
+
+    def test_catalog_is_loaded_once(self):
+        self.assertEqual(self.dish_names(self.restaurant), {'Ciorbă'})
+        with self.assertNumQueries(0):
+            self.assertEqual(self.dish_names(self.restaurant), {'Ciorbă'})
+
+    def test_dish_changes_reload_catalog(self):
+        self.dish_names(self.restaurant)
+
+        self.dish.name = 'Ciorbă de legume'
+        self.dish.save()
+        self.assertEqual(self.dish_names(self.restaurant), {'Ciorbă de legume'})
+
+        self.dish.delete()
+        self.assertEqual(self.dish_names(self.restaurant), set())
+
+    def test_moved_dish_leaves_previous_catalog(self):
+        self.assertEqual(self.dish_names(self.restaurant), {'Ciorbă'})
+        self.assertEqual(self.dish_names(self.other), set())
+        version = get_catalog_version(self.restaurant)
+
+        dish = Dish.objects.get(pk=self.dish.pk)
+        dish.restaurant = self.other
+        dish.save()
+
+        self.assertGreater(get_catalog_version(self.restaurant), version)
+        self.assertEqual(self.dish_names(self.restaurant), set())
+        self.assertEqual(self.dish_names(self.other), {'Ciorbă'})
+
+    def test_save_does_not_read_previous_state(self):
+        dish = Dish.objects.get(pk=self.dish.pk)
+        dish.calories = 70
+        with self.assertNumQueries(1):  # doar UPDATE-ul
+            dish.save()
+
+    def test_default_dish_changes_reach_every_restaurant(self):
+        self.assertEqual(self.dish_names(self.other), set())
+        self.dish.is_default = True
+        self.dish.save()
+        self.assertEqual(self.dish_names(self.other), {'Ciorbă'})
+
+        dish = Dish.objects.get(pk=self.dish.pk)
+        dish.is_default = False
+        dish.save()
+        self.assertEqual(self.dish_names(self.other), set())
@@ -0,0 +1,58 @@
+# core/tests/test_dashboard.py
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import MacroRatio, MealPlan
+from core.views import DASHBOARD_PAGE_SIZE, decode_plan_cursor
+
+
+class DashboardPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('client', password='parola')
+        other = User.objects.create_user('altul')
+        macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        MealPlan.objects.bulk_create([
+            MealPlan(user=user, macro_ratio=macro_ratio, daily_calories=1500 + i, proteins=100, carbs=150,
+                     fats=50, fiber=25)
+            for user, count in [(self.user, 2 * DASHBOARD_PAGE_SIZE + 5), (other, 3)] for i in range(count)
+        ])
+        # Jumătate din planuri cu exact aceeași oră → departajarea după id contează
+        now = timezone.now()
+        for i, plan in enumerate(MealPlan.objects.filter(user=self.user).order_by('id')):
+            MealPlan.objects.filter(pk=plan.pk).update(created_at=now - timedelta(minutes=i // 2))
+        self.client.force_login(self.user)
+
+    def test_pages_cover_every_plan_once_newest_first(self):
+        seen, cursor, pages = [], None, 0
+        while True:
+            response = self.client.get(reverse('dashboard'), {'before': cursor} if cursor else {})
+            self.assertEqual(response.status_code, 200)
+            seen += response.context['plans']
+            cursor = response.context['next_cursor']
+            pages += 1
+            if cursor is None:
+                break
+
+        expected = list(MealPlan.objects.filter(user=self.user).order_by('-created_at', '-id'))
+        self.assertEqual([plan.pk for plan in seen], [plan.pk for plan in expected])
+        self.assertEqual(pages, 3)
+
+    def test_totals_only_on_first_page(self):
+        first = self.client.get(reverse('dashboard'))
+        self.assertEqual(first.context['total_plans'], 2 * DASHBOARD_PAGE_SIZE + 5)
+
+        second = self.client.get(reverse('dashboard'), {'before': first.context['next_cursor']})
+        self.assertNotIn('total_plans', second.context)
+        self.assertContains(second, 'Planuri mai vechi')
+
+    def test_invalid_cursor_shows_first_page(self):
+        self.assertIsNone(decode_plan_cursor('abc'))
+        response = self.client.get(reverse('dashboard'), {'before': 'abc'})
+        self.assertEqual(len(response.context['plans']), DASHBOARD_PAGE_SIZE)
+        self.assertTrue(response.context['is_first_page'])
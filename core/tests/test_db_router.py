@@ -0,0 +1,53 @@
+# core/tests/test_db_router.py
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from core import db_router
+from core.models import Dish
+
+
+@mock.patch('core.db_router.replica_configured', return_value=True)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = db_router.PrimaryReplicaRouter()
+
+    def test_reads_use_replica_only_when_marked(self, _configured):
+        self.assertEqual(self.router.db_for_read(Dish), 'default')
+        with db_router.replica_reads():
+            self.assertEqual(self.router.db_for_read(Dish), 'replica')
+            self.assertEqual(self.router.db_for_read(mock.Mock(_meta=mock.Mock(app_label='sessions'))), 'default')
+        self.assertEqual(self.router.db_for_read(Dish), 'default')
+
+    def test_write_pins_following_reads(self, _configured):
+        with db_router.replica_reads():
+            self.assertEqual(self.router.db_for_write(Dish), 'default')
+            self.assertEqual(self.router.db_for_read(Dish), 'default')
+
+    def test_middleware_pins_browser_after_write(self, _configured):
+        reads = []
+
+        def view(request):
+            with db_router.replica_reads():
+                reads.append(self.router.db_for_read(Dish))
+                if request.method == 'POST':
+                    self.router.db_for_write(Dish)
+            return HttpResponse()
+
+        middleware = db_router.ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+
+        self.assertNotIn(db_router.PIN_COOKIE, middleware(factory.get('/')).cookies)
+        response = middleware(factory.post('/'))
+        self.assertIn(db_router.PIN_COOKIE, response.cookies)
+
+        pinned = factory.get('/')
+        pinned.COOKIES[db_router.PIN_COOKIE] = '1'
+        middleware(pinned)
+        self.assertEqual(reads, ['replica', 'replica', 'default'])
+
+    def test_without_replica_everything_stays_on_primary(self, configured):
+        configured.return_value = False
+        with db_router.replica_reads():
+            self.assertEqual(self.router.db_for_read(Dish), 'default')
@@ -0,0 +1,64 @@
+# core/tests/test_dish_index.py
+import random
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.catalog import clear_catalogs, get_catalog
+from core.models import MEAL_TYPES, Allergen, Dish, Restaurant
+from core.services import get_available_dishes
+
+
+class DishIndexTests(TestCase):
+    """Filtrarea pe biți din catalog trebuie să dea exact felurile filtrate de ORM."""
+
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        owner = User.objects.create_user('owner')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=owner)
+        other = Restaurant.objects.create(name='Implicit', owner=owner)
+        self.allergens = [Allergen.objects.create(name=f'Alergen {i}') for i in range(4)]
+
+        rng = random.Random(42)
+        for restaurant, prefix, is_default in [(self.restaurant, 'Propriu', False), (other, 'Comun', True)]:
+            for i in range(60):
+                vegan = rng.random() < 0.3
+                dish = Dish.objects.create(
+                    restaurant=restaurant, name=f'{prefix} {i}', meal_type=rng.choice(MEAL_TYPES)[0],
+                    calories=150, proteins=10, carbs=15, fats=5, is_default=is_default,
+                    is_vegan=vegan, is_vegetarian=vegan or rng.random() < 0.4,
+                    is_gluten_free=rng.random() < 0.5, is_lactose_free=rng.random() < 0.5,
+                    is_active=rng.random() < 0.9,
+                )
+                dish.allergens.set(rng.sample(self.allergens, rng.randint(0, 2)))
+
+        # Un fel implicit exclus și unul înlocuit de un fel propriu cu același nume
+        excluded = Dish.objects.filter(restaurant=other, is_active=True).first()
+        self.restaurant.excluded_default_dishes.add(excluded)
+        replaced = Dish.objects.filter(restaurant=other, is_active=True).exclude(pk=excluded.pk).first()
+        Dish.objects.create(
+            restaurant=self.restaurant, name=replaced.name, meal_type=replaced.meal_type,
+            calories=150, proteins=10, carbs=15, fats=5,
+        )
+
+    def test_catalog_matches_orm_filters(self):
+        catalog = get_catalog(self.restaurant)
+        allergen_ids = [allergen.pk for allergen in self.allergens]
+        cases = [
+            {},
+            {'vegan': True},
+            {'vegetarian': True, 'gluten_free': True},
+            {'lactose_free': True, 'allergens': allergen_ids[:1]},
+            {'vegetarian': True, 'allergens': allergen_ids[1:3]},
+            {'allergens': allergen_ids},
+        ]
+        for constraints in cases:
+            for meal_type, _ in MEAL_TYPES:
+                with self.subTest(constraints=constraints, meal_type=meal_type):
+                    expected = set(get_available_dishes(meal_type, self.restaurant, constraints)
+                                   .values_list('id', flat=True))
+                    actual = {dish.id for dish in catalog.available(meal_type, constraints)}
+                    self.assertEqual(actual, expected)
@@ -0,0 +1,65 @@
+# core/tests/test_importers.py
+import io
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.catalog import DEFAULT_CATALOG, clear_catalogs, get_catalog_version
+from core.importers import import_dishes
+from core.models import Allergen, Dish, Restaurant
+
+
+class ImportDishesTests(TestCase):
+    HEADER = 'name,meal_type,calories,proteins,carbs,fats'
+
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.restaurant = Restaurant.objects.create(name='Import', owner=User.objects.create_user('owner'))
+        self.gluten = Allergen.objects.create(name='Gluten')
+
+    def run_import(self, text, fmt='csv'):
+        report = import_dishes(io.StringIO(text), self.restaurant, fmt=fmt)
+        self.assertEqual(report.failed, 0, report.errors)
+        return report
+
+    def test_upsert_updates_only_present_columns(self):
+        self.run_import(self.HEADER + ',price,is_default,is_active,allergens\n'
+                        'Ciorbă,pranz,60,3,6,2,2.50,1,0,Gluten\n')
+        self.run_import(self.HEADER + '\nCiorbă,pranz,70,3,6,2\nSalată,cina,40,2,5,1\n')
+
+        dish = Dish.objects.get(restaurant=self.restaurant, name='Ciorbă')
+        self.assertEqual(dish.calories, 70)
+        self.assertEqual(dish.price, Decimal('2.50'))
+        self.assertTrue(dish.is_default)
+        self.assertFalse(dish.is_active)
+        self.assertEqual(list(dish.allergens.all()), [self.gluten])
+        self.assertEqual(Dish.objects.filter(restaurant=self.restaurant).count(), 2)
+
+    def test_allergens_replaced_only_with_column(self):
+        self.run_import(self.HEADER + ',allergens\nPâine,mic_dejun,250,8,50,2,Gluten\n')
+        self.run_import(self.HEADER + '\nPâine,mic_dejun,260,8,50,2\n')
+        self.assertEqual(list(Dish.objects.get(name='Pâine').allergens.all()), [self.gluten])
+
+        self.run_import(self.HEADER + ',allergens\nPâine,mic_dejun,250,8,50,2,\n')
+        self.assertFalse(Dish.objects.get(name='Pâine').allergens.exists())
+
+    def test_invalid_rows_are_reported(self):
+        report = import_dishes(io.StringIO(self.HEADER + '\nBun,pranz,60,3,6,2\nRău,gustare_x,60,3,6,2\n'),
+                               self.restaurant)
+
+        self.assertEqual(report.failed, 1)
+        self.assertEqual(report.errors[0][0], 3)
+        self.assertTrue(Dish.objects.filter(name='Bun').exists())
+
+    def test_unsetting_default_bumps_default_catalog(self):
+        self.run_import(self.HEADER + ',is_default\nTocăniță,pranz,120,8,10,6,1\n')
+        version = get_catalog_version(DEFAULT_CATALOG)
+
+        self.run_import('{"name": "Tocăniță", "meal_type": "pranz", "calories": 120, "proteins": 8, '
+                        '"carbs": 10, "fats": 6, "is_default": false}\n', fmt='jsonl')
+        self.assertFalse(Dish.objects.get(name='Tocăniță').is_default)
+        self.assertGreater(get_catalog_version(DEFAULT_CATALOG), version)
@@ -0,0 +1,106 @@
+# core/tests/test_jobs.py
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import jobs
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, Job, MacroRatio, MealPlan, Restaurant
+from core.services import generate_meal_plan, hydrate_snapshot
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        registry = dict(jobs._registry)
+        self.addCleanup(lambda: (jobs._registry.clear(), jobs._registry.update(registry)))
+
+    def test_enqueue_is_idempotent(self):
+        first = jobs.enqueue('test_job', {'n': 1}, idempotency_key='cheie')
+        second = jobs.enqueue('test_job', {'n': 2}, idempotency_key='cheie')
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(second.payload, {'n': 1})
+
+    def test_failing_job_backs_off_then_fails(self):
+        @jobs.register_job('test_failing')
+        def failing(payload):
+            User.objects.create_user('nu-ramane')  # rulat în tranzacția sarcinii → anulat la eșec
+            raise RuntimeError('boom')
+
+        job = jobs.enqueue('test_failing', max_attempts=3)
+        with self.assertLogs('core.jobs', 'WARNING') as logs:
+            for attempt, delay in [(1, 5), (2, 10)]:
+                before = timezone.now()
+                self.assertFalse(jobs.run_job(job))
+                job.refresh_from_db()
+                self.assertEqual((job.status, job.attempts), ('pending', attempt))
+                self.assertGreaterEqual(job.run_after, before + timedelta(seconds=delay))
+                self.assertIn('boom', job.last_error)
+
+            self.assertFalse(jobs.run_job(job))
+        self.assertEqual(len(logs.output), 3)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 3))
+        self.assertIsNotNone(job.finished_at)
+        self.assertFalse(User.objects.filter(username='nu-ramane').exists())
+
+    def test_successful_job_and_pruning(self):
+        jobs.register_job('test_ok')(self.calls.append)
+        job = jobs.enqueue('test_ok', {'n': 1}, idempotency_key='ok')
+
+        self.assertEqual(jobs.dequeue(), [job])
+        self.assertTrue(jobs.run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(self.calls, [{'n': 1}])
+
+        self.assertEqual(jobs.prune_finished_jobs(), 0)
+        Job.objects.filter(pk=job.pk).update(finished_at=timezone.now() - timedelta(days=30))
+        self.assertEqual(jobs.prune_finished_jobs(), 1)
+        self.assertNotEqual(jobs.enqueue('test_ok', idempotency_key='ok').pk, job.pk)
+
+
+@override_settings(DEFER_PLAN_PERSISTENCE=True)
+class DeferredPlanPersistenceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.user = User.objects.create_user('client')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=self.user)
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(6):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=120 + 10 * i, proteins=8, carbs=15, fats=5,
+                )
+        macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        self.data = {'age': 30, 'gender': 'F', 'weight': 65, 'height': 168, 'activity_level': 'moderate',
+                     'macro_ratio': macro_ratio, 'seed': 9}
+
+    def test_plan_is_saved_by_worker_once(self):
+        result = generate_meal_plan(self.data, user=self.user, restaurant=self.restaurant)
+        generate_meal_plan(self.data, user=self.user, restaurant=self.restaurant)
+
+        self.assertTrue(result['saved_plan_pending'])
+        self.assertIsNone(result['saved_plan_id'])
+        self.assertEqual(MealPlan.objects.count(), 0)
+        self.assertEqual(Job.objects.filter(name='persist_meal_plan').count(), 1)
+
+        self.assertTrue(jobs.run_job(Job.objects.get()))
+        plan = MealPlan.objects.get(user=self.user)
+        self.assertEqual(hydrate_snapshot(plan.user_snapshot)['meals'], result['meals'])
+
+    def test_saved_plan_keeps_generation_time(self):
+        generated_at = timezone.now() - timedelta(minutes=5)  # worker-ul rulează mai târziu
+        with mock.patch('core.services.timezone.now', return_value=generated_at):
+            generate_meal_plan(self.data, user=self.user, restaurant=self.restaurant)
+
+        self.assertTrue(jobs.run_job(Job.objects.get()))
+        self.assertEqual(MealPlan.objects.get().created_at, generated_at)
@@ -0,0 +1,82 @@
+# core/tests/test_orders.py
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.catalog import clear_catalogs
+from core.forms import MealPlanForm
+from core.models import MEAL_TYPES, Dish, MacroRatio, MealPlan, OrderItem, Restaurant
+from core.orders import create_order_from_plan, portion_price
+from core.services import generate_meal_plan
+
+
+class OrderFromPlanTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.user = User.objects.create_user('client')
+        self.restaurant = Restaurant.objects.create(name='Cantina', owner=self.user)
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(6):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=150, proteins=10, carbs=15, fats=5, price=Decimal('3.35') + i,
+                )
+        macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        form = MealPlanForm({'age': 30, 'gender': 'F', 'weight': 65, 'height': 168,
+                             'activity_level': 'moderate', 'macro_ratio': macro_ratio.pk, 'seed': 5})
+        self.assertTrue(form.is_valid(), form.errors)
+        result = generate_meal_plan(form.cleaned_data, user=self.user, restaurant=self.restaurant)
+        self.plan = MealPlan.objects.get(pk=result['saved_plan_id'])
+
+    def expected_total(self, days=None):
+        dishes = Dish.objects.in_bulk()
+        snapshot = self.plan.user_snapshot
+        total = Decimal('0')
+        for day_idx, day_slots in enumerate(snapshot['slots']):
+            if days is not None and day_idx not in days:
+                continue
+            for meal_idx, entries in enumerate(day_slots):
+                if day_idx == 0 and meal_idx < snapshot['start_index']:
+                    continue
+                for dish_id, grams in entries:
+                    if dish_id is not None and grams:
+                        total += portion_price(dishes[dish_id], grams)
+        return total
+
+    def test_total_is_sum_of_portions(self):
+        order, items, skipped = create_order_from_plan(self.plan, self.restaurant)
+        order.refresh_from_db()
+
+        self.assertEqual(skipped, 0)
+        self.assertEqual(order.total_price, self.expected_total())
+        self.assertEqual(order.total_price, sum(item.price * item.quantity for item in items))
+        self.assertEqual(OrderItem.objects.filter(order=order).count(), len(items))
+
+    def test_selected_days_and_inactive_dishes(self):
+        day_slots = self.plan.user_snapshot['slots'][1]
+        dish_id = next(dish_id for entries in day_slots for dish_id, _ in entries if dish_id)
+        Dish.objects.filter(pk=dish_id).update(is_active=False)
+
+        order, _, skipped = create_order_from_plan(self.plan, self.restaurant, days=[1])
+        order.refresh_from_db()
+        self.assertGreater(skipped, 0)
+        self.assertEqual(order.total_price, self.expected_total(days=[1]) - sum(
+            portion_price(Dish.objects.get(pk=dish_id), grams)
+            for entries in day_slots for slot_id, grams in entries if slot_id == dish_id
+        ))
+
+    def test_api_orders_only_own_plans(self):
+        url = reverse('api-order-from-plan', args=[self.restaurant.slug, self.plan.pk])
+        self.client.force_login(self.user)
+        response = self.client.post(url, {'days': [0, 1]}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Decimal(response.json()['total_price']), self.expected_total(days={0, 1}))
+
+        self.client.force_login(User.objects.create_user('altul'))
+        response = self.client.post(url, {}, content_type='application/json')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,50 @@
+# core/tests/test_plan_cache.py
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core import services
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, MacroRatio, Restaurant
+
+
+class PlanSeedAndCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        owner = User.objects.create_user('owner')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=owner)
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(10):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=100 + 15 * i, proteins=5 + i, carbs=20, fats=4,
+                )
+        self.macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        self.data = {'age': 30, 'gender': 'F', 'weight': 65, 'height': 168, 'activity_level': 'moderate',
+                     'macro_ratio': self.macro_ratio}
+
+    def generate(self, **fields):
+        return services.generate_meal_plan(dict(self.data, **fields), restaurant=self.restaurant)['meals']
+
+    @override_settings(PLAN_RESULT_CACHE_TIMEOUT=0)
+    def test_same_seed_gives_same_plan(self):
+        self.assertEqual(self.generate(seed=11), self.generate(seed=11))
+        self.assertNotEqual(self.generate(seed=11), self.generate(seed=12))
+
+    def test_repeated_profile_comes_from_result_cache(self):
+        first = self.generate(seed=3)
+        with mock.patch.object(services, 'generate_weekly_meals') as generate:
+            self.assertEqual(self.generate(seed=3), first)
+        generate.assert_not_called()
+
+    def test_catalog_change_invalidates_cached_plan(self):
+        self.generate(seed=3)
+        Dish.objects.filter(meal_type='pranz').first().save()
+
+        with mock.patch.object(services, 'generate_weekly_meals', wraps=services.generate_weekly_meals) as generate:
+            self.generate(seed=3)
+        generate.assert_called_once()
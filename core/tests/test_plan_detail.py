@@ -0,0 +1,67 @@
+# core/tests/test_plan_detail.py
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, MacroRatio, MealPlan, Restaurant
+from core.services import generate_meal_plan
+
+
+class PlanDetailCachingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.user = User.objects.create_user('client', password='parola')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=self.user)
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(6):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=120 + 10 * i, proteins=8, carbs=15, fats=5,
+                )
+        macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        data = {'age': 30, 'gender': 'F', 'weight': 65, 'height': 168, 'activity_level': 'moderate',
+                'macro_ratio': macro_ratio, 'seed': 2}
+        plan_id = generate_meal_plan(data, user=self.user, restaurant=self.restaurant)['saved_plan_id']
+        self.plan = MealPlan.objects.get(pk=plan_id)
+        self.url = reverse('view-plan', args=[self.restaurant.slug, plan_id])
+        self.client.force_login(self.user)
+
+    def test_revalidation_returns_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+        revalidated = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
+
+        printed = self.client.get(self.url, {'print': '1'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(printed.status_code, 200)
+        self.assertNotEqual(printed['ETag'], response['ETag'])
+
+    def test_body_is_rendered_once(self):
+        first = self.client.get(self.url)
+        with mock.patch('core.views.render_to_string') as render_body:
+            second = self.client.get(self.url)
+        render_body.assert_not_called()
+        self.assertEqual(second.content, first.content)
+
+    def test_catalog_change_renews_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        dish = Dish.objects.filter(restaurant=self.restaurant).first()
+        dish.name = 'Fel redenumit'
+        dish.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_other_users_plan_is_not_found(self):
+        self.client.force_login(User.objects.create_user('altul'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
@@ -0,0 +1,94 @@
+# core/tests/test_plan_pool.py
+from itertools import count
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core import plan_pool
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, MacroRatio, Restaurant
+from core.services import MEAL_ORDER_DISPLAY, generate_meal_plan
+
+
+class InlineExecutor:
+    """Reumplerea rulează pe loc, nu într-un thread (testele rămân deterministe)."""
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@override_settings(PLAN_POOL_SIZE=2)
+class PlanPoolTests(SimpleTestCase):
+    def setUp(self):
+        plan_pool.clear_plan_pools()
+        self.addCleanup(plan_pool.clear_plan_pools)
+        patcher = mock.patch('core.plan_pool._get_executor', return_value=InlineExecutor())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.macro_ratio = MacroRatio(pk=1, name='Echilibrat', proteins=30, carbs=40, fats=30)
+        self.generate = count().__next__
+
+    def bucket(self, catalog_version=1):
+        return plan_pool.plan_bucket(7, catalog_version, {'vegan': False}, 2000, self.macro_ratio)
+
+    def test_first_request_fills_pool_for_next_ones(self):
+        self.assertIsNone(plan_pool.take_pooled_meals(self.bucket(), self.generate))
+        self.assertEqual(plan_pool.plan_pool_stats(), {'buckets': 1, 'plans': 2})
+
+        self.assertEqual(plan_pool.take_pooled_meals(self.bucket(), self.generate), 0)
+        self.assertEqual(plan_pool.take_pooled_meals(self.bucket(), self.generate), 1)
+        self.assertEqual(plan_pool.plan_pool_stats()['plans'], 2)
+
+    def test_catalog_change_drops_old_plans(self):
+        plan_pool.take_pooled_meals(self.bucket(), self.generate)
+
+        self.assertIsNone(plan_pool.take_pooled_meals(self.bucket(catalog_version=2), self.generate))
+        self.assertEqual(plan_pool.plan_pool_stats(), {'buckets': 1, 'plans': 2})
+        self.assertEqual(plan_pool.take_pooled_meals(self.bucket(catalog_version=2), self.generate), 2)
+
+    @override_settings(PLAN_POOL_SIZE=0)
+    def test_disabled_pool_returns_nothing(self):
+        self.assertIsNone(plan_pool.take_pooled_meals(self.bucket(), self.generate))
+        self.assertEqual(plan_pool.plan_pool_stats(), {'buckets': 0, 'plans': 0})
+
+
+@override_settings(PLAN_POOL_SIZE=2)
+class PooledPlanGenerationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        plan_pool.clear_plan_pools()
+        self.addCleanup(clear_catalogs)
+        self.addCleanup(plan_pool.clear_plan_pools)
+        patcher = mock.patch('core.plan_pool._get_executor', return_value=InlineExecutor())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=User.objects.create_user('owner'))
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(6):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=120 + 10 * i, proteins=8, carbs=15, fats=5,
+                )
+        macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        self.data = {'age': 30, 'gender': 'F', 'weight': 65, 'height': 168, 'activity_level': 'moderate',
+                     'macro_ratio': macro_ratio}
+
+    def test_unseeded_plans_come_from_pool_with_current_start(self):
+        start = (MEAL_ORDER_DISPLAY[2], 0, 'Azi')
+        generate_meal_plan(self.data, restaurant=self.restaurant)  # umple rezerva
+
+        with mock.patch('core.services.get_meal_start_info', return_value=start):
+            meals = generate_meal_plan(self.data, restaurant=self.restaurant)['meals']
+        self.assertEqual(plan_pool.plan_pool_stats()['plans'], 2)
+
+        today = meals['Azi']
+        for meal_name in MEAL_ORDER_DISPLAY[:2]:
+            self.assertTrue(today[meal_name][0]['is_past'])
+        self.assertFalse(today[MEAL_ORDER_DISPLAY[2]][0].get('is_past'))
+
+    def test_seeded_plans_skip_pool(self):
+        generate_meal_plan(dict(self.data, seed=4), restaurant=self.restaurant)
+        self.assertEqual(plan_pool.plan_pool_stats(), {'buckets': 0, 'plans': 0})
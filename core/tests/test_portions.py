@@ -0,0 +1,33 @@
+# core/tests/test_portions.py
+import random
+
+from django.test import SimpleTestCase
+
+from core.portions import MAX_PORTION_GRAMS, MIN_PORTION_GRAMS, PORTION_STEP_GRAMS, solve_portions
+
+
+class SolvePortionsTests(SimpleTestCase):
+    def test_exact_targets_are_recovered(self):
+        nutrients = [[200, 10, 20, 8], [120, 15, 5, 4]]
+        grams = [150, 250]
+        targets = [sum(row[i] * g / 100 for row, g in zip(nutrients, grams)) for i in range(4)]
+
+        self.assertEqual(list(solve_portions(nutrients, targets)), grams)
+
+    def test_portions_stay_within_bounds_and_steps(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            n = rng.randint(1, 3)
+            nutrients = [[rng.randint(20, 600), rng.randint(0, 40), rng.randint(0, 80), rng.randint(0, 40)]
+                         for _ in range(n)]
+            targets = [rng.randint(50, 2000), rng.randint(0, 120), rng.randint(0, 250), rng.randint(0, 90)]
+
+            for grams in solve_portions(nutrients, targets):
+                self.assertGreaterEqual(grams, MIN_PORTION_GRAMS)
+                self.assertLessEqual(grams, MAX_PORTION_GRAMS)
+                self.assertEqual(grams % PORTION_STEP_GRAMS, 0)
+
+    def test_unreachable_targets_clamp_to_limits(self):
+        nutrients = [[100, 5, 10, 3]]
+        self.assertEqual(list(solve_portions(nutrients, [5000, 250, 500, 150])), [MAX_PORTION_GRAMS])
+        self.assertEqual(list(solve_portions(nutrients, [1, 0, 0, 0])), [MIN_PORTION_GRAMS])
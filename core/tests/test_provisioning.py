@@ -0,0 +1,85 @@
+# core/tests/test_provisioning.py
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.models import Allergen, Dish, Restaurant, allocate_restaurant_slugs
+from core.provisioning import SLUG_ALLOCATION_ATTEMPTS, provision_restaurants
+from core.restaurants import resolve_restaurant
+
+
+class ProvisionRestaurantsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user('sef')
+        self.template = Restaurant.objects.create(name='Șablon', owner=owner)
+        gluten = Allergen.objects.create(name='Gluten')
+        for name in ('Ciorbă', 'Pâine'):
+            dish = Dish.objects.create(restaurant=self.template, name=name, meal_type='pranz',
+                                       calories=100, proteins=5, carbs=10, fats=3)
+            dish.allergens.add(gluten)
+        Dish.objects.create(restaurant=self.template, name='Comun', meal_type='cina', is_default=True,
+                            calories=100, proteins=5, carbs=10, fats=3)
+
+    def test_restaurants_owners_and_seed_dishes(self):
+        self.assertIsNone(resolve_restaurant('bistro-centru'))  # „inexistent” ținut în cache
+        rows = [(2, {'name': 'Bistro Centru', 'owner': 'ana', 'owner_email': 'ana@example.com'}),
+                (3, {'name': 'Bistro Nord', 'owner': 'ana', 'is_active': 'nu'}),
+                (4, {'name': 'Bistro Sud', 'owner': 'sef'})]
+        report = provision_restaurants(rows, template=self.template.slug)
+
+        self.assertEqual(report.errors, [])
+        self.assertEqual([r.slug for r in report.restaurants], ['bistro-centru', 'bistro-nord', 'bistro-sud'])
+        self.assertEqual(report.owners_created, 1)
+        self.assertFalse(Restaurant.objects.get(slug='bistro-nord').is_active)
+        self.assertEqual(report.dishes_seeded, 6)
+        copy = Dish.objects.get(restaurant__slug='bistro-sud', name='Pâine')
+        self.assertEqual([a.name for a in copy.allergens.all()], ['Gluten'])
+        self.assertFalse(Dish.objects.filter(restaurant__slug='bistro-sud', name='Comun').exists())
+        self.assertEqual(resolve_restaurant('bistro-centru').name, 'Bistro Centru')
+
+    def test_existing_names_are_rejected_case_insensitively(self):
+        Restaurant.objects.create(name='Bistro Vechi', owner=User.objects.get(username='sef'))
+        rows = [(2, {'name': 'BISTRO VECHI', 'owner': 'ana'}), (3, {'name': 'Nou', 'owner': 'ana'}),
+                (4, {'name': 'nou', 'owner': 'ana'}), (5, {'name': 'Altul'})]
+        report = provision_restaurants(rows)
+
+        self.assertEqual(sorted(line for line, _ in report.errors), [2, 4, 5])
+        self.assertEqual([r.name for r in report.restaurants], ['Nou'])
+
+    def test_slug_collision_gets_suffix(self):
+        Restaurant.objects.create(name='Bistro!', owner=User.objects.get(username='sef'))
+        report = provision_restaurants([(2, {'name': 'Bistro?', 'owner': 'sef'})])
+        self.assertEqual(report.restaurants[0].slug, 'bistro-1')
+
+    def test_concurrent_slug_is_reallocated(self):
+        taken = allocate_restaurant_slugs(['Bistro'])
+        Restaurant.objects.create(name='Bistro vechi', slug=taken[0], owner=User.objects.get(username='sef'))
+        stale = mock.patch('core.provisioning.allocate_restaurant_slugs',
+                           side_effect=[taken, allocate_restaurant_slugs(['Bistro'])])
+        with stale:
+            report = provision_restaurants([(2, {'name': 'Bistro', 'owner': 'sef'})])
+
+        self.assertEqual(report.errors, [])
+        self.assertEqual(report.restaurants[0].slug, 'bistro-1')
+
+    def test_slug_allocation_gives_up_without_writing(self):
+        Restaurant.objects.create(name='Bistro vechi', slug='bistro', owner=User.objects.get(username='sef'))
+        stale = mock.patch('core.provisioning.allocate_restaurant_slugs', return_value=['bistro'])
+        with stale as allocate:
+            report = provision_restaurants([(2, {'name': 'Bistro', 'owner': 'nou'})])
+
+        self.assertEqual(allocate.call_count, SLUG_ALLOCATION_ATTEMPTS)
+        self.assertEqual(len(report.errors), 1)
+        self.assertEqual(report.owners_created, 0)
+        self.assertFalse(User.objects.filter(username='nou').exists())
+
+    def test_dry_run_writes_nothing(self):
+        report = provision_restaurants([(2, {'name': 'Bistro', 'owner': 'nou'})], template=self.template.slug,
+                                       dry_run=True)
+
+        self.assertEqual(len(report.restaurants), 1)
+        self.assertFalse(Restaurant.objects.filter(name='Bistro').exists())
+        self.assertFalse(User.objects.filter(username='nou').exists())
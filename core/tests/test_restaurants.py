@@ -0,0 +1,47 @@
+# core/tests/test_restaurants.py
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.models import Restaurant
+from core.restaurants import get_restaurant_directory, resolve_restaurant
+
+
+class RestaurantResolverTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user('owner')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=self.owner)
+
+    def test_slug_is_resolved_from_cache(self):
+        self.assertEqual(resolve_restaurant('bistro'), self.restaurant)
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_restaurant('bistro'), self.restaurant)
+            self.assertIsNone(resolve_restaurant(''))
+
+    def test_missing_slug_is_cached_until_created(self):
+        self.assertIsNone(resolve_restaurant('cantina'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(resolve_restaurant('cantina'))
+
+        restaurant = Restaurant.objects.create(name='Cantina', owner=self.owner)
+        self.assertEqual(resolve_restaurant('cantina'), restaurant)
+
+    def test_save_and_delete_invalidate_entries(self):
+        resolve_restaurant('bistro')
+        self.assertEqual(get_restaurant_directory(), [self.restaurant])
+
+        self.restaurant.is_active = False
+        self.restaurant.save()
+        self.assertIsNone(resolve_restaurant('bistro'))
+        self.assertEqual(get_restaurant_directory(), [])
+
+        self.restaurant.is_active = True
+        self.restaurant.slug = 'bistro-nou'
+        self.restaurant.save()
+        self.assertIsNone(resolve_restaurant('bistro'))
+        self.assertEqual(resolve_restaurant('bistro-nou').name, 'Bistro')
+
+        self.restaurant.delete()
+        self.assertIsNone(resolve_restaurant('bistro-nou'))
+        self.assertEqual(get_restaurant_directory(), [])
@@ -0,0 +1,63 @@
+# core/tests/test_rotation.py
+import random
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, Restaurant
+from core.rotation import DishRotation
+from core.services import generate_weekly_meals
+
+
+class DishRotationTests(SimpleTestCase):
+    def test_no_repeat_within_cooldown(self):
+        rotation = DishRotation(range(20), cooldown_days=3, rng=random.Random(1))
+        last_seen = {}
+        for day in range(30):
+            picked = rotation.take(day, 3)
+            self.assertEqual(len(picked), len(set(picked)))
+            for dish in picked:
+                if dish in last_seen:
+                    self.assertGreater(day - last_seen[dish], 3)
+                last_seen[dish] = day
+            rotation.cool(day, picked)
+        self.assertEqual(len(rotation), 20)
+
+    def test_small_pool_releases_oldest_early(self):
+        rotation = DishRotation(range(2), cooldown_days=5, rng=random.Random(1))
+        for day in range(4):
+            picked = rotation.take(day, 2)
+            self.assertEqual(len(picked), 2)
+            rotation.cool(day, picked)
+
+
+class MultiWeekPlanTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.restaurant = Restaurant.objects.create(name='Rotație', owner=User.objects.create_user('owner'))
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(20):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=150, proteins=10, carbs=15, fats=5,
+                )
+
+    @override_settings(PLAN_ROTATION_COOLDOWN_DAYS=3)
+    def test_plan_respects_cooldown(self):
+        meals = generate_weekly_meals(2000, 150, 200, 60, self.restaurant, {}, seed=3,
+                                      start_info=('Mic Dejun', 0, 'Azi'), weeks=2)
+
+        self.assertEqual(len(meals), 14)
+        self.assertEqual(len(set(meals)), 14)  # etichete unice și după prima săptămână
+        last_seen = {}
+        for day_idx, day_meals in enumerate(meals.values()):
+            for meal_name, dishes in day_meals.items():
+                for dish in dishes:
+                    key = (meal_name, dish['id'])
+                    if key in last_seen:
+                        self.assertGreater(day_idx - last_seen[key], 3, key)
+                    last_seen[key] = day_idx
@@ -0,0 +1,62 @@
+# core/tests/test_snapshot.py
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, MacroRatio, MealPlan, Restaurant
+from core.services import SNAPSHOT_FORMAT, generate_meal_plan, hydrate_snapshot
+
+
+class CompactSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.user = User.objects.create_user('client', password='parola')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=self.user)
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(6):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=120 + 10 * i, proteins=8, carbs=15, fats=5,
+                )
+        self.macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        data = {'age': 30, 'gender': 'F', 'weight': 65, 'height': 168, 'activity_level': 'moderate',
+                'macro_ratio': self.macro_ratio, 'seed': 1}
+        self.result = generate_meal_plan(data, user=self.user, restaurant=self.restaurant)
+        self.plan = MealPlan.objects.get(pk=self.result['saved_plan_id'])
+
+    def test_snapshot_stores_only_ids_and_grams(self):
+        snapshot = self.plan.user_snapshot
+        self.assertEqual(snapshot['format'], SNAPSHOT_FORMAT)
+        self.assertNotIn('meals', snapshot)
+        for day_slots in snapshot['slots']:
+            for entries in day_slots:
+                for dish_id, grams in entries:
+                    self.assertIsInstance(dish_id, int)
+                    self.assertIsInstance(grams, int)
+
+    def test_hydrate_rebuilds_generated_meals(self):
+        hydrated = hydrate_snapshot(self.plan.user_snapshot)
+
+        self.assertEqual(hydrated['meals'], self.result['meals'])
+        self.assertEqual(hydrated['daily_calories'], self.result['daily_calories'])
+
+    def test_hydrate_keeps_deactivated_dishes(self):
+        Dish.objects.update(is_active=False)
+
+        hydrated = hydrate_snapshot(self.plan.user_snapshot)
+        self.assertEqual(hydrated['meals'], self.result['meals'])
+
+    def test_legacy_snapshot_is_returned_unchanged(self):
+        legacy = {'daily_calories': 1800, 'meals': {'Luni': {'Prânz': [{'name': 'Ciorbă veche', 'grams': 300}]}},
+                  'restaurant_id': self.restaurant.id, 'restaurant_name': self.restaurant.name}
+        self.assertEqual(hydrate_snapshot(legacy), legacy)
+        self.assertEqual(hydrate_snapshot(None), {})
+
+        MealPlan.objects.filter(pk=self.plan.pk).update(user_snapshot=legacy)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('view-plan', args=[self.restaurant.slug, self.plan.pk]))
+        self.assertContains(response, 'Ciorbă veche')
@@ -0,0 +1,54 @@
+# core/tests/test_streaming.py
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.catalog import clear_catalogs
+from core.models import MEAL_TYPES, Dish, MacroRatio, MealPlan, Restaurant
+from core.services import hydrate_snapshot, stream_meal_plan
+
+
+class PlanStreamTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_catalogs()
+        self.addCleanup(clear_catalogs)
+        self.user = User.objects.create_user('client', password='parola')
+        self.restaurant = Restaurant.objects.create(name='Bistro', owner=self.user)
+        for meal_type, _ in MEAL_TYPES:
+            for i in range(6):
+                Dish.objects.create(
+                    restaurant=self.restaurant, name=f'{meal_type} {i}', meal_type=meal_type,
+                    calories=120 + 10 * i, proteins=8, carbs=15, fats=5,
+                )
+        self.macro_ratio = MacroRatio.objects.create(name='Echilibrat', proteins=30, carbs=40, fats=30)
+        self.profile = {'age': 30, 'gender': 'F', 'weight': 65, 'height': 168, 'activity_level': 'moderate',
+                        'macro_ratio': self.macro_ratio.pk, 'seed': 6}
+
+    def test_events_arrive_day_by_day(self):
+        data = dict(self.profile, macro_ratio=self.macro_ratio)
+        events = list(stream_meal_plan(data, user=self.user, restaurant=self.restaurant))
+
+        self.assertEqual([event[0] for event in events], ['summary'] + ['day'] * 7 + ['done'])
+        result = events[-1][1]
+        self.assertEqual(list(result['meals']), [event[1] for event in events[1:-1]])
+        plan = MealPlan.objects.get(pk=result['saved_plan_id'])
+        self.assertEqual(hydrate_snapshot(plan.user_snapshot)['meals'], result['meals'])
+
+    def test_view_streams_one_chunk_per_event(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('generate-plan-stream', args=[self.restaurant.slug]), self.profile)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 9)
+        self.assertEqual(MealPlan.objects.filter(user=self.user).count(), 1)
+
+    def test_invalid_form_is_not_streamed(self):
+        response = self.client.post(reverse('generate-plan-stream', args=[self.restaurant.slug]),
+                                    dict(self.profile, weight=5))
+
+        self.assertFalse(response.streaming)
+        self.assertContains(response, 'alert-danger')
@@ -0,0 +1,42 @@
+# core/tests/test_timing.py
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.models import Restaurant
+from core.timing import current_metrics, phase
+
+
+class ServerTimingMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Restaurant.objects.create(name='Bistro', owner=User.objects.create_user('owner'))
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_sampled_request_gets_header_and_log_line(self):
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            response = self.client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        header = response['Server-Timing']
+        self.assertTrue(header.startswith('sql;dur='))
+        self.assertIn('render;dur=', header)
+        self.assertIn('total;dur=', header)
+
+        entry = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((entry['method'], entry['path'], entry['status']), ('GET', '/', 200))
+        self.assertGreater(entry['queries'], 0)
+        self.assertLessEqual(len(entry['slow_queries']), 3)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_request_is_not_measured(self):
+        response = self.client.get('/')
+        self.assertNotIn('Server-Timing', response)
+
+    def test_phase_outside_request_is_a_no_op(self):
+        self.assertIsNone(current_metrics())
+        with phase('select'):
+            pass
+        self.assertIsNone(current_metrics())
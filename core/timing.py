@@ -0,0 +1,96 @@
+# core/timing.py
+"""
+Măsurători per cerere: interogări SQL, timp în SQL, cele mai lente interogări
+și timpul petrecut în fazele serviciului de generare.
+
+`ServerTimingMiddleware` (core.middleware) pornește o colectare pentru cererile
+eșantionate; în rest `phase()` și înregistrarea interogărilor nu fac aproape nimic.
+Colectarea curentă stă într-un ContextVar, deci ajunge și în codul rulat prin
+`sync_to_async` (view-urile async).
+"""
+import heapq
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('nutriplan_request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self, slow_query_limit=3):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_seconds = 0.0
+        self.phases = {}
+        self.slow_query_limit = slow_query_limit
+        self._slow = []  # min-heap de (durată, ordine, sql)
+
+    def add_query(self, sql, seconds):
+        self.query_count += 1
+        self.sql_seconds += seconds
+        if self.slow_query_limit:
+            entry = (seconds, self.query_count, sql)
+            if len(self._slow) < self.slow_query_limit:
+                heapq.heappush(self._slow, entry)
+            elif seconds > self._slow[0][0]:
+                heapq.heapreplace(self._slow, entry)
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @property
+    def slow_queries(self):
+        return [
+            {'sql': sql[:500], 'ms': round(seconds * 1000, 3)}
+            for seconds, _, sql in sorted(self._slow, reverse=True)
+        ]
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def start_request_metrics(slow_query_limit=3):
+    metrics = RequestMetrics(slow_query_limit)
+    return metrics, _current.set(metrics)
+
+
+def stop_request_metrics(token):
+    _current.reset(token)
+
+
+def current_metrics():
+    return _current.get()
+
+
+@contextmanager
+def _timed_phase(metrics, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_phase(name, time.perf_counter() - start)
+
+
+@contextmanager
+def _no_phase():
+    yield
+
+
+def phase(name):
+    """`with phase('select'):` – adună timpul blocului la faza `name` (dacă cererea e eșantionată)."""
+    metrics = _current.get()
+    if metrics is None:
+        return _no_phase()
+    return _timed_phase(metrics, name)
+
+
+def record_query(execute, sql, params, many, context):
+    """`execute_wrapper` instalat pe fiecare conexiune (vezi core.signals)."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(sql, time.perf_counter() - start)
@@ -12,6 +12,8 @@ urlpatterns = [
 
     # Alte rute specifice restaurantului
     path('generate-plan/', views.generate_plan_htmx, name='generate-plan'),
+    path('generate-plan/async/', views.generate_plan_htmx_async, name='generate-plan-async'),
+    path('generate-plan/stream/', views.generate_plan_stream, name='generate-plan-stream'),
     path('plan/<int:plan_id>/', views.plan_detail_view, name='view-plan'),
 
     # Dacă mai ai alte rute specifice (ex. alimente, meniu etc.), le pui aici
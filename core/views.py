@@ -1,29 +1,45 @@
-
 # core/views.py
-from django.shortcuts import render, redirect, get_object_or_404
+import calendar
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect
 from django.contrib.auth import login, logout
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import TemplateView, CreateView, FormView, ListView
 from django.urls import reverse_lazy
-from django.http import HttpResponse, HttpResponseNotFound
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import F, Q
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
+from django.utils.safestring import mark_safe
+from django.http import Http404, HttpResponse, HttpResponseNotFound, StreamingHttpResponse
 from django.template.loader import render_to_string
+from django.utils.functional import SimpleLazyObject
 
-from .models import MealPlan, MacroRatio, Restaurant, Allergen
+from .models import MealPlan, MealPlanArchive, MacroRatio, Restaurant, Allergen
 from .forms import MealPlanForm
-from core.services import generate_meal_plan
+from .restaurants import aresolve_restaurant, get_restaurant_directory, resolve_restaurant
+from core.catalog import get_merged_catalog_version
+from core.db_router import pin_response_to_primary, use_replica
+from core.services import generate_meal_plan, agenerate_meal_plan, hydrate_snapshot, stream_meal_plan
+from core.timing import phase
 
+@method_decorator(use_replica, name='dispatch')
 class RestaurantListView(ListView):
     model = Restaurant
     template_name = 'core/restaurant_list.html'  # numele template-ului tău pentru lista de restaurante
     context_object_name = 'restaurants'
-    
-    # Opțional: doar restaurantele active/publicate
-    queryset = Restaurant.objects.filter(is_active=True)  # ajustează după nevoile tale
-    
-    # Opțional: ordonare
-    ordering = ['name']  # sau ['order', 'name'] etc.
+
+    def get_queryset(self):
+        # Restaurantele active, ordonate după nume – din cache (vezi core.restaurants)
+        return get_restaurant_directory()
 
 class LandingHomeView(TemplateView):
     template_name = 'core/home.html'
@@ -32,7 +48,7 @@ class LandingHomeView(TemplateView):
         context = super().get_context_data(**kwargs)
         context['macro_ratios'] = MacroRatio.objects.all().order_by('name')
         context['allergens'] = Allergen.objects.all().order_by('name')
-        context['restaurants'] = Restaurant.objects.filter(is_active=True).order_by('name')
+        context['restaurants'] = get_restaurant_directory()
         context['restaurant'] = None  # important – să nu creadă că e într-un restaurant
         return context
 # ==================== MIXIN PENTRU RESTAURANT ====================
@@ -45,9 +61,8 @@ class RestaurantRequiredMixin:
         if not restaurant_slug:
             return HttpResponseNotFound("Restaurant negăsit.")
 
-        try:
-            restaurant = Restaurant.objects.get(slug=restaurant_slug, is_active=True)
-        except Restaurant.DoesNotExist:
+        restaurant = resolve_restaurant(restaurant_slug)
+        if restaurant is None:
             return HttpResponseNotFound("Restaurantul nu există sau nu este activ.")
 
         request.current_restaurant = restaurant
@@ -69,17 +84,17 @@ class HomeView(RestaurantRequiredMixin, TemplateView):
 
         # Dacă nu suntem pe un restaurant specific (ex: landing page)
         if not context['restaurant']:
-            context['restaurants'] = Restaurant.objects.filter(is_active=True).order_by('name')
+            context['restaurants'] = get_restaurant_directory()
 
         return context
 
 
 # ==================== GENERARE PLAN HTMX ====================
-def generate_plan_htmx(request):
+def generate_plan_htmx(request, restaurant_slug=None):
     if request.method != "POST":
         return HttpResponse('')
 
-    restaurant = getattr(request, 'current_restaurant', None)
+    restaurant = getattr(request, 'current_restaurant', None) or resolve_restaurant(restaurant_slug)
     if not restaurant:
         return HttpResponse("Restaurant negăsit.", status=400)
 
@@ -99,54 +114,293 @@ def generate_plan_htmx(request):
 
     template = 'core/partials/plan_saved.html' if request.user.is_authenticated else 'core/partials/plan_generated.html'
 
-    html = render_to_string(template, {
-        'plan_data': plan_data,
-        'restaurant': restaurant,
-        'user': request.user
-    }, request=request)
+    with phase('render'):
+        html = render_to_string(template, {
+            'plan_data': plan_data,
+            'restaurant': restaurant,
+            'user': request.user
+        }, request=request)
+
+    return HttpResponse(html)
+
+
+# ==================== GENERARE PLAN ÎN FLUX ====================
+def generate_plan_stream(request, restaurant_slug=None):
+    """
+    Ca `generate_plan_htmx`, dar răspunsul e trimis pe bucăți: rezumatul imediat,
+    apoi fiecare zi cât e generată (azi, cu mesele rămase, prima), iar la final
+    confirmarea salvării. Primul byte nu mai așteaptă toată săptămâna.
+
+    Sub ASGI corpul e un generator async (fiecare bucată calculată prin
+    `sync_to_async`): un iterator sincron ar fi citit complet de Django înainte
+    de trimitere, deci fără niciun câștig la primul byte.
+    """
+    if request.method != "POST":
+        return HttpResponse('')
+
+    restaurant = resolve_restaurant(restaurant_slug)
+    if not restaurant:
+        return HttpResponse("Restaurant negăsit.", status=400)
+
+    form = MealPlanForm(request.POST)
+    if not form.is_valid():
+        html = render_to_string('core/partials/form_errors.html', {'form': form}, request=request)
+        return HttpResponse(html)
+
+    user = request.user if request.user.is_authenticated else None
+    events = stream_meal_plan(form.cleaned_data, user=user, restaurant=restaurant)
+    final_template = 'core/partials/plan_saved.html' if user else 'core/partials/plan_generated.html'
+
+    def render_next():
+        """Următoarea bucată HTML (None la final)."""
+        event = next(events, None)
+        if event is None:
+            return None
+        if event[0] == 'summary':
+            return render_to_string('core/partials/plan_stream_start.html', {'plan_data': event[1]}, request=request)
+        if event[0] == 'day':
+            return render_to_string('core/partials/plan_day.html', {
+                'day_name': event[1],
+                'day_meals': event[2],
+            }, request=request)
+        return render_to_string(final_template, {
+            'plan_data': event[1],
+            'restaurant': restaurant,
+            'user': request.user,
+        }, request=request)
+
+    async def arender_events():
+        anext_chunk = sync_to_async(render_next)
+        while (chunk := await anext_chunk()) is not None:
+            yield chunk
+
+    body = arender_events() if isinstance(request, ASGIRequest) else iter(render_next, None)
+    response = StreamingHttpResponse(body, content_type='text/html; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: nu ține bucățile în buffer
+    if user:
+        # Planul se salvează după ce middleware-ul a terminat → fixăm citirile următoare de aici
+        pin_response_to_primary(response)
+    return response
+
+
+# ==================== GENERARE PLAN HTMX (ASYNC) ====================
+async def generate_plan_htmx_async(request, restaurant_slug=None):
+    """
+    Varianta async a `generate_plan_htmx`, pentru servire sub ASGI: worker-ul
+    nu mai stă blocat cât timp se încarcă catalogul sau se salvează planul.
+    """
+    if request.method != "POST":
+        return HttpResponse('')
+
+    restaurant = await aresolve_restaurant(restaurant_slug)
+    if restaurant is None:
+        return HttpResponse("Restaurant negăsit.", status=400)
+    request.current_restaurant = restaurant
+
+    user = await request.auser()
+    form = MealPlanForm(request.POST)
+    # Validarea face interogări (MacroRatio / Allergen) → în thread-ul sincron
+    if not await sync_to_async(form.is_valid)():
+        html = await sync_to_async(render_to_string)(
+            'core/partials/form_errors.html', {'form': form}, request=request
+        )
+        return HttpResponse(html)
+
+    plan_data = await agenerate_meal_plan(
+        data=form.cleaned_data,
+        user=user if user.is_authenticated else None,
+        restaurant=restaurant
+    )
+
+    template = 'core/partials/plan_saved.html' if user.is_authenticated else 'core/partials/plan_generated.html'
+
+    with phase('render'):
+        html = await sync_to_async(render_to_string)(template, {
+            'plan_data': plan_data,
+            'restaurant': restaurant,
+            'user': user
+        }, request=request)
 
     return HttpResponse(html)
 
 
 # ==================== DASHBOARD ====================
-class DashboardView(LoginRequiredMixin, ListView):
+DASHBOARD_PAGE_SIZE = 12
+DEFAULT_RESTAURANT_SLUG = 'alimente-default'  # linkurile spre plan când dashboard-ul nu e al unui restaurant
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_plan_cursor(plan):
+    """Cursorul paginii următoare: `<created_at în microsecunde>.<id>` (exact, fără float)."""
+    return f"{(plan.created_at - _EPOCH) // timedelta(microseconds=1)}.{plan.pk}"
+
+
+def decode_plan_cursor(cursor):
+    try:
+        micros, pk = cursor.split('.')
+        return _EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+@method_decorator(use_replica, name='dispatch')
+class DashboardView(LoginRequiredMixin, TemplateView):
+    """
+    Planurile userului, paginate keyset pe (created_at, id) prin `?before=<cursor>`:
+    fiecare pagină e o interogare pe indexul (user, -created_at), oricâte planuri ar avea userul.
+    Snapshot-ul (mare) nu se încarcă – cardurile nu îl folosesc. Totalurile din antet
+    (câte un COUNT) se calculează doar pe prima pagină.
+
+    Cu `?archived=1` lista vine din `MealPlanArchive` (planurile mutate de
+    `archive_mealplans`), cu aceeași paginare și aceleași carduri.
+    """
     template_name = 'core/dashboard.html'
-    context_object_name = 'plans'
-    paginate_by = 12
+    page_size = DASHBOARD_PAGE_SIZE
+
+    @property
+    def archived(self):
+        return self.request.GET.get('archived') == '1'
 
     def get_queryset(self):
-        return MealPlan.objects.filter(user=self.request.user).order_by('-created_at')
+        if self.archived:
+            return (
+                MealPlanArchive.objects.filter(user=self.request.user)
+                .select_related('macro_ratio')
+                .order_by('-created_at', '-id')
+            )
+        return (
+            MealPlan.objects.filter(user=self.request.user)
+            .select_related('macro_ratio')
+            .defer('user_snapshot', 'dietary_constraints')
+            .order_by('-created_at', '-id')
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['total_plans'] = self.get_queryset().count()
-        context['restaurant'] = getattr(self.request, 'current_restaurant', None)
+        queryset = self.get_queryset()
+        cursor = decode_plan_cursor(self.request.GET.get('before'))
+        if cursor:
+            created_at, pk = cursor
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+        plans = list(queryset[:self.page_size + 1])
+        has_next = len(plans) > self.page_size
+        plans = plans[:self.page_size]
+        if self.archived:
+            plans = [archived.to_meal_plan() for archived in plans]
+
+        restaurant = getattr(self.request, 'current_restaurant', None) or resolve_restaurant(
+            self.kwargs.get('restaurant_slug')
+        )
+        if cursor is None:
+            context.update({
+                'total_plans': MealPlan.objects.filter(user=self.request.user).count(),
+                'total_archived': MealPlanArchive.objects.filter(user=self.request.user).count(),
+            })
+        context.update({
+            'plans': plans,
+            'archived': self.archived,
+            'page_query': 'archived=1&' if self.archived else '',
+            'next_cursor': encode_plan_cursor(plans[-1]) if has_next else None,
+            'is_first_page': cursor is None,
+            'restaurant': restaurant,
+            'plan_restaurant_slug': restaurant.slug if restaurant else DEFAULT_RESTAURANT_SLUG,
+        })
         return context
 
 
 # ==================== PLAN DETAIL ====================
+PLAN_DETAIL_BODY_KEY = 'plan_detail:{template_version}:{plan_id}:{catalog_version}'
+PLAN_DETAIL_TEMPLATE_VERSION = 1  # crește la schimbarea template-urilor → ETag-uri și cache noi
+
+
+def _plan_detail_timeout():
+    return getattr(settings, 'PLAN_DETAIL_CACHE_TIMEOUT', 3600)
+
+
+def _plan_meta(user, plan_id):
+    """Ce trebuie pentru ETag, fără snapshot: din `MealPlan` sau, dacă planul a fost arhivat, din arhivă."""
+    meta = (
+        MealPlan.objects.filter(id=plan_id, user=user)
+        .values('created_at', 'daily_calories', snapshot_restaurant=F('user_snapshot__restaurant_id'))
+        .first()
+    )
+    if meta is None:
+        meta = (
+            MealPlanArchive.objects.filter(id=plan_id, user=user)
+            .values('created_at', 'daily_calories', snapshot_restaurant=F('snapshot_restaurant_id'))
+            .first()
+        )
+        if meta is not None:
+            meta['archived'] = True
+    return meta
+
+
 @login_required
+@use_replica
 def plan_detail_view(request, restaurant_slug, plan_id):
+    """
+    Planurile salvate nu se mai schimbă: corpul paginii e randat o dată per plan
+    (același pentru ecran și print – doar pagina din jur diferă, deci ETag-ul
+    rămâne per mod) și ținut în cache, iar răspunsul are ETag / Last-Modified,
+    deci o revenire pe pagină (sau reîncărcarea pentru print) primește 304.
+    Snapshot-urile compacte depind de catalog → versiunea lui intră în cheie și în ETag.
+    Planurile mutate de `archive_mealplans` se citesc din `MealPlanArchive`.
+    """
     # Validăm restaurantul (opțional, pentru securitate)
-    restaurant = get_object_or_404(Restaurant, slug=restaurant_slug, is_active=True)
-    
-    # Validăm planul (doar al userului curent)
-    plan = get_object_or_404(MealPlan, id=plan_id, user=request.user)
-
-    # Datele planului (din snapshot sau regenerate)
-    plan_data = plan.user_snapshot or {}
+    restaurant = resolve_restaurant(restaurant_slug)
+    if restaurant is None:
+        raise Http404("Restaurantul nu există sau nu este activ.")
+
+    # Validăm planul (doar al userului curent) – fără snapshot, doar ce trebuie pentru ETag
+    meta = _plan_meta(request.user, plan_id)
+    if meta is None:
+        raise Http404("Planul nu există.")
+
+    mode = 'print' if request.GET.get('print') == '1' else 'screen'
+    snapshot_restaurant = meta['snapshot_restaurant']
+    catalog_version = get_merged_catalog_version(snapshot_restaurant) if snapshot_restaurant else '0'
+    etag = quote_etag(hashlib.md5(
+        f"{PLAN_DETAIL_TEMPLATE_VERSION}:{plan_id}:{mode}:{catalog_version}:{restaurant.pk}".encode()
+    ).hexdigest())
+    last_modified = calendar.timegm(meta['created_at'].utctimetuple())
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    key = PLAN_DETAIL_BODY_KEY.format(
+        template_version=PLAN_DETAIL_TEMPLATE_VERSION, plan_id=plan_id, catalog_version=catalog_version
+    )
+    body = cache.get(key)
+    if body is None:
+        if meta.get('archived'):
+            plan = MealPlanArchive.objects.get(pk=plan_id).to_meal_plan()
+        else:
+            plan = MealPlan.objects.select_related('macro_ratio').get(pk=plan_id)
+        # Datele planului: snapshot-ul compact e hidratat din catalog doar când template-ul îl citește
+        plan_data = SimpleLazyObject(lambda: hydrate_snapshot(plan.user_snapshot))
+        with phase('render'):
+            body = render_to_string('core/partials/plan_detail_body.html', {
+                'plan': plan,
+                'plan_data': plan_data,
+            })
+        if _plan_detail_timeout():
+            cache.set(key, body, _plan_detail_timeout())
 
     context = {
-        'plan': plan,
-        'plan_data': plan_data,
+        'plan': {'id': plan_id, 'daily_calories': meta['daily_calories']},
+        'plan_body': mark_safe(body),
         'restaurant': restaurant,
+        'print_mode': mode == 'print',
     }
-
-    # Dacă e ?print=1 → tipărește automat
-    if request.GET.get('print') == '1':
-        context['print_mode'] = True
-
-    return render(request, 'core/plan_detail.html', context)
+    with phase('render'):
+        response = render(request, 'core/plan_detail.html', context)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 
 # ==================== AUTH ====================